@@ -0,0 +1,102 @@
+"""The settings of the application, kept in memory and saved to settings.json."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from _persistence import writeIfChanged
+from _utils import logging, minutesToTime, timeToMinutes
+
+SETTINGS_FILE = Path("settings.json")
+
+# the default of every setting - its type is the type of the setting
+DEFAULTS = {
+    "hours": [0, 8 * 60 + 15, 8 * 60 + 15, 8 * 60 + 15, 8 * 60 + 15, 5 * 60 + 30, 0, 0],
+    "lunchBreak": 30,
+    "connectHoursAndMinutes": False,
+    "forecastEndTimes": True,
+    "minimize": True,
+    "timeLabelsInHours": False,
+    "officePercentage": 40,
+    "dailyOfficePercentageAutoCalc": True,
+    "dailyOfficePercentage": 0,
+    "url": "https://jira-ibs.zone2.agileci.conti.de",
+    "uid": "",
+    "wpLocation": 2,
+    "wpActive": False,
+    "storage": "json",
+}
+
+
+class ConfigStore(QtCore.QObject):
+    """
+    The settings, loaded once and accessed like a dictionary.
+
+    The planned hours are QTimes, all other settings have the type of their default.
+    changed is emitted with the names of the settings which got a new value.
+    """
+
+    changed = QtCore.Signal(object)
+
+    def __init__(self, file: Path = SETTINGS_FILE, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.file = file
+        self.mtime = None
+        self.values = self.fromJson(self.read())
+
+    def __getitem__(self, key: str) -> object:
+        """Return the value of a setting."""
+        return self.values[key]
+
+    def read(self) -> dict:
+        """Read the settings file and remember its modification time."""
+        try:
+            self.mtime = self.file.stat().st_mtime_ns
+            with self.file.open() as fp:
+                return json.load(fp)
+        except Exception:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
+            logging.exception("Using default config - Couldn't load from file")
+            return {}
+
+    @staticmethod
+    def fromJson(data: dict) -> dict:
+        """Return the settings from their json representation - missing and wrongly typed settings get their default."""
+        values = {}
+        for key, default in DEFAULTS.items():
+            value = data.get(key, default)
+            values[key] = value if isinstance(value, type(default)) else default
+        values["hours"] = [minutesToTime(x) for x in values["hours"]]
+        return values
+
+    @staticmethod
+    def toJson(values: dict) -> dict:
+        """Return the json representation of the settings."""
+        data = dict(values)
+        data["hours"] = [timeToMinutes(x) for x in values["hours"]]
+        return data
+
+    def update(self, values: dict) -> None:
+        """Change and save the settings."""
+        newValues = {**self.values, **values}
+        writeIfChanged(self.file, json.dumps(self.toJson(newValues), indent=4))
+        self.mtime = self.file.stat().st_mtime_ns
+        self.apply(newValues)
+
+    def reload(self) -> None:
+        """Load the settings again if the file was changed by someone else."""
+        try:
+            mtime = self.file.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.mtime:
+            self.apply(self.fromJson(self.read()))
+
+    def apply(self, values: dict) -> None:
+        """Take over the settings and announce the changed ones."""
+        changedKeys = {key for key, value in values.items() if value != self.values.get(key)}
+        self.values = values
+        if changedKeys:
+            self.changed.emit(changedKeys)
@@ -1,15 +1,16 @@
 import calendar
-import json
 from itertools import zip_longest
-from pathlib import Path
+from typing import TYPE_CHECKING
 
-import keyring
-from keyring.backends.Windows import WinVaultKeyring
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from _utils import getJiraInstance, logging, minutesToTime, resource_path, timeToMinutes
+from _icons import icon
+from _jira import JiraWorker, closeSession, verifyCredentials
+from _storage import STORAGE_TYPES
+from _utils import getKeyring, minutesToTime, timeToMinutes
 
-keyring.set_keyring(WinVaultKeyring())
+if TYPE_CHECKING:
+    from _config import ConfigStore
 
 
 class AdvancedTimeEdit(QtWidgets.QTimeEdit):
@@ -33,28 +34,6 @@ class AdvancedTimeEdit(QtWidgets.QTimeEdit):
             super().stepBy(steps)
 
 
-class VacationButton(QtWidgets.QPushButton):
-    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
-        super().__init__(parent)
-        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.showContextMenu)
-        self.setCheckable(True)
-        self.setIcon(QtGui.QPixmap(resource_path("black-plane.png")))
-        self.isZA = False
-
-    def showContextMenu(self, pos: QtCore.QPoint) -> None:
-        contextMenu = QtWidgets.QMenu(self)
-        takeZA = contextMenu.addAction("Take ZA")
-        takeZA.setCheckable(True)
-        takeZA.setChecked(self.isZA)
-
-        action = contextMenu.exec_(self.mapToGlobal(pos))
-        if action == takeZA:
-            self.isZA = not self.isZA
-            self.setChecked(self.isZA)
-            self.clicked.emit()
-
-
 class TimeTypeButton(QtWidgets.QPushButton):
     stateNames = ("Home Office", "Office", "Doctor Appointment", "Sick Leave")
     stateIcons = ("house.png", "office.png", "doctor.png", "poison.png")
@@ -64,28 +43,28 @@ class TimeTypeButton(QtWidgets.QPushButton):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.showContextMenu)
         self.state = stateType
-        self.setIcon(QtGui.QPixmap(resource_path(self.stateIcons[self.state])))
+        self.setIcon(icon(self.stateIcons[self.state]))
         self.clicked.connect(self.nextState)
 
     def nextState(self) -> None:
         self.state = (self.state + 1) % len(self.stateIcons)
-        self.setIcon(QtGui.QPixmap(resource_path(self.stateIcons[self.state])))
+        self.setIcon(icon(self.stateIcons[self.state]))
 
     def setState(self, state: int) -> None:
         self.state = state
-        self.setIcon(QtGui.QPixmap(resource_path(self.stateIcons[self.state])))
+        self.setIcon(icon(self.stateIcons[self.state]))
 
     def showContextMenu(self, pos: QtCore.QPoint) -> None:
         contextMenu = QtWidgets.QMenu(self)
         actions = []
         for index, state in enumerate(self.stateNames):
-            actions.append(contextMenu.addAction(QtGui.QPixmap(resource_path(self.stateIcons[index])), state))
+            actions.append(contextMenu.addAction(icon(self.stateIcons[index]), state))
 
         action = contextMenu.exec_(self.mapToGlobal(pos))
         for act in actions:
             if action == act:
                 self.state = actions.index(act)
-                self.setIcon(QtGui.QPixmap(resource_path(self.stateIcons[self.state])))
+                self.setIcon(icon(self.stateIcons[self.state]))
 
 
 class AdvancedSpinBox(QtWidgets.QSpinBox):
@@ -163,7 +142,7 @@ class DetailTimesDialog(QtWidgets.QDialog):
             else:
                 start, end, timeType = timestamps
 
-            autoTime = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("time.png")), "")
+            autoTime = QtWidgets.QPushButton(icon("time.png"), "")
             autoTime.clicked.connect(self.updateAutoTime)
             layout.addWidget(autoTime, x + 1, 0)
             t = QtCore.QTime(minutesToTime(start))
@@ -178,7 +157,7 @@ class DetailTimesDialog(QtWidgets.QDialog):
             endTimes.timeChanged.connect(self.updateDiffs)
             self.endTimes.append(endTimes)
             layout.addWidget(endTimes, x + 1, 2)
-            autoTime = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("time.png")), "")
+            autoTime = QtWidgets.QPushButton(icon("time.png"), "")
             autoTime.QTimeReference = endTimes
             autoTime.clicked.connect(self.updateAutoTime)
             layout.addWidget(autoTime, x + 1, 3)
@@ -234,6 +213,12 @@ class DetailTimesDialog(QtWidgets.QDialog):
     def accept(self) -> None:
         super().accept()
 
+    def setData(self, title: str, data: list[tuple[int, int, int]]) -> None:
+        """Show the detail times of another day - the dialog is reused instead of created for every day."""
+        self.setWindowTitle(title)
+        self.timeStampData = data
+        self.resetTimes()
+
     def getDetails(self) -> tuple[int, int, list[tuple[int, int, int]]]:
         if self.totalDiff:
             totalStart = QtCore.QTime(7, 0)
@@ -253,10 +238,11 @@ class DetailTimesDialog(QtWidgets.QDialog):
 
 
 class SettingsDialog(QtWidgets.QDialog):
-    def __init__(self, parent: QtWidgets.QWidget | None) -> None:
+    def __init__(self, parent: QtWidgets.QWidget | None, config: "ConfigStore") -> None:
         super().__init__(parent=parent)
 
-        self.config = self.getConfig()
+        self.config = config
+        self.jiraWorker = JiraWorker(self, maxThreads=1)
         self.setWindowTitle("Settings")
         mainLayout = QtWidgets.QGridLayout()
 
@@ -277,6 +263,8 @@ class SettingsDialog(QtWidgets.QDialog):
 
         JiraSettingsWidget, self.jiraUrlLE, self.uidLE, self.passwordLE = self.createJiraSettingsWidget()
 
+        storageSettingsWidget, self.storageCombo = self.createStorageSettingsWidget()
+
         buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
         buttonbox.accepted.connect(self.accept)
         buttonbox.rejected.connect(self.reject)
@@ -287,6 +275,7 @@ class SettingsDialog(QtWidgets.QDialog):
         mainLayout.addWidget(homeOfficeSettingsWidget, 2, 0, 1, 2)
         mainLayout.addWidget(workPackageWidget, 3, 0, 1, 2)
         mainLayout.addWidget(JiraSettingsWidget, 4, 0, 1, 2)
+        mainLayout.addWidget(storageSettingsWidget, 5, 0, 1, 2)
         mainLayout.addWidget(buttonbox)
         self.setLayout(mainLayout)
 
@@ -434,27 +423,67 @@ class SettingsDialog(QtWidgets.QDialog):
         uidLabel = QtWidgets.QLabel("User ID")
         uidLE = QtWidgets.QLineEdit(self.config["uid"])
         passwordLabel = QtWidgets.QLabel("Password")
-        passwordLE = QtWidgets.QLineEdit(keyring.get_password("jiraconnection", self.config["uid"]))
+        passwordLE = QtWidgets.QLineEdit(getKeyring().get_password("jiraconnection", self.config["uid"]))
         passwordLE.setEchoMode(QtWidgets.QLineEdit.Password)
-        jiraVerifyButton = QtWidgets.QPushButton("Verify")
-        jiraVerifyButton.clicked.connect(self.verifyJira)
+        self.jiraVerifyButton = QtWidgets.QPushButton("Verify")
+        self.jiraVerifyButton.clicked.connect(self.verifyJira)
         JiraSettingsLayout.addWidget(jiraUrlLabel, 0, 0)
         JiraSettingsLayout.addWidget(jiraUrlLE, 0, 1, 1, 2)
         JiraSettingsLayout.addWidget(uidLabel, 1, 0)
         JiraSettingsLayout.addWidget(uidLE, 1, 1, 1, 2)
         JiraSettingsLayout.addWidget(passwordLabel, 2, 0)
         JiraSettingsLayout.addWidget(passwordLE, 2, 1, 1, 2)
-        JiraSettingsLayout.addWidget(jiraVerifyButton, 3, 2)
+        JiraSettingsLayout.addWidget(self.jiraVerifyButton, 3, 2)
 
         JiraSettingsWidget.setLayout(JiraSettingsLayout)
         return JiraSettingsWidget, jiraUrlLE, uidLE, passwordLE
 
+    def createStorageSettingsWidget(self) -> (QtWidgets.QGroupBox, QtWidgets.QComboBox):
+        """Create the storage settings widget."""
+        storageLayout = QtWidgets.QGridLayout()
+        storageSettingsWidget = QtWidgets.QGroupBox("Storage Settings")
+        storageText = (
+            "json: one file per month in the data folder\n"
+            "sqlite: a single database in the data folder\n"
+            "All data is copied over when the storage is switched."
+        )
+        storageSettingsWidget.setToolTip(storageText)
+        storageSettingsWidget.setWhatsThis(storageText)
+        storageLabel = QtWidgets.QLabel("Storage:")
+        storageCombo = QtWidgets.QComboBox()
+        storageCombo.insertItems(0, list(STORAGE_TYPES))
+        storageCombo.setCurrentText(self.config["storage"])
+
+        storageLayout.addWidget(storageLabel, 0, 0)
+        storageLayout.addWidget(storageCombo, 0, 1)
+        storageSettingsWidget.setLayout(storageLayout)
+        return storageSettingsWidget, storageCombo
+
+    def load(self) -> None:
+        """Show the current settings when the dialog is opened again."""
+        for workingTime, t in zip(self.workingTimes, self.config["hours"][1:], strict=True):
+            workingTime.setTime(t)
+        self.lunchTime.setTime(QtCore.QTime(0, 0).addSecs(self.config["lunchBreak"] * 60))
+        self.autoCalcEndTime.setChecked(self.config["forecastEndTimes"])
+        self.hourWrapAround.setChecked(self.config["connectHoursAndMinutes"])
+        self.minimize.setChecked(self.config["minimize"])
+        self.timeLabelsInHours.setChecked(self.config["timeLabelsInHours"])
+        self.officePercentage.setValue(self.config["officePercentage"])
+        self.dailyOfficePercentageCheckBox.setChecked(self.config["dailyOfficePercentageAutoCalc"])
+        self.dailyOfficePercentage.setValue(self.config["dailyOfficePercentage"])
+        self.workPackageLocationCombo.setCurrentIndex(self.config["wpLocation"])
+        self.workPackageOnStartUpActive.setChecked(self.config["wpActive"])
+        self.jiraUrlLE.setText(self.config["url"])
+        self.uidLE.setText(self.config["uid"])
+        self.passwordLE.setText(getKeyring().get_password("jiraconnection", self.config["uid"]) or "")
+        self.storageCombo.setCurrentText(self.config["storage"])
+
     def dailyOfficePercentageSetDisabled(self, checked: bool) -> None:
         self.dailyOfficePercentage.setDisabled(not checked)
 
     def accept(self) -> None:
-        cfg = self.getConfig()
-        cfg["hours"] = [timeToMinutes(QtCore.QTime(0, 0))] + [timeToMinutes(x.time()) for x in self.workingTimes]
+        cfg = {"uid": self.config["uid"]}
+        cfg["hours"] = [QtCore.QTime(0, 0)] + [x.time() for x in self.workingTimes]
         cfg["lunchBreak"] = timeToMinutes(self.lunchTime.time())
         cfg["connectHoursAndMinutes"] = self.hourWrapAround.isChecked()
         cfg["forecastEndTimes"] = self.autoCalcEndTime.isChecked()
@@ -464,34 +493,29 @@ class SettingsDialog(QtWidgets.QDialog):
         cfg["dailyOfficePercentageAutoCalc"] = self.dailyOfficePercentageCheckBox.isChecked()
         cfg["dailyOfficePercentage"] = self.dailyOfficePercentage.value()
         cfg["url"] = self.jiraUrlLE.text().rstrip("/")
+        keyring = getKeyring()
         if cfg["uid"] and cfg["uid"] != self.uidLE.text() and keyring.get_password("jiraconnection", cfg["uid"]):
             keyring.delete_password("jiraconnection", cfg["uid"])
         cfg["uid"] = self.uidLE.text()
-        if cfg["uid"]:
+        if cfg["uid"] and keyring.get_password("jiraconnection", cfg["uid"]) != self.passwordLE.text():
             keyring.set_password("jiraconnection", cfg["uid"], self.passwordLE.text())
+            closeSession(cfg["url"], cfg["uid"])
         cfg["wpLocation"] = self.workPackageLocationCombo.currentIndex()
         cfg["wpActive"] = self.workPackageOnStartUpActive.isChecked()
-        self.saveConfig(cfg)
+        cfg["storage"] = self.storageCombo.currentText()
+        self.config.update(cfg)
         super().accept()
 
     def verifyJira(self) -> None:
         if self.uidLE.text() and self.passwordLE.text():
-            try:
-                getJiraInstance(
-                    self.jiraUrlLE.text().rstrip("/"),
-                    self.uidLE.text(),
-                    self.passwordLE.text(),
-                )
-                QtWidgets.QMessageBox.information(
-                    self,
-                    "Jira Connection OK",
-                    "Connection to Jira established\n User and Password accepted",
-                    QtWidgets.QMessageBox.Ok,
-                )
-            except Exception as e:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
-                logging.exception("Error when verifying Jira connection")
-                QtWidgets.QMessageBox.warning(self, "Jira Connection Error", str(e), QtWidgets.QMessageBox.Ok)
-
+            url, uid, password = self.jiraUrlLE.text().rstrip("/"), self.uidLE.text(), self.passwordLE.text()
+            self.jiraVerifyButton.setEnabled(False)
+            self.jiraVerifyButton.setText("Verifying...")
+            self.jiraWorker.submit(
+                lambda: verifyCredentials(url, uid, password),
+                self.onJiraVerified,
+                self.onJiraVerificationFailed,
+            )
         else:
             QtWidgets.QMessageBox.warning(
                 self,
@@ -500,42 +524,49 @@ class SettingsDialog(QtWidgets.QDialog):
                 QtWidgets.QMessageBox.Ok,
             )
 
-    @staticmethod
-    def saveConfig(cfg: dict) -> None:
-        settings = Path("settings.json")
-        with settings.open("w") as fp:
-            json.dump(cfg, fp, indent=4)
-
-    @staticmethod
-    def loadConfig() -> dict:
-        settings = Path("settings.json")
-        config = {}
-        try:
-            with settings.open() as fp:
-                config = json.load(fp)
-        except Exception:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
-            logging.exception("Using default config - Couldn't load from file")
-        return config
-
-    def getConfig(self) -> dict:
-        config = self.loadConfig()
-        t1 = 8 * 60 + 15
-        t2 = 5 * 60 + 30
-        t3 = 0
-        cfg = {
-            "hours": [minutesToTime(x) for x in config.get("hours", [t3, t1, t1, t1, t1, t2, t3, t3])],
-            "lunchBreak": config.get("lunchBreak", 30),
-            "connectHoursAndMinutes": config.get("connectHoursAndMinutes", False),
-            "forecastEndTimes": config.get("forecastEndTimes", True),
-            "minimize": config.get("minimize", True),
-            "timeLabelsInHours": config.get("timeLabelsInHours", False),
-            "officePercentage": config.get("officePercentage", 40),
-            "dailyOfficePercentageAutoCalc": config.get("dailyOfficePercentageAutoCalc", True),
-            "dailyOfficePercentage": config.get("dailyOfficePercentage", 0),
-            "url": config.get("url", "https://jira-ibs.zone2.agileci.conti.de"),
-            "uid": config.get("uid", ""),
-            "wpLocation": config.get("wpLocation", 2),
-            "wpActive": config.get("wpActive", False),
-        }
-        AdvancedTimeEdit.connectHoursAndMinutes = cfg["connectHoursAndMinutes"]
-        return cfg
+    def onJiraVerified(self, _result: object) -> None:
+        self.jiraVerifyButton.setEnabled(True)
+        self.jiraVerifyButton.setText("Verify")
+        QtWidgets.QMessageBox.information(
+            self,
+            "Jira Connection OK",
+            "Connection to Jira established\n User and Password accepted",
+            QtWidgets.QMessageBox.Ok,
+        )
+
+    def onJiraVerificationFailed(self, error: Exception) -> None:
+        self.jiraVerifyButton.setEnabled(True)
+        self.jiraVerifyButton.setText("Verify")
+        QtWidgets.QMessageBox.warning(self, "Jira Connection Error", str(error), QtWidgets.QMessageBox.Ok)
+
+
+class WorklogSummaryDialog(QtWidgets.QDialog):
+    def __init__(self, parent: QtWidgets.QWidget | None, results: list[tuple[str, str, str, str | None]]) -> None:
+        super().__init__(parent=parent)
+        self.setWindowTitle("Log All to Jira")
+
+        failed = sum(1 for result in results if result[3] is not None)
+        summary = QtWidgets.QLabel(f"{len(results) - failed} of {len(results)} work logs created")
+
+        table = QtWidgets.QTableWidget(len(results), 4)
+        table.setHorizontalHeaderLabels(["Ticket", "Work Package", "Time", "Result"])
+        table.verticalHeader().hide()
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for row, (ticket, name, duration, error) in enumerate(results):
+            result = QtWidgets.QTableWidgetItem(error or "Logged")
+            result.setForeground(QtGui.QColor("red" if error else "green"))
+            for column, text in enumerate([ticket, name, duration]):
+                table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+            table.setItem(row, 3, result)
+        table.resizeColumnsToContents()
+        table.horizontalHeader().setStretchLastSection(True)
+
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok)
+        buttonbox.accepted.connect(self.accept)
+
+        mainLayout = QtWidgets.QVBoxLayout()
+        mainLayout.addWidget(summary)
+        mainLayout.addWidget(table)
+        mainLayout.addWidget(buttonbox)
+        self.setLayout(mainLayout)
+        self.resize(600, 400)
@@ -0,0 +1,29 @@
+"""Process wide registry of the icons, so every image is only loaded once."""
+
+from PySide6 import QtCore, QtGui
+
+from _utils import logging, resource_path
+
+try:
+    # compiled with: pyside6-rcc pics.qrc -o _resources.py
+    import _resources  # noqa: F401 - importing registers the resources with Qt
+except ImportError:
+    logging.debug("No compiled resources - the icons are loaded from the pics folder")
+
+RESOURCE_PREFIX = ":/pics/"
+
+ICONS = {}
+
+
+def iconPath(name: str) -> str:
+    """Return the path of the image - from the compiled resources if available."""
+    if QtCore.QFile.exists(RESOURCE_PREFIX + name):
+        return RESOURCE_PREFIX + name
+    return resource_path(name)
+
+
+def icon(name: str) -> QtGui.QIcon:
+    """Return the shared icon of the image."""
+    if name not in ICONS:
+        ICONS[name] = QtGui.QIcon(iconPath(name))
+    return ICONS[name]
@@ -0,0 +1,87 @@
+"""Single instance handling - a second start hands its command over to the running instance."""
+
+from __future__ import annotations
+
+import getpass
+import hashlib
+from pathlib import Path
+
+from PySide6 import QtCore, QtNetwork
+
+from _utils import logging
+
+COMMANDS = ("restore", "start-day", "end-day")
+# milliseconds to wait for the running instance
+TIMEOUT = 500
+# answers of sendCommand - an instance busy or hanging is running but does not answer
+NOT_RUNNING, ACKNOWLEDGED, UNANSWERED = "not running", "acknowledged", "unanswered"
+
+
+def serverName(folder: Path | None = None) -> str:
+    """Return the name of the server of the instance using the data in folder - by default the current folder."""
+    folder = (folder or Path.cwd()).resolve()
+    return f"times-{getpass.getuser()}-{hashlib.sha256(str(folder).encode()).hexdigest()[:16]}"
+
+
+def sendCommand(command: str, name: str | None = None) -> str:
+    """Send the command to the running instance. Return NOT_RUNNING, ACKNOWLEDGED or UNANSWERED if it did not confirm it."""
+    socket = QtNetwork.QLocalSocket()
+    socket.connectToServer(name or serverName())
+    if not socket.waitForConnected(TIMEOUT):
+        return NOT_RUNNING
+    socket.write(f"{command}\n".encode())
+    socket.waitForBytesWritten(TIMEOUT)
+    answered = socket.waitForReadyRead(TIMEOUT) and socket.readLine().data().strip() == b"ok"
+    socket.disconnectFromServer()
+    return ACKNOWLEDGED if answered else UNANSWERED
+
+
+def isServing(name: str) -> bool:
+    """Return True if an instance serves under the name - a server left behind by a crashed one refuses connections."""
+    socket = QtNetwork.QLocalSocket()
+    socket.connectToServer(name)
+    connected = socket.waitForConnected(TIMEOUT)
+    socket.abort()
+    return connected
+
+
+class InstanceServer(QtCore.QObject):
+    """Receive the commands of later started instances."""
+
+    commandReceived = QtCore.Signal(str)
+
+    def __init__(self, parent: QtCore.QObject | None = None, name: str | None = None) -> None:
+        super().__init__(parent)
+        self.server = QtNetwork.QLocalServer(self)
+        self.server.setSocketOptions(QtNetwork.QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.onNewConnection)
+        name = name or serverName()
+        # an instance started at the same time may listen already - with access options listen would replace its server
+        if isServing(name):
+            logging.warning("Another instance is running - this one does not receive commands")
+            return
+        if not self.server.listen(name):
+            # a server left behind by a crashed instance - nobody is listening, so it can be removed
+            QtNetwork.QLocalServer.removeServer(name)
+            if not self.server.listen(name):
+                logging.error("Could not start the instance server: %s", self.server.errorString())
+
+    def onNewConnection(self) -> None:
+        """Read the command of the new connection once it arrived."""
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.readCommand(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def readCommand(self, socket: QtNetwork.QLocalSocket) -> None:
+        """Acknowledge and announce a complete command."""
+        if not socket.canReadLine():
+            return
+        command = socket.readLine().data().decode(errors="replace").strip()
+        if command in COMMANDS:
+            socket.write(b"ok\n")
+            self.commandReceived.emit(command)
+        else:
+            logging.warning("Ignoring unknown command %r", command)
+            socket.write(b"unknown\n")
+        socket.flush()
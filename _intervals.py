@@ -0,0 +1,104 @@
+"""Append only log of the tracked intervals of a work package with rollups per day, week and month."""
+
+from __future__ import annotations
+
+import datetime
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def splitByDay(start: float, end: float) -> Iterator[tuple[datetime.date, float]]:
+    """Yield the local dates between start and end (epoch seconds) with the seconds falling on them."""
+    while start < end:
+        date = datetime.datetime.fromtimestamp(start).date()  # noqa: DTZ006 - days are local days
+        midnight = datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time()).timestamp()
+        yield date, min(end, midnight) - start
+        start = midnight
+
+
+class IntervalLog:
+    """
+    The start and end (whole epoch seconds) of every tracked interval, kept in two arrays.
+
+    Intervals are only appended - an interval starting where the last one ended extends it.
+    The totals per day, ISO week and month are updated on every append, so reading them is a lookup.
+    The intervals added since the last save are kept as well, so only they have to be stored.
+    """
+
+    __slots__ = ("days", "ends", "months", "starts", "unsaved", "weeks")
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.days: dict[datetime.date, int] = {}
+        self.weeks: dict[tuple[int, int], int] = {}
+        self.months: dict[tuple[int, int], int] = {}
+        self.unsaved = array("q")
+
+    def __len__(self) -> int:
+        """Return the number of intervals."""
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Yield start and end of the intervals in the order they were tracked."""
+        return zip(self.starts, self.ends, strict=True)
+
+    def add(self, start: float, end: float) -> None:
+        """Append the interval from start to end and add it to the rollups."""
+        start, end = round(start), round(end)
+        if end <= start:
+            return
+        self.unsaved.extend((start, end))
+        if self.ends and self.ends[-1] == start:
+            self.ends[-1] = end
+        else:
+            self.starts.append(start)
+            self.ends.append(end)
+        self.rollUp(start, end)
+
+    def rollUp(self, start: int, end: int) -> None:
+        """Add the seconds between start and end to the totals of the days, weeks and months they fall on."""
+        for date, duration in splitByDay(start, end):
+            seconds = round(duration)
+            isoYear, isoWeek, _ = date.isocalendar()
+            self.days[date] = self.days.get(date, 0) + seconds
+            self.weeks[isoYear, isoWeek] = self.weeks.get((isoYear, isoWeek), 0) + seconds
+            self.months[date.year, date.month] = self.months.get((date.year, date.month), 0) + seconds
+
+    def day(self, date: datetime.date) -> int:
+        """Return the seconds tracked on the date."""
+        return self.days.get(date, 0)
+
+    def week(self, date: datetime.date) -> int:
+        """Return the seconds tracked in the ISO week of the date."""
+        isoYear, isoWeek, _ = date.isocalendar()
+        return self.weeks.get((isoYear, isoWeek), 0)
+
+    def month(self, year: int, month: int) -> int:
+        """Return the seconds tracked in the month."""
+        return self.months.get((year, month), 0)
+
+    def dailyTotals(self, first: datetime.date, last: datetime.date) -> list[tuple[datetime.date, int]]:
+        """Return the dates from first to last with tracked time and their seconds."""
+        return sorted((date, seconds) for date, seconds in self.days.items() if first <= date <= last)
+
+    def markSaved(self) -> None:
+        """Note that the unsaved intervals were stored."""
+        del self.unsaved[:]
+
+    def asJson(self) -> list[int]:
+        """Return the intervals as a flat list of starts and ends."""
+        return [x for interval in self for x in interval]
+
+    @classmethod
+    def fromJson(cls, data: list[int], saved: bool = True) -> IntervalLog:
+        """Return the log of a flat list of starts and ends - the intervals are unsaved if not saved already."""
+        log = cls()
+        for x in range(0, len(data) - 1, 2):
+            log.add(data[x], data[x + 1])
+        if saved:
+            log.markSaved()
+        return log
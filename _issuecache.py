@@ -0,0 +1,177 @@
+"""Cache of summary, status and project of the Jira issues - filled in batches and kept on disk."""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+from _jira import errorMessage, searchIssues
+from _persistence import writeIfChanged
+from _utils import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from _jira import JiraWorker
+
+ISSUES_FILE = Path("issues.json")
+# seconds an issue - and the fact that a key does not exist - is used before it is fetched again
+TTL = 24 * 60 * 60
+MISSING_TTL = 60 * 60
+# keys fetched with one search at most
+BATCH_SIZE = 100
+# milliseconds the requested keys are collected before they are fetched
+BATCH_DELAY = 200
+KEY_PATTERN = re.compile(r"[A-Z][A-Z0-9_]*-[0-9]+")
+
+
+def issueKey(ticket: str | None) -> str:
+    """Return the ticket as issue key - Jira ignores the case of keys."""
+    return (ticket or "").strip().upper()
+
+
+def isValidKey(key: str) -> bool:
+    """Return True if the key looks like an issue key."""
+    return KEY_PATTERN.fullmatch(key) is not None
+
+
+class IssueCache(QtCore.QObject):
+    """
+    The issues by their key - for the keys Jira does not know it is noted that they are missing.
+
+    Requested keys that are not cached or outdated are collected for BATCH_DELAY and then fetched
+    with one search per BATCH_SIZE keys. Outdated issues are still returned until they were fetched again.
+    Results of searches started before the cache was cleared or for another server are dropped.
+    updated is emitted with the fetched keys, failed with the keys and the error if Jira could not be asked.
+    """
+
+    updated = QtCore.Signal(list)
+    failed = QtCore.Signal(list, str)
+
+    def __init__(
+        self,
+        worker: JiraWorker,
+        connection: Callable[[], tuple[str, str]],
+        file: Path = ISSUES_FILE,
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.worker = worker
+        self.connection = connection
+        self.file = file
+        self.issues: dict[str, dict] = self.load()
+        self.requested: set[str] = set()
+        self.fetching: set[str] = set()
+        # counts the clears - the searches are tagged with it
+        self.generation = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(BATCH_DELAY)
+        self.timer.timeout.connect(self.fetch)
+
+    def load(self) -> dict[str, dict]:
+        """Load the cached issues - a broken cache is just fetched again."""
+        try:
+            with self.file.open() as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logging.warning("Ignoring the broken issue cache %s", self.file)
+            return {}
+
+    def save(self) -> None:
+        """Save the cached issues."""
+        writeIfChanged(self.file, json.dumps(self.issues, indent=4))
+
+    def clear(self) -> None:
+        """Forget all issues, e.g. after the Jira server changed - the running searches are ignored."""
+        self.issues.clear()
+        self.requested.clear()
+        self.fetching.clear()
+        self.timer.stop()
+        self.generation += 1
+        self.save()
+
+    def get(self, ticket: str | None) -> dict | None:
+        """Return the cached issue of the ticket - with "missing" set if Jira does not know it."""
+        return self.issues.get(issueKey(ticket))
+
+    def isChecked(self) -> bool:
+        """Return True if Jira is asked for the issues - only with a server and a user set."""
+        url, uid = self.connection()
+        return bool(url and uid)
+
+    def isMissing(self, ticket: str | None) -> bool:
+        """Return True if Jira is asked and recently did not know the ticket - unchecked tickets are never missing."""
+        if not self.isChecked():
+            return False
+        issue = self.issues.get(issueKey(ticket))
+        return issue is not None and issue.get("missing", False) and self.isFresh(issue)
+
+    def ticketError(self, ticket: str | None, previous: str | None = None) -> str:
+        """Return why the ticket entered for a work package is refused - an empty string if it is accepted."""
+        if ticket and ticket != previous and self.isMissing(ticket):
+            return f"Issue {issueKey(ticket)} not found in Jira"
+        return ""
+
+    @staticmethod
+    def isFresh(issue: dict) -> bool:
+        """Return True if the issue was fetched within its TTL."""
+        return time.time() - issue["fetched"] < (MISSING_TTL if issue.get("missing") else TTL)
+
+    def request(self, tickets: Iterable[str | None]) -> None:
+        """Fetch the issues of the tickets which are not cached or outdated - together with the other requested ones."""
+        for ticket in tickets:
+            key = issueKey(ticket)
+            if not isValidKey(key) or key in self.fetching:
+                continue
+            issue = self.issues.get(key)
+            if issue is None or not self.isFresh(issue):
+                self.requested.add(key)
+        if self.requested and not self.timer.isActive():
+            self.timer.start()
+
+    def fetch(self) -> None:
+        """Search the requested issues in the background."""
+        keys = sorted(self.requested)
+        self.requested.clear()
+        self.fetching.update(keys)
+        url, uid = self.connection()
+        tag = self.generation, url
+        for x in range(0, len(keys), BATCH_SIZE):
+            batch = keys[x : x + BATCH_SIZE]
+            self.worker.submit(
+                lambda batch=batch: searchIssues(url, uid, batch),
+                lambda issues, batch=batch: self.onFetched(batch, issues, tag),
+                lambda error, batch=batch: self.onFetchFailed(batch, error, tag),
+            )
+
+    def isCurrent(self, tag: tuple[int, str]) -> bool:
+        """Return True if a search with the tag was started after the last clear and for the current server."""
+        return tag == (self.generation, self.connection()[0])
+
+    def onFetched(self, keys: list[str], issues: dict[str, dict], tag: tuple[int, str]) -> None:
+        """Cache the found issues and note the missing ones."""
+        if not self.isCurrent(tag):
+            logging.info("Dropping the issues fetched before the cache was cleared")
+            return
+        now = round(time.time())
+        for key in keys:
+            issue = issues.get(key)
+            self.issues[key] = {**issue, "fetched": now} if issue is not None else {"missing": True, "fetched": now}
+        self.fetching.difference_update(keys)
+        self.save()
+        self.updated.emit(keys)
+
+    def onFetchFailed(self, keys: list[str], error: Exception, tag: tuple[int, str]) -> None:
+        """Keep the issues as they are - they are fetched again on the next request."""
+        if not self.isCurrent(tag):
+            return
+        self.fetching.difference_update(keys)
+        self.failed.emit(keys, errorMessage(error))
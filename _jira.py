@@ -0,0 +1,331 @@
+"""Long lived Jira sessions shared by all Jira operations, run in the background, limited in their rate and retried."""
+
+from __future__ import annotations
+
+import datetime
+import email.utils
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+from _utils import HTTP_NOT_AUTHORIZED, HTTP_NOT_FOUND, getJiraInstance, logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from jira import JIRA
+
+# states of the worklog of a work package
+PENDING, SUCCEEDED, FAILED, QUEUED = "pending", "succeeded", "failed", "queued"
+
+HTTP_TOO_MANY_REQUESTS = 429
+# requests per second and burst of requests allowed by the rate limiter
+REQUEST_RATE = 5
+REQUEST_BURST = 5
+# tries of a request rejected with 429 - and the wait before the next one if the server does not say
+RATE_LIMIT_ATTEMPTS = 5
+DEFAULT_RETRY_AFTER = 5
+HTTP_SERVER_ERROR = 500
+# the comment of a worklog carries its key, so a retry can find out whether the worklog was already written
+WORKLOG_COMMENT = "Logged with Times [{key}]"
+ISSUE_FIELDS = ["summary", "status", "project"]
+
+# the sessions by url and user - each keeps its connection pool alive between the operations
+SESSIONS: dict[tuple[str, str], JIRA] = {}
+# a login only holds the lock of its url and user - SESSIONS_LOCK guards the dictionaries
+LOGIN_LOCKS: dict[tuple[str, str], threading.Lock] = {}
+SESSIONS_LOCK = threading.Lock()
+
+
+def getSession(url: str, uid: str) -> JIRA:
+    """Return the session of the user - it is created and logged in on first use, once for all threads waiting for it."""
+    with SESSIONS_LOCK:
+        jira = SESSIONS.get((url, uid))
+        if jira is not None:
+            return jira
+        loginLock = LOGIN_LOCKS.setdefault((url, uid), threading.Lock())
+    with loginLock:
+        with SESSIONS_LOCK:
+            jira = SESSIONS.get((url, uid))
+        if jira is None:
+            jira = getJiraInstance(url, uid)
+            with SESSIONS_LOCK:
+                SESSIONS[url, uid] = jira
+        return jira
+
+
+def closeSession(url: str, uid: str, jira: JIRA | None = None) -> None:
+    """Close the session of the user - only if it is still jira, if given."""
+    with SESSIONS_LOCK:
+        if jira is not None and SESSIONS.get((url, uid)) is not jira:
+            return
+        jira = SESSIONS.pop((url, uid), None)
+    if jira is not None:
+        jira.close()
+
+
+def closeSessions() -> None:
+    """Close all sessions, e.g. after the settings changed."""
+    with SESSIONS_LOCK:
+        sessions = list(SESSIONS.values())
+        SESSIONS.clear()
+    for jira in sessions:
+        jira.close()
+
+
+def withSession[T](url: str, uid: str, operation: Callable[[JIRA], T]) -> T:
+    """Run the operation with the session of the user - once more with a new session if the old one was rejected."""
+    from jira import JIRAError  # noqa: PLC0415 - jira is imported on first use, see getJiraInstance
+
+    jira = getSession(url, uid)
+    try:
+        return operation(jira)
+    except JIRAError as e:
+        if e.status_code != HTTP_NOT_AUTHORIZED:
+            raise
+    logging.info("Jira session of %s was rejected - logging in again", uid)
+    closeSession(url, uid, jira)
+    return operation(getSession(url, uid))
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by the threads of a worker.
+
+    Every request takes a token - the tokens are refilled with rate per second up to capacity.
+    After the server rejected a request with 429, no tokens are handed out until its Retry-After passed.
+    """
+
+    def __init__(self, rate: float = REQUEST_RATE, capacity: float = REQUEST_BURST) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blockedUntil = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait for a token and take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blockedUntil and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blockedUntil - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def block(self, seconds: float) -> None:
+        """Hand out no tokens for the seconds."""
+        with self.lock:
+            self.blockedUntil = max(self.blockedUntil, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+def retryAfter(error: Exception) -> float:
+    """Return the seconds to wait given by the Retry-After header of a rejected request - in seconds or as date."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    return max(0.0, (date - datetime.datetime.now(datetime.UTC)).total_seconds())
+
+
+def hasWorklog(jira: JIRA, ticket: str, key: str) -> bool:
+    """Return True if the ticket has a worklog with the key in its comment."""
+    comment = WORKLOG_COMMENT.format(key=key)
+    return any(comment in (getattr(worklog, "comment", "") or "") for worklog in jira.worklogs(ticket))
+
+
+def addWorklog(jira: JIRA, ticket: str, duration: int, key: str | None, checkFirst: bool) -> None:
+    """Add the worklog with its key - unless checkFirst and an earlier attempt already added it."""
+    if key is None:
+        jira.add_worklog(ticket, timeSpentSeconds=duration)
+    elif checkFirst and hasWorklog(jira, ticket, key):
+        logging.info("worklog %s was already written to %s", key, ticket)
+    else:
+        jira.add_worklog(ticket, timeSpentSeconds=duration, comment=WORKLOG_COMMENT.format(key=key))
+
+
+def writeWorklog(  # noqa: PLR0913
+    url: str,
+    uid: str,
+    ticket: str,
+    duration: int,
+    limiter: TokenBucket | None = None,
+    key: str | None = None,
+    checkFirst: bool = False,
+) -> None:
+    """
+    Log duration seconds to the ticket - waiting for the limiter and retrying requests rejected with 429.
+
+    With checkFirst the worklogs of the ticket are searched for the key first, as an earlier attempt may have reached Jira.
+    """
+    from jira import JIRAError  # noqa: PLC0415 - see withSession
+
+    for attempt in range(RATE_LIMIT_ATTEMPTS):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            withSession(url, uid, lambda jira: addWorklog(jira, ticket, duration, key, checkFirst))
+        except JIRAError as e:
+            if e.status_code != HTTP_TOO_MANY_REQUESTS or attempt == RATE_LIMIT_ATTEMPTS - 1:
+                raise
+            delay = retryAfter(e)
+            logging.info("Jira rate limit hit when logging to %s - retrying in %.1f s", ticket, delay)
+            if limiter is not None:
+                limiter.block(delay)
+            else:
+                time.sleep(delay)
+        else:
+            return
+
+
+def searchIssues(url: str, uid: str, keys: list[str]) -> dict[str, dict]:
+    """Return summary, status and project of the issues by their key - found with one search, unknown keys are left out."""
+    # without validation Jira ignores unknown keys instead of rejecting the whole query
+    jql = "key in ({})".format(", ".join(f'"{key}"' for key in keys))
+    result = withSession(
+        url,
+        uid,
+        lambda jira: jira.search_issues(
+            jql, maxResults=len(keys), validate_query=False, fields=ISSUE_FIELDS, json_result=True, use_post=True
+        ),
+    )
+    return {
+        issue["key"]: {
+            "summary": issue["fields"]["summary"],
+            "status": issue["fields"]["status"]["name"],
+            "project": issue["fields"]["project"]["name"],
+        }
+        for issue in result["issues"]
+    }
+
+
+def verifyCredentials(url: str, uid: str, password: str) -> None:
+    """Log in with the credentials - raises ConnectionError if they are not accepted."""
+    getJiraInstance(url, uid, password).close()
+
+
+def isTransient(error: Exception) -> bool:
+    """Return True if the error may be gone later - no connection, a timeout or an overloaded or failing server."""
+    from jira import JIRAError  # noqa: PLC0415 - see withSession
+    from requests.exceptions import ConnectionError as RequestsConnectionError  # noqa: PLC0415
+    from requests.exceptions import Timeout  # noqa: PLC0415
+
+    if isinstance(error, JIRAError):
+        status = error.status_code
+        return status is None or status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_SERVER_ERROR
+    if isinstance(error, RequestsConnectionError | Timeout):
+        return True
+    # getJiraInstance raises ConnectionError for timeouts as well as for missing or wrong credentials
+    return isinstance(error, ConnectionError) and error.__cause__ is not None and isTransient(error.__cause__)
+
+
+def errorMessage(error: Exception, ticket: str | None = None) -> str:
+    """Return the message shown to the user for an error of a Jira operation."""
+    from jira import JIRAError  # noqa: PLC0415 - see withSession
+
+    if isinstance(error, JIRAError):
+        if error.status_code == HTTP_NOT_FOUND and ticket:
+            return f"Issue {ticket} not found"
+        return f"Error: '{error.text}'\nStatus Code: {error.status_code}"
+    return str(error)
+
+
+class JiraTask(QtCore.QRunnable):
+    """A Jira operation run in a thread of the pool of the worker."""
+
+    def __init__(
+        self,
+        worker: JiraWorker,
+        operation: Callable[[], object],
+        onSuccess: Callable[[object], None] | None = None,
+        onFailure: Callable[[Exception], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self.worker = worker
+        self.operation = operation
+        self.onSuccess = onSuccess
+        self.onFailure = onFailure
+
+    def run(self) -> None:
+        """Run the operation and report its result or error."""
+        try:
+            result = self.operation()
+        except Exception as e:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
+            logging.exception("Jira operation failed")
+            self.worker.failed.emit(self, e)
+        else:
+            self.worker.succeeded.emit(self, result)
+
+
+class JiraWorker(QtCore.QObject):
+    """
+    Run Jira operations in background threads, so waiting for the server does not block the GUI.
+
+    The callbacks of an operation are called in the GUI thread with its result or its exception.
+    """
+
+    succeeded = QtCore.Signal(object, object)
+    failed = QtCore.Signal(object, object)
+
+    def __init__(self, parent: QtCore.QObject | None = None, maxThreads: int = 4) -> None:
+        super().__init__(parent)
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(maxThreads)
+        self.tasks = set()
+        self.succeeded.connect(self.onSucceeded)
+        self.failed.connect(self.onFailed)
+
+    def submit(
+        self,
+        operation: Callable[[], object],
+        onSuccess: Callable[[object], None] | None = None,
+        onFailure: Callable[[Exception], None] | None = None,
+    ) -> JiraTask:
+        """Run the operation in the background."""
+        task = JiraTask(self, operation, onSuccess, onFailure)
+        task.setAutoDelete(False)
+        self.tasks.add(task)
+        self.pool.start(task)
+        return task
+
+    def onSucceeded(self, task: JiraTask, result: object) -> None:
+        """Hand the result over to the task's callback."""
+        self.tasks.discard(task)
+        if task.onSuccess is not None:
+            task.onSuccess(result)
+
+    def onFailed(self, task: JiraTask, error: Exception) -> None:
+        """Hand the error over to the task's callback."""
+        self.tasks.discard(task)
+        if task.onFailure is not None:
+            task.onFailure(error)
+
+    def isBusy(self) -> bool:
+        """Return True while operations are pending."""
+        return bool(self.tasks)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Wait until all operations finished."""
+        return self.pool.waitForDone(msecs)
+
+    def finish(self) -> None:
+        """Wait until all operations finished and call their callbacks - including those of operations they submitted."""
+        while self.tasks:
+            self.pool.waitForDone()
+            # the results are queued for the GUI thread
+            QtCore.QCoreApplication.sendPostedEvents(self)
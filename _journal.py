@@ -0,0 +1,118 @@
+"""Append only journal of the changed days of a month."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+from _model import DATA_FOLDER, DayRecord, MonthData, monthKey
+from _utils import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+# the journal is compacted into the month file when it gets bigger than this
+COMPACT_SIZE = 64 * 1024
+
+
+def endsWithNewline(file: Path) -> bool:
+    """Return True if the file is missing or empty or its last line is complete."""
+    try:
+        with file.open("rb") as fp:
+            if not fp.seek(0, os.SEEK_END):
+                return True
+            fp.seek(-1, os.SEEK_END)
+            return fp.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+
+def appendLines(file: Path, lines: str) -> None:
+    """Append the lines to the file and wait until they are on disk."""
+    if not file.parent.exists():
+        file.parent.mkdir()
+    if not endsWithNewline(file):
+        # do not continue an incomplete line left behind by a crash
+        lines = "\n" + lines
+    with file.open("a") as fp:
+        fp.write(lines)
+        fp.flush()
+        os.fsync(fp.fileno())
+
+
+def journalFile(year: int, month: int, folder: Path = DATA_FOLDER) -> Path:
+    """Return the path of the journal of the month."""
+    return folder / f"{monthKey(year, month)}.journal"
+
+
+class MonthJournal:
+    """
+    Journal of a month with one line per changed day.
+
+    Every line holds the complete state of the day, so replaying the journal on top of the month file
+    restores the latest state. An incomplete line from a crash only loses that single change.
+    """
+
+    def __init__(self, year: int, month: int, folder: Path = DATA_FOLDER) -> None:
+        self.folder = folder
+        self.file = journalFile(year, month, folder)
+
+    def append(self, monthData: MonthData, days: Iterable[int]) -> None:
+        """Append the current state of the days to the journal."""
+        lines = "".join(json.dumps([x, monthData.days[x].asJson()]) + "\n" for x in sorted(days))
+        if lines:
+            appendLines(self.file, lines)
+
+    def replay(self, monthData: MonthData) -> None:
+        """Apply the journal to the month."""
+        if not self.file.exists():
+            return
+        with self.file.open() as fp:
+            for line in fp:
+                try:
+                    x, data = json.loads(line)
+                except ValueError:
+                    logging.warning("Ignoring incomplete entry in %s", self.file)
+                    continue
+                monthData.days[x] = DayRecord.fromJson(data)
+
+    def endsWithNewline(self) -> bool:
+        """Return True if the journal is empty or its last line is complete."""
+        return endsWithNewline(self.file)
+
+    def size(self) -> int:
+        """Return the size of the journal in bytes."""
+        try:
+            return self.file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def clear(self) -> None:
+        """Remove the journal."""
+        self.file.unlink(missing_ok=True)
+
+
+def loadMonth(year: int, month: int, folder: Path = DATA_FOLDER) -> MonthData:
+    """Load the month file and apply the journal to it."""
+    monthData = MonthData.load(year, month, folder)
+    MonthJournal(year, month, folder).replay(monthData)
+    return monthData
+
+
+def saveMonth(monthData: MonthData, compact: bool = False, folder: Path = DATA_FOLDER) -> bool:
+    """
+    Append the changed days of the month to its journal.
+
+    The journal is compacted into the month file if requested or if it got too big. Return True if it was compacted.
+    """
+    journal = MonthJournal(monthData.year, monthData.month, folder)
+    journal.append(monthData, monthData.changedDays)
+    monthData.changedDays.clear()
+    size = journal.size()
+    if size and (compact or size > COMPACT_SIZE):
+        monthData.save(folder)
+        journal.clear()
+        return True
+    return False
@@ -0,0 +1,301 @@
+"""Widget independent data model of a tracked month."""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import json
+from array import array
+from pathlib import Path
+
+from _persistence import writeIfChanged
+
+# the month files are named after the english "MMMM yyyy" string Qt produces - independent of the locale
+MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+DETAIL_SLOTS = 10
+SECONDS_PER_DAY = 24 * 60 * 60
+DATA_FOLDER = Path("data")
+SUMMARY_FIELDS = ("za", "worked", "planned", "workingDays", "officeDays")
+
+
+def emptyDetails() -> list:
+    """Return the detail timestamps of a day without any details."""
+    return [0, 0, [(0, 0)] * DETAIL_SLOTS]
+
+
+class DayRecord:
+    """All data tracked for a single day. Times are stored as minutes since midnight."""
+
+    __slots__ = ("details", "end", "homeOffice", "lunch", "start", "vacation", "za")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        start: int = 0,
+        end: int = 0,
+        vacation: bool = False,
+        lunch: bool = True,
+        homeOffice: bool = True,
+        details: list | None = None,
+        za: bool = False,
+    ) -> None:
+        self.start = start
+        self.end = end
+        self.vacation = vacation
+        self.lunch = lunch
+        self.homeOffice = homeOffice
+        self.details = details if details is not None else emptyDetails()
+        self.za = za
+
+    @classmethod
+    def fromJson(cls, data: list) -> DayRecord:
+        """Create a day from its json representation."""
+        # backwards compatibility:
+        if len(data) == 3:  # noqa: PLR2004
+            s, e, v = data
+            return cls(s, e, v)
+        if len(data) == 4:  # noqa: PLR2004
+            s, e, v, lb = data
+            return cls(s, e, v, lb)
+        if len(data) == 5:  # noqa: PLR2004
+            s, e, v, lb, timestamps = data
+            return cls(s, e, v, lb, True, timestamps)
+        if len(data) == 6:  # noqa: PLR2004
+            s, e, v, lb, ho, timestamps = data
+            return cls(s, e, v, lb, ho, timestamps)
+        s, e, v, lb, ho, timestamps, za = data
+        return cls(s, e, v, lb, ho, timestamps, za)
+
+    def asJson(self) -> list:
+        """Return the day as json serializable list."""
+        return [self.start, self.end, self.vacation, self.lunch, self.homeOffice, self.details, self.takesZA]
+
+    @property
+    def takesZA(self) -> bool:
+        """Return True if the vacation of this day is taken as ZA."""
+        return self.vacation and self.za
+
+    def hasDetails(self) -> bool:
+        """Return True if start and end time are defined by the detail timestamps."""
+        return bool(self.details[0] and self.details[1])
+
+    def setDetails(self, details: list) -> None:
+        """Set the detail timestamps and take over the start and end time from them."""
+        self.details = list(details)
+        if self.hasDetails():
+            self.start, self.end = self.details[0], self.details[1]
+
+    def applyDailyOfficePercentage(self, threshold: int) -> None:
+        """Decide on home office by the share of office time in the detail timestamps."""
+        totalTime = self.details[1] - self.details[0]
+        if not totalTime:
+            return
+        officeTime = totalTime
+        for start, end, state in self.details[2]:
+            if state == 0:
+                officeTime -= end - start
+        self.homeOffice = officeTime / totalTime * 100 <= threshold
+
+    def isWorkingDay(self, plannedSeconds: int) -> bool:
+        """Return True if the times of this day have to be tracked."""
+        return bool(plannedSeconds) and (not self.vacation or self.za)
+
+    def forecastEnd(self, plannedSeconds: int, lunchBreak: int) -> bool:
+        """Set the end time according to the planned time if only the start time is set."""
+        if self.end or not self.start:
+            return False
+        seconds = self.start * 60 + plannedSeconds
+        if self.lunch:
+            seconds += lunchBreak * 60
+        self.end = seconds % SECONDS_PER_DAY // 60
+        return True
+
+    def diffSeconds(self, plannedSeconds: int, lunchBreak: int) -> int:
+        """Return the overtime (ZA) of this day in seconds."""
+        plannedEnd = (self.start * 60 + plannedSeconds) % SECONDS_PER_DAY
+        diff = self.end * 60 - plannedEnd
+        if self.lunch and self.end:
+            diff -= lunchBreak * 60
+        return diff
+
+    def workedSeconds(self, lunchBreak: int) -> int:
+        """Return the worked time of this day in seconds."""
+        if not self.start:
+            return 0
+        diff = (self.end - self.start) * 60
+        if self.lunch:
+            diff -= lunchBreak * 60
+        return diff
+
+
+class MonthSummary:
+    """Accumulated numbers of a month."""
+
+    __slots__ = ("officeDays", "planned", "worked", "workingDays", "za")
+
+    def __init__(self, za: int = 0, worked: int = 0, planned: int = 0, workingDays: int = 0, officeDays: int = 0) -> None:
+        self.za = za
+        self.worked = worked
+        self.planned = planned
+        self.workingDays = workingDays
+        self.officeDays = officeDays
+
+    @property
+    def officePercentage(self) -> float | None:
+        """Return the percentage of office days or None if there are no working days."""
+        if self.workingDays:
+            return self.officeDays / self.workingDays * 100
+        return None
+
+
+class MonthData:
+    """All days of a single month."""
+
+    __slots__ = ("changedDays", "days", "month", "year")
+
+    def __init__(self, year: int, month: int, days: list[DayRecord] | None = None) -> None:
+        self.year = year
+        self.month = month
+        self.days = days if days is not None else [DayRecord() for _ in range(self.daysInMonth())]
+        self.changedDays = set()
+
+    def markChanged(self, index: int) -> None:
+        """Remember that the day index has to be saved."""
+        self.changedDays.add(index)
+
+    @property
+    def key(self) -> str:
+        """Return the "MMMM yyyy" name of the month."""
+        return monthKey(self.year, self.month)
+
+    def daysInMonth(self) -> int:
+        """Return the number of days of the month."""
+        return calendar.monthrange(self.year, self.month)[1]
+
+    def dayOfWeek(self, index: int) -> int:
+        """Return the day of the week of the day index (Monday = 1 ... Sunday = 7)."""
+        return datetime.date(self.year, self.month, index + 1).isoweekday()
+
+    def plannedSeconds(self, index: int, hours: list[int]) -> int:
+        """Return the planned working time in seconds of the day index."""
+        return hours[self.dayOfWeek(index)] * 60
+
+    def isCurrentMonth(self, today: datetime.date) -> bool:
+        """Return True if the month is the month of today."""
+        return (self.year, self.month) == (today.year, today.month)
+
+    def countsTowardsZA(self, index: int, today: datetime.date) -> bool:
+        """Return False for the days in the future of the current month."""
+        return index + 1 <= today.day or not self.isCurrentMonth(today)
+
+    def dayContribution(self, index: int, hours: list[int], lunchBreak: int, today: datetime.date) -> tuple[int, ...]:
+        """Return what the day index adds to the month summary - in the order of SUMMARY_FIELDS."""
+        day = self.days[index]
+        plannedSeconds = self.plannedSeconds(index, hours)
+        if not day.isWorkingDay(plannedSeconds):
+            return 0, 0, 0, 0, 0
+        za = day.diffSeconds(plannedSeconds, lunchBreak) if self.countsTowardsZA(index, today) else 0
+        workingDay = not day.takesZA
+        officeDay = workingDay and not day.homeOffice
+        return za, day.workedSeconds(lunchBreak), plannedSeconds, int(workingDay), int(officeDay)
+
+    def summary(self, hours: list[int], lunchBreak: int, today: datetime.date | None = None) -> MonthSummary:
+        """Calculate ZA, worked and planned time as well as the office days of the month."""
+        return MonthTotals(self, hours, lunchBreak, today).summary
+
+    @classmethod
+    def fromJson(cls, year: int, month: int, data: dict) -> MonthData:
+        """Create the month from its json representation."""
+        monthData = cls(year, month)
+        for x in range(monthData.daysInMonth()):
+            monthData.days[x] = DayRecord.fromJson(data[f"{x}"])
+        return monthData
+
+    def asJson(self) -> dict:
+        """Return the month as json serializable dictionary."""
+        data = {"MonthAndYear": self.key}
+        for x, day in enumerate(self.days):
+            data[f"{x}"] = day.asJson()
+        return data
+
+    @classmethod
+    def load(cls, year: int, month: int, folder: Path = DATA_FOLDER) -> MonthData:
+        """Load the month from its file or create an empty month if there is none."""
+        file = monthFile(year, month, folder)
+        if not file.exists():
+            return cls(year, month)
+        with file.open() as fp:
+            return cls.fromJson(year, month, json.load(fp))
+
+    def save(self, folder: Path = DATA_FOLDER) -> None:
+        """Save the complete month to its file."""
+        if not folder.exists():
+            folder.mkdir()
+        writeIfChanged(monthFile(self.year, self.month, folder), json.dumps(self.asJson(), indent=4))
+
+
+class MonthTotals:
+    """
+    Running summary of a month.
+
+    The contribution of every day is kept, so an edited day only adjusts the summary by its difference
+    instead of recalculating the whole month.
+    """
+
+    __slots__ = ("_contributions", "hours", "lunchBreak", "monthData", "summary", "today")
+
+    def __init__(
+        self,
+        monthData: MonthData,
+        hours: list[int],
+        lunchBreak: int,
+        today: datetime.date | None = None,
+    ) -> None:
+        self.monthData = monthData
+        self.hours = hours
+        self.lunchBreak = lunchBreak
+        self.today = today or datetime.date.today()  # noqa: DTZ011 - the local date is wanted here
+        self.summary = MonthSummary()
+        self._contributions = array("q", bytes(8 * len(SUMMARY_FIELDS) * len(monthData.days)))
+        for x in range(len(monthData.days)):
+            self.updateDay(x)
+
+    def updateDay(self, index: int) -> None:
+        """Recalculate the contribution of the day index and adjust the summary by its difference."""
+        offset = index * len(SUMMARY_FIELDS)
+        contribution = self.monthData.dayContribution(index, self.hours, self.lunchBreak, self.today)
+        for field, value in zip(SUMMARY_FIELDS, contribution, strict=True):
+            setattr(self.summary, field, getattr(self.summary, field) + value - self._contributions[offset])
+            self._contributions[offset] = value
+            offset += 1
+
+
+def monthKey(year: int, month: int) -> str:
+    """Return the "MMMM yyyy" name of the month."""
+    return f"{MONTH_NAMES[month]} {year}"
+
+
+def monthFile(year: int, month: int, folder: Path = DATA_FOLDER) -> Path:
+    """Return the path of the file storing the month."""
+    return folder / f"{monthKey(year, month)}.json"
+
+
+def parseMonthKey(name: str) -> tuple[int, int] | None:
+    """Return year and month of a "MMMM yyyy" name or None if it is no month name."""
+    monthName, _, year = name.partition(" ")
+    if monthName not in MONTH_NAMES[1:] or not year.isdigit():
+        return None
+    return int(year), MONTH_NAMES.index(monthName)
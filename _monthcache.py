@@ -0,0 +1,136 @@
+"""Cache of the loaded months with background loading of the neighboring months."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+from _utils import logging
+
+if TYPE_CHECKING:
+    from _model import MonthData
+    from _storage import Storage
+
+CACHED_MONTHS = 12
+CACHED_BYTES = 1024 * 1024
+
+
+def monthBytes(monthData: MonthData) -> int:
+    """Return the approximate size of the month as its json representation."""
+    return len(json.dumps(monthData.asJson()))
+
+
+class MonthLoader(QtCore.QRunnable):
+    """Load a month in a thread of the pool and hand it over to the cache."""
+
+    def __init__(self, cache: MonthCache, storage: Storage, year: int, month: int) -> None:
+        super().__init__()
+        self.cache = cache
+        self.storage = storage
+        self.year = year
+        self.month = month
+
+    def run(self) -> None:
+        """Load the month with a storage usable in this thread."""
+        storage = self.storage.forThread()
+        try:
+            monthData = storage.loadMonth(self.year, self.month)
+        except Exception:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
+            logging.exception("Could not prefetch %s-%s", self.year, self.month)
+            monthData = None
+        finally:
+            if storage is not self.storage:
+                storage.close()
+        self.cache.loaded.emit(self.storage, self.year, self.month, monthData)
+
+
+class MonthCache(QtCore.QObject):
+    """
+    The least recently used months limited by their number and their size.
+
+    Months with unsaved changes are never evicted. The cached months are the objects shown and edited,
+    so going back to a month shows its latest state without loading it again.
+    """
+
+    loaded = QtCore.Signal(object, int, int, object)
+
+    def __init__(
+        self,
+        storage: Storage,
+        parent: QtCore.QObject | None = None,
+        maxMonths: int = CACHED_MONTHS,
+        maxBytes: int = CACHED_BYTES,
+    ) -> None:
+        super().__init__(parent)
+        self.storage = storage
+        self.maxMonths = maxMonths
+        self.maxBytes = maxBytes
+        self.months = OrderedDict()
+        self.sizes = {}
+        self.pending = set()
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.loaded.connect(self.onLoaded)
+
+    def setStorage(self, storage: Storage) -> None:
+        """Forget all months and continue with another storage."""
+        self.storage = storage
+        self.months.clear()
+        self.sizes.clear()
+        self.pending.clear()
+
+    def get(self, year: int, month: int) -> MonthData:
+        """Return the month - it is loaded if it is not cached."""
+        key = year, month
+        if key in self.months:
+            self.months.move_to_end(key)
+            return self.months[key]
+        monthData = self.storage.loadMonth(year, month)
+        self.put(monthData)
+        return monthData
+
+    def put(self, monthData: MonthData) -> None:
+        """Add the month as most recently used one and evict the least recently used months if needed."""
+        key = monthData.year, monthData.month
+        self.months[key] = monthData
+        self.months.move_to_end(key)
+        self.sizes[key] = monthBytes(monthData)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used months until the limits are kept."""
+        for key in list(self.months)[:-1]:
+            if len(self.months) <= self.maxMonths and sum(self.sizes.values()) <= self.maxBytes:
+                return
+            if not self.months[key].changedDays:
+                del self.months[key]
+                del self.sizes[key]
+
+    def prefetch(self, year: int, month: int) -> None:
+        """Load the month in the background unless it is cached already."""
+        key = year, month
+        if key in self.months or key in self.pending:
+            return
+        self.pending.add(key)
+        self.pool.start(MonthLoader(self, self.storage, year, month))
+
+    def prefetchNeighbors(self, year: int, month: int) -> None:
+        """Load the months before and after the month in the background."""
+        self.prefetch(*((year - 1, 12) if month == 1 else (year, month - 1)))
+        self.prefetch(*((year + 1, 1) if month == 12 else (year, month + 1)))  # noqa: PLR2004
+
+    def onLoaded(self, storage: Storage, year: int, month: int, monthData: MonthData | None) -> None:
+        """Take over a month loaded in the background - unless it was loaded in the meantime."""
+        key = year, month
+        if storage is not self.storage or key not in self.pending:
+            return
+        self.pending.discard(key)
+        if monthData is not None and key not in self.months:
+            self.put(monthData)
+
+    def wait(self) -> None:
+        """Wait until the months loading in the background are done."""
+        self.pool.waitForDone()
@@ -0,0 +1,375 @@
+"""Model and view of the days of a month."""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from _dialogs import AdvancedTimeEdit
+from _icons import icon
+from _model import MonthData, MonthTotals
+from _utils import minutesToTime, timeToHourString, timeToMinutes
+
+if TYPE_CHECKING:
+    from _config import ConfigStore
+
+MAXIMUM_DAILY_ALLOWED_WORK_HOURS = 10
+
+DATE, PLANNED, START, END, AUTO_TIME, DIFF, VACATION, WORKED, LUNCH, HOME_OFFICE = range(10)
+COLUMN_COUNT = 10
+
+TOOLTIPS = {
+    AUTO_TIME: (
+        "If start time is 00:00, it will set it to the current time\n"
+        "If start time is something different, it will set the end time to the current time"
+    ),
+    VACATION: "Vacation - right click to take ZA instead",
+    LUNCH: "Green if you had lunch - will reduce the worked time on this day by the configured normal lunch break",
+    HOME_OFFICE: "Green if you worked from home - helps you remember that",
+}
+ICONS = {AUTO_TIME: "time.png", VACATION: "black-plane.png", LUNCH: "lunch.png", HOME_OFFICE: "house.png"}
+# the widest texts of the columns - they are sized for them once instead of for the contents of every month
+SAMPLE_TEXTS = {
+    DATE: [f"{name} 30.12.2000" for name in calendar.day_abbr],
+    PLANNED: ["00:00", "00.00"],
+    START: ["00:00"],
+    END: ["00:00"],
+    DIFF: ["-00:00", "-00.00"],
+    WORKED: ["00:00", "00.00"],
+}
+CHECKED_COLOR = QtGui.QColor("LightGreen")
+PAST_COLOR = QtGui.QColor(100, 100, 100)
+
+
+def formatDiff(diff: int, inHours: bool) -> str:
+    """Format a time difference in seconds."""
+    diffTime = QtCore.QTime(0, 0).addSecs(abs(diff))
+    sign = "-" if diff < 0 else ""
+    if inHours:
+        return sign + timeToHourString(diffTime)
+    return sign + diffTime.toString("h:mm")
+
+
+def formatWorked(worked: int, inHours: bool) -> str:
+    """Format the worked time in seconds."""
+    workedTime = QtCore.QTime(0, 0).addSecs(worked)
+    if inHours:
+        return timeToHourString(workedTime)
+    return workedTime.toString("hh:mm")
+
+
+class MonthTableModel(QtCore.QAbstractTableModel):
+    """Table model with one row per day of a month."""
+
+    totalsChanged = QtCore.Signal()
+    dayEdited = QtCore.Signal()
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.monthData = MonthData(2000, 1)
+        self.config = None
+        self.plannedMinutes = [0] * 8
+        self.plannedTimeTexts = [""] * 8
+        self.dayNames = ["", *list(calendar.day_abbr)]
+        self.today = datetime.date.today()  # noqa: DTZ011 - the local date is wanted here
+        self.totals = MonthTotals(self.monthData, self.plannedMinutes, 0, self.today)
+
+    def setMonth(self, monthData: MonthData, config: ConfigStore) -> None:
+        """Show a month with the given configuration."""
+        self.beginResetModel()
+        self.monthData = monthData
+        self.config = config
+        self.plannedMinutes = [timeToMinutes(x) for x in config["hours"]]
+        if config["timeLabelsInHours"]:
+            self.plannedTimeTexts = [timeToHourString(x) for x in config["hours"]]
+        else:
+            self.plannedTimeTexts = [x.toString("h:mm") for x in config["hours"]]
+        if config["forecastEndTimes"]:
+            for x in range(monthData.daysInMonth()):
+                self.forecastEnd(x)
+        self.totals = MonthTotals(monthData, self.plannedMinutes, config["lunchBreak"], self.today)
+        self.endResetModel()
+        self.totalsChanged.emit()
+
+    def setToday(self, today: datetime.date) -> None:
+        """Update the current date - only changes anything on a day rollover."""
+        if today == self.today:
+            return
+        self.today = today
+        if self.config is not None:
+            self.totals = MonthTotals(self.monthData, self.plannedMinutes, self.config["lunchBreak"], today)
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, COLUMN_COUNT - 1))
+            self.totalsChanged.emit()
+
+    def dayChanged(self, row: int) -> None:
+        """Recalculate a single changed day and adjust the totals by its difference."""
+        self.monthData.markChanged(row)
+        if self.config["forecastEndTimes"]:
+            self.forecastEnd(row)
+        self.totals.updateDay(row)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, COLUMN_COUNT - 1))
+        self.totalsChanged.emit()
+        self.dayEdited.emit()
+
+    def forecastEnd(self, row: int) -> None:
+        """Set the end time of a working day according to the planned time if only the start time is set."""
+        plannedSeconds = self.monthData.plannedSeconds(row, self.plannedMinutes)
+        day = self.monthData.days[row]
+        if day.isWorkingDay(plannedSeconds) and day.forecastEnd(plannedSeconds, self.config["lunchBreak"]):
+            self.monthData.markChanged(row)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: B008 - Qt signature
+        """Return the number of days."""
+        if parent.isValid() or self.config is None:
+            return 0
+        return self.monthData.daysInMonth()
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: B008 - Qt signature
+        """Return the number of columns."""
+        if parent.isValid():
+            return 0
+        return COLUMN_COUNT
+
+    def isVisible(self, row: int, column: int) -> bool:
+        """Return True if the cell has to be shown for the day."""
+        if column in (DATE, PLANNED, VACATION):
+            return True
+        day = self.monthData.days[row]
+        if not day.isWorkingDay(self.monthData.plannedSeconds(row, self.plannedMinutes)):
+            return False
+        if column in (LUNCH, HOME_OFFICE):
+            return not day.takesZA
+        return True
+
+    def isEditable(self, row: int, column: int) -> bool:
+        """Return True if the cell can be changed by the user."""
+        if not self.isVisible(row, column):
+            return False
+        day = self.monthData.days[row]
+        if column in (START, END):
+            return not day.takesZA and not day.hasDetails()
+        if column == AUTO_TIME:
+            return not day.takesZA
+        return True
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        """Return the item flags - the time columns are editable."""
+        flags = QtCore.Qt.ItemIsEnabled
+        if index.column() in (START, END) and self.isEditable(index.row(), index.column()):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> object:  # noqa: PLR0911
+        """Return the data of a cell."""
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if not self.isVisible(row, column):
+            return None
+        day = self.monthData.days[row]
+        if role == QtCore.Qt.DisplayRole:
+            return self.displayText(row, column)
+        if role == QtCore.Qt.EditRole and column in (START, END):
+            return minutesToTime(day.start if column == START else day.end)
+        if role == QtCore.Qt.DecorationRole and column in ICONS:
+            return icon(ICONS[column])
+        if role == QtCore.Qt.BackgroundRole:
+            checked = {VACATION: day.vacation, LUNCH: day.lunch, HOME_OFFICE: day.homeOffice}.get(column)
+            return CHECKED_COLOR if checked else None
+        if role == QtCore.Qt.ForegroundRole:
+            return self.foreground(row, column)
+        if role == QtCore.Qt.ToolTipRole:
+            return TOOLTIPS.get(column)
+        if role == QtCore.Qt.TextAlignmentRole:
+            return QtCore.Qt.AlignCenter
+        return None
+
+    def displayText(self, row: int, column: int) -> str | None:
+        """Return the text shown in a cell."""
+        day = self.monthData.days[row]
+        inHours = self.config["timeLabelsInHours"]
+        if column == DATE:
+            dayOfWeek = self.monthData.dayOfWeek(row)
+            return f"{self.dayNames[dayOfWeek]} {row + 1}.{self.monthData.month}.{self.monthData.year}"
+        if column == PLANNED:
+            return self.plannedTimeTexts[self.monthData.dayOfWeek(row)]
+        if column in (START, END):
+            return minutesToTime(day.start if column == START else day.end).toString("hh:mm")
+        if column == DIFF:
+            plannedSeconds = self.monthData.plannedSeconds(row, self.plannedMinutes)
+            diff = day.diffSeconds(plannedSeconds, self.config["lunchBreak"])
+            return formatDiff(diff, inHours) if diff else None
+        if column == WORKED:
+            return formatWorked(day.workedSeconds(self.config["lunchBreak"]), inHours) if day.start else ""
+        return None
+
+    def foreground(self, row: int, column: int) -> QtGui.QColor | None:
+        """Return the text color of a cell."""
+        if column == DATE and self.monthData.isCurrentMonth(self.today):
+            if row + 1 < self.today.day:
+                return PAST_COLOR
+            if row + 1 == self.today.day:
+                return QtGui.QColor("red")
+        if column == WORKED:
+            # mark the time red if it is more than 10 hours
+            worked = self.monthData.days[row].workedSeconds(self.config["lunchBreak"])
+            if worked > MAXIMUM_DAILY_ALLOWED_WORK_HOURS * 3600:
+                return QtGui.QColor("red")
+        return None
+
+    def setData(self, index: QtCore.QModelIndex, value: QtCore.QTime, role: int = QtCore.Qt.EditRole) -> bool:
+        """Set the start or end time of a day."""
+        if role != QtCore.Qt.EditRole or index.column() not in (START, END):
+            return False
+        day = self.monthData.days[index.row()]
+        if index.column() == START:
+            day.start = timeToMinutes(value)
+        else:
+            day.end = timeToMinutes(value)
+        self.dayChanged(index.row())
+        return True
+
+    def toggle(self, row: int, column: int) -> None:
+        """Toggle the vacation, lunch or home office state of a day."""
+        if not self.isEditable(row, column):
+            return
+        day = self.monthData.days[row]
+        if column == VACATION:
+            day.vacation = not day.vacation
+            day.za = False
+        elif column == LUNCH:
+            day.lunch = not day.lunch
+        elif column == HOME_OFFICE:
+            day.homeOffice = not day.homeOffice
+        else:
+            return
+        self.dayChanged(row)
+
+    def toggleZA(self, row: int) -> None:
+        """Take the day off as ZA or revert it to a normal day."""
+        day = self.monthData.days[row]
+        day.za = not day.takesZA
+        day.vacation = day.za
+        self.dayChanged(row)
+
+
+class TimeEditDelegate(QtWidgets.QStyledItemDelegate):
+    """Delegate creating the time editors only while a time is edited."""
+
+    # size hint of the time editors - they all have the same
+    cachedEditorSize = None
+
+    def createEditor(
+        self,
+        parent: QtWidgets.QWidget,
+        option: QtWidgets.QStyleOptionViewItem,  # noqa: ARG002 - Qt signature
+        index: QtCore.QModelIndex,  # noqa: ARG002 - Qt signature
+    ) -> AdvancedTimeEdit:
+        """Create the time editor."""
+        editor = AdvancedTimeEdit(parent)
+        editor.setAlignment(QtCore.Qt.AlignCenter)
+        return editor
+
+    def setEditorData(self, editor: AdvancedTimeEdit, index: QtCore.QModelIndex) -> None:
+        """Show the time of the cell in the editor."""
+        editor.setTime(index.data(QtCore.Qt.EditRole))
+
+    def setModelData(self, editor: AdvancedTimeEdit, model: MonthTableModel, index: QtCore.QModelIndex) -> None:
+        """Store the time of the editor in the model."""
+        model.setData(index, editor.time(), QtCore.Qt.EditRole)
+
+    @staticmethod
+    def editorSize() -> QtCore.QSize:
+        """Return the size hint of the time editors."""
+        if TimeEditDelegate.cachedEditorSize is None:
+            TimeEditDelegate.cachedEditorSize = AdvancedTimeEdit().sizeHint()
+        return TimeEditDelegate.cachedEditorSize
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        """Return a size which fits the editor."""
+        return super().sizeHint(option, index).expandedTo(self.editorSize())
+
+
+class MonthView(QtWidgets.QTableView):
+    """Table view of the days of a month."""
+
+    dateClicked = QtCore.Signal(int)
+    autoTimeClicked = QtCore.Signal(int)
+    restoreClicked = QtCore.Signal()
+
+    def __init__(self, model: MonthTableModel, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setModel(model)
+        self.timeDelegate = TimeEditDelegate(self)
+        self.setItemDelegateForColumn(START, self.timeDelegate)
+        self.setItemDelegateForColumn(END, self.timeDelegate)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.setShowGrid(False)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.showContextMenu)
+        self.clicked.connect(self.onClicked)
+        self.sizeColumns()
+
+    def sizeColumns(self) -> None:
+        """Size the columns for their widest texts and icons - the time editors have to fit as well."""
+        for column in range(COLUMN_COUNT):
+            option = QtWidgets.QStyleOptionViewItem()
+            self.initViewItemOption(option)
+            if column in SAMPLE_TEXTS:
+                option.features |= QtWidgets.QStyleOptionViewItem.HasDisplay
+            if column in ICONS:
+                option.features |= QtWidgets.QStyleOptionViewItem.HasDecoration
+                option.icon = icon(ICONS[column])
+            width = 0
+            for text in SAMPLE_TEXTS.get(column, [""]):
+                option.text = text
+                size = self.style().sizeFromContents(QtWidgets.QStyle.CT_ItemViewItem, option, QtCore.QSize(), self)
+                if column in (START, END):
+                    size = size.expandedTo(self.timeDelegate.editorSize())
+                width = max(width, size.width())
+            self.setColumnWidth(column, width)
+
+    def onClicked(self, index: QtCore.QModelIndex) -> None:
+        """Handle the clicks on the button like cells."""
+        row, column = index.row(), index.column()
+        if column == DATE:
+            self.dateClicked.emit(row)
+        elif column == AUTO_TIME:
+            if self.model().isEditable(row, column):
+                self.autoTimeClicked.emit(row)
+        else:
+            self.model().toggle(row, column)
+
+    def showContextMenu(self, pos: QtCore.QPoint) -> None:
+        """Offer to take ZA on the vacation cells and to restore the month from a snapshot."""
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        contextMenu = QtWidgets.QMenu(self)
+        takeZA = None
+        if index.column() == VACATION:
+            takeZA = contextMenu.addAction("Take ZA")
+            takeZA.setCheckable(True)
+            takeZA.setChecked(self.model().monthData.days[index.row()].takesZA)
+            contextMenu.addSeparator()
+        restore = contextMenu.addAction("Restore Month...")
+
+        action = contextMenu.exec_(self.viewport().mapToGlobal(pos))
+        if action is None:
+            return
+        if action == takeZA:
+            self.model().toggleZA(index.row())
+        elif action == restore:
+            self.restoreClicked.emit()
+
+    def sizeHint(self) -> QtCore.QSize:
+        """Return a width showing all columns."""
+        width = self.horizontalHeader().length() + 2 * self.frameWidth() + self.verticalScrollBar().sizeHint().width()
+        return QtCore.QSize(width, super().sizeHint().height())
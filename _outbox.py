@@ -0,0 +1,134 @@
+"""Outbox of the worklogs waiting for Jira - retried with exponential backoff until Jira took them."""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore, QtNetwork
+
+from _utils import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from _registry import WorkPackageRegistry
+    from times import WorkPackage
+
+# seconds to the first retry - doubled with every failed attempt up to BACKOFF_MAX
+BACKOFF_START = 30
+BACKOFF_MAX = 3600
+# share of the delay it is randomly made longer or shorter, so the retries of many worklogs spread out
+JITTER = 0.2
+
+
+def newWorklog(ticket: str, seconds: int) -> dict:
+    """Return a new outbox entry - its key identifies the worklog in Jira, so it is written only once."""
+    return {
+        "key": uuid.uuid4().hex,
+        "ticket": ticket,
+        "seconds": seconds,
+        "created": round(time.time()),
+        "attempts": 0,
+        "nextAttempt": 0,
+        "error": "",
+    }
+
+
+def backoff(attempts: int) -> float:
+    """Return the seconds to wait after the attempts failed."""
+    delay = min(BACKOFF_MAX, BACKOFF_START * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(1 - JITTER, 1 + JITTER)  # noqa: S311 - no cryptography here
+
+
+class WorklogOutbox(QtCore.QObject):
+    """
+    Send the queued worklogs of the work packages when they are due.
+
+    The entries are part of the json of their work package, so the time they reserve is saved together with them
+    and is neither lost nor logged twice after a crash. Every attempt is counted and saved before it is sent -
+    a worklog attempted before is only written if Jira does not have it yet.
+    A failed worklog is retried with exponential backoff, and all are retried at once when the network
+    comes back or another worklog was written.
+    """
+
+    def __init__(
+        self,
+        registry: WorkPackageRegistry,
+        send: Callable[[WorkPackage, dict, bool], None],
+        save: Callable[[], None],
+        parent: QtCore.QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.registry = registry
+        self.send = send
+        self.save = save
+        # keys of the worklogs currently sent
+        self.sending: set[str] = set()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.drain)
+        if QtNetwork.QNetworkInformation.loadBackendByFeatures(QtNetwork.QNetworkInformation.Feature.Reachability):
+            QtNetwork.QNetworkInformation.instance().reachabilityChanged.connect(self.onReachabilityChanged)
+
+    def waiting(self) -> Iterable[tuple[WorkPackage, dict]]:
+        """Yield the worklogs which are not sent right now with their work packages."""
+        for wp in self.registry:
+            for entry in wp.queuedWorklogs:
+                if entry["key"] not in self.sending:
+                    yield wp, entry
+
+    def drain(self, force: bool = False, workPackages: Iterable[WorkPackage] | None = None) -> None:
+        """Send the due worklogs - all with force - of the work packages, by default of all."""
+        now = time.time()
+        if workPackages is not None:
+            workPackages = set(workPackages)
+        due = [
+            (wp, entry)
+            for wp, entry in self.waiting()
+            if (force or entry["nextAttempt"] <= now) and (workPackages is None or wp in workPackages)
+        ]
+        for _, entry in due:
+            self.sending.add(entry["key"])
+            entry["attempts"] += 1
+        if due:
+            self.save()
+        for wp, entry in due:
+            self.send(wp, entry, entry["attempts"] > 1)
+        self.schedule()
+
+    def schedule(self) -> None:
+        """Start the timer for the next due worklog."""
+        nextAttempt = min((entry["nextAttempt"] for _, entry in self.waiting()), default=None)
+        if nextAttempt is None:
+            self.timer.stop()
+        else:
+            self.timer.start(max(0, round((nextAttempt - time.time()) * 1000)))
+
+    def written(self, entry: dict) -> None:
+        """Forget the worklog Jira took - the others are tried right away, as Jira is reachable again."""
+        self.sending.discard(entry["key"])
+        if any(True for _ in self.waiting()):
+            logging.info("Jira is reachable - sending the queued worklogs")
+            self.drain(force=True)
+
+    def rejected(self, entry: dict) -> None:
+        """Forget the worklog Jira will never take."""
+        self.sending.discard(entry["key"])
+
+    def retryLater(self, entry: dict, error: str) -> None:
+        """Note the failed attempt and try again after the backoff."""
+        self.sending.discard(entry["key"])
+        entry["nextAttempt"] = round(time.time() + backoff(entry["attempts"]))
+        entry["error"] = error
+        logging.info(
+            "worklog %s to %s failed - retrying at %s", entry["key"], entry["ticket"], time.ctime(entry["nextAttempt"])
+        )
+        self.schedule()
+
+    def onReachabilityChanged(self, reachability: QtNetwork.QNetworkInformation.Reachability) -> None:
+        """Send all queued worklogs once the network is back."""
+        if reachability == QtNetwork.QNetworkInformation.Reachability.Online:
+            self.drain(force=True)
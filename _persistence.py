@@ -0,0 +1,74 @@
+"""Helpers to write the data files safely and not more often than needed."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+# hashes of the content last written to (or read from) a file
+WRITTEN_HASHES = {}
+
+
+def writeFileAtomic(path: Path, text: str) -> None:
+    """Write the file through a temporary file, so it is never left half written."""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w") as fp:
+        fp.write(text)
+        fp.flush()
+        os.fsync(fp.fileno())
+    tmp.replace(path)
+
+
+def writeIfChanged(path: Path, text: str) -> bool:
+    """Write the file atomically unless it already has this content. Return True if it was written."""
+    key = str(path.resolve())
+    contentHash = hashlib.sha256(text.encode()).digest()
+    if key not in WRITTEN_HASHES and path.exists():
+        WRITTEN_HASHES[key] = hashlib.sha256(path.read_bytes()).digest()
+    if WRITTEN_HASHES.get(key) == contentHash:
+        return False
+    writeFileAtomic(path, text)
+    WRITTEN_HASHES[key] = contentHash
+    return True
+
+
+class SaveCoordinator(QtCore.QObject):
+    """
+    Coalesce bursts of save requests into a single save.
+
+    A save is done when no further request came in for the delay, but at the latest after maxDelay.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None, delay: int = 1000, maxDelay: int = 10000) -> None:
+        super().__init__(parent)
+        self.maxDelay = maxDelay
+        self.pending = {}
+        self.firstRequest = 0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+
+    def request(self, key: str, save: Callable[[], None]) -> None:
+        """Request a save - requests with the same key are done only once."""
+        now = time.monotonic()
+        if not self.timer.isActive():
+            self.firstRequest = now
+        self.pending[key] = save
+        if (now - self.firstRequest) * 1000 < self.maxDelay:
+            self.timer.start()
+
+    def flush(self) -> None:
+        """Do all pending saves now."""
+        self.timer.stop()
+        pending, self.pending = self.pending, {}
+        for save in pending.values():
+            save()
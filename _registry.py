@@ -0,0 +1,142 @@
+"""Registry of the work packages with indexes by name and ticket and a substring search."""
+
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from times import WorkPackage
+
+# length of the substrings in the search index
+GRAM = 3
+
+
+def grams(text: str) -> set[str]:
+    """Return the substrings of length GRAM of text."""
+    return {text[x : x + GRAM] for x in range(len(text) - GRAM + 1)}
+
+
+class WorkPackageRegistry:
+    """
+    The work packages in the order they were added, indexed by name and ticket.
+
+    Names are unique - including the archived work packages, which are only kept as their json data.
+    Tickets may be shared. The tracked work package is kept directly,
+    so starting one and stopping the previous does not look at the others.
+    Searches of GRAM or more characters only check the work packages containing all substrings of the text.
+    """
+
+    def __init__(self) -> None:
+        self.positions: dict[WorkPackage, int] = {}
+        self.counter = itertools.count()
+        self.byName: dict[str, WorkPackage] = {}
+        self.byTicket: dict[str, list[WorkPackage]] = {}
+        self.keys: dict[WorkPackage, tuple[str, str | None, str]] = {}
+        self.index: dict[str, set[WorkPackage]] = {}
+        self.active: WorkPackage | None = None
+        self.archived: dict[str, dict] = {}
+
+    def __iter__(self) -> Iterator[WorkPackage]:
+        """Yield the work packages in the order they were added."""
+        return iter(list(self.positions))
+
+    def __len__(self) -> int:
+        """Return the number of work packages."""
+        return len(self.positions)
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if there is a work package or an archived one with the name."""
+        return name in self.byName or name in self.archived
+
+    def get(self, name: str) -> WorkPackage | None:
+        """Return the work package with the name."""
+        return self.byName.get(name)
+
+    def withTicket(self, ticket: str) -> list[WorkPackage]:
+        """Return the work packages of the ticket."""
+        return list(self.byTicket.get(ticket, []))
+
+    def add(self, wp: WorkPackage) -> None:
+        """Add the work package - its name has to be unique."""
+        if wp.name in self.byName:
+            msg = f"Work package {wp.name!r} already exists"
+            raise ValueError(msg)
+        self.positions[wp] = next(self.counter)
+        self.addKeys(wp)
+        if wp.isChecked():
+            self.active = wp
+
+    def remove(self, wp: WorkPackage) -> None:
+        """Remove the work package."""
+        del self.positions[wp]
+        self.removeKeys(wp)
+        if self.active is wp:
+            self.active = None
+
+    def archive(self, wp: WorkPackage) -> dict:
+        """Replace the work package by its json data marked as archived and return the data."""
+        data = {**wp.asJson(), "archived": True}
+        self.remove(wp)
+        self.archived[wp.name] = data
+        return data
+
+    def unarchive(self, name: str) -> dict:
+        """Remove the archived work package and return its json data."""
+        data = self.archived.pop(name)
+        data.pop("archived", None)
+        return data
+
+    def reindex(self, wp: WorkPackage) -> None:
+        """Update the indexes after name or ticket of the work package changed."""
+        self.removeKeys(wp)
+        self.addKeys(wp)
+
+    def addKeys(self, wp: WorkPackage) -> None:
+        """Add the work package to the indexes."""
+        text = f"{wp.name}\t{wp.ticket or ''}".casefold()
+        self.keys[wp] = (wp.name, wp.ticket, text)
+        self.byName[wp.name] = wp
+        if wp.ticket:
+            self.byTicket.setdefault(wp.ticket, []).append(wp)
+        for gram in grams(text):
+            self.index.setdefault(gram, set()).add(wp)
+
+    def removeKeys(self, wp: WorkPackage) -> None:
+        """Remove the work package from the indexes - with the keys it was added with."""
+        name, ticket, text = self.keys.pop(wp)
+        if self.byName.get(name) is wp:
+            del self.byName[name]
+        if ticket:
+            self.byTicket[ticket].remove(wp)
+            if not self.byTicket[ticket]:
+                del self.byTicket[ticket]
+        for gram in grams(text):
+            self.index[gram].discard(wp)
+            if not self.index[gram]:
+                del self.index[gram]
+
+    def setTracking(self, wp: WorkPackage, tracking: bool) -> WorkPackage | None:
+        """Note the start or stop of tracking on the work package. Return the previously tracked one if it has to stop."""
+        previous = self.active
+        if tracking:
+            self.active = wp
+            return previous if previous is not wp else None
+        if previous is wp:
+            self.active = None
+        return None
+
+    def search(self, text: str) -> list[WorkPackage]:
+        """Return the work packages whose name or ticket contains text (ignoring the case) in their order."""
+        text = text.casefold()
+        if not text:
+            return list(self.positions)
+        if len(text) < GRAM:
+            candidates = self.positions
+        else:
+            sets = sorted((self.index.get(gram, set()) for gram in grams(text)), key=len)
+            candidates = set.intersection(*sets)
+        matches = [wp for wp in candidates if text in self.keys[wp][2]]
+        return sorted(matches, key=self.positions.__getitem__)
@@ -0,0 +1,63 @@
+"""Timers driving the periodic updates of the main window."""
+
+from __future__ import annotations
+
+from PySide6 import QtCore
+
+VISIBLE_INTERVAL = 1000
+HIDDEN_INTERVAL = 60 * 1000
+# wake up shortly after midnight, so the new date is certainly there
+MIDNIGHT_MARGIN = 500
+
+
+class TickScheduler(QtCore.QObject):
+    """
+    Emit tick only while it is needed and dayChanged at midnight.
+
+    Ticks are only needed while a work package is tracked - every second if it can be seen
+    and every minute if the windows are hidden or minimized.
+    """
+
+    tick = QtCore.Signal()
+    dayChanged = QtCore.Signal()
+
+    def __init__(
+        self,
+        parent: QtCore.QObject | None = None,
+        visibleInterval: int = VISIBLE_INTERVAL,
+        hiddenInterval: int = HIDDEN_INTERVAL,
+    ) -> None:
+        super().__init__(parent)
+        self.visibleInterval = visibleInterval
+        self.hiddenInterval = hiddenInterval
+        self.tickTimer = QtCore.QTimer(self)
+        self.tickTimer.timeout.connect(self.tick)
+        self.midnightTimer = QtCore.QTimer(self)
+        self.midnightTimer.setSingleShot(True)
+        self.midnightTimer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.midnightTimer.timeout.connect(self.onMidnight)
+        self.scheduleMidnight()
+
+    def setState(self, tracking: bool, visible: bool) -> None:
+        """Adapt the ticks to whether a work package is tracked and whether it can be seen."""
+        if not tracking:
+            self.tickTimer.stop()
+            return
+        interval = self.visibleInterval if visible else self.hiddenInterval
+        if self.tickTimer.isActive() and self.tickTimer.interval() == interval:
+            return
+        if visible:
+            # show the current state right away instead of after the first interval
+            self.tick.emit()
+        self.tickTimer.start(interval)
+
+    def scheduleMidnight(self) -> None:
+        """Start the timer for the next midnight."""
+        now = QtCore.QDateTime.currentDateTime()
+        midnight = QtCore.QDateTime(now.date().addDays(1), QtCore.QTime(0, 0))
+        self.midnightTimer.start(now.msecsTo(midnight) + MIDNIGHT_MARGIN)
+
+    def onMidnight(self) -> None:
+        """Announce the new day and wait for the next midnight."""
+        self.dayChanged.emit()
+        self.scheduleMidnight()
@@ -0,0 +1,85 @@
+"""Compressed, content addressed backups of the month files."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING
+
+from _model import DATA_FOLDER, monthKey
+from _persistence import writeFileAtomic
+from _utils import logging
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SNAPSHOT_GENERATIONS = 10
+
+
+class SnapshotStore:
+    """
+    The last generations of every month file.
+
+    The compressed contents are stored once per hash, so unchanged months and identical months share
+    their snapshot. Every month has a list of its generations with the time they were taken.
+    """
+
+    def __init__(self, folder: Path = DATA_FOLDER / "snapshots", generations: int = SNAPSHOT_GENERATIONS) -> None:
+        self.folder = folder
+        self.objects = folder / "objects"
+        self.generations = generations
+
+    def indexFile(self, year: int, month: int) -> Path:
+        """Return the path of the generation list of the month."""
+        return self.folder / f"{monthKey(year, month)}.json"
+
+    def objectFile(self, contentHash: str) -> Path:
+        """Return the path of the compressed content with the hash."""
+        return self.objects / f"{contentHash}.json.gz"
+
+    def history(self, year: int, month: int) -> list[list]:
+        """Return hash and time in ns of all generations of the month - the oldest first."""
+        try:
+            with self.indexFile(year, month).open() as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError):
+            logging.exception("Could not read the snapshots of %s", monthKey(year, month))
+            return []
+
+    def add(self, year: int, month: int, content: bytes) -> bool:
+        """Take a snapshot of the content unless it equals the last one. Return True if it was taken."""
+        contentHash = hashlib.sha256(content).hexdigest()
+        generations = self.history(year, month)
+        if generations and generations[-1][0] == contentHash:
+            return False
+        self.objects.mkdir(parents=True, exist_ok=True)
+        objectFile = self.objectFile(contentHash)
+        if not objectFile.exists():
+            tmp = objectFile.with_name(objectFile.name + ".tmp")
+            tmp.write_bytes(gzip.compress(content))
+            tmp.replace(objectFile)
+        generations.append([contentHash, time.time_ns()])
+        removed = generations[: -self.generations]
+        del generations[: -self.generations]
+        writeFileAtomic(self.indexFile(year, month), json.dumps(generations))
+        self.prune({oldHash for oldHash, _ in removed} - {keptHash for keptHash, _ in generations})
+        return True
+
+    def restore(self, year: int, month: int, generation: int = -1) -> bytes:
+        """Return the content of a generation of the month - by default the latest one."""
+        contentHash, _ = self.history(year, month)[generation]
+        return gzip.decompress(self.objectFile(contentHash).read_bytes())
+
+    def prune(self, candidates: set[str]) -> None:
+        """Remove the contents of the candidates which are not used by any month anymore."""
+        if not candidates:
+            return
+        for indexFile in self.folder.glob("*.json"):
+            with indexFile.open() as fp:
+                candidates -= {contentHash for contentHash, _ in json.load(fp)}
+        for contentHash in candidates:
+            self.objectFile(contentHash).unlink(missing_ok=True)
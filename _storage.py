@@ -0,0 +1,433 @@
+"""Storage backends for the months and the work packages."""
+
+from __future__ import annotations
+
+import abc
+import datetime
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from _journal import MonthJournal, appendLines, loadMonth, saveMonth
+from _model import DATA_FOLDER, DayRecord, MonthData, emptyDetails, monthFile, monthKey, parseMonthKey
+from _persistence import writeFileAtomic, writeIfChanged
+from _snapshots import SnapshotStore
+from _utils import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+WORK_PACKAGES_FILE = Path("workpackages.json")
+# the journal of the tracked intervals next to the work packages
+INTERVALS_FILE_NAME = "intervals.journal"
+DATABASE_FILE = DATA_FOLDER / "times.sqlite"
+STORAGE_TYPES = ("json", "sqlite")
+
+
+class Storage(abc.ABC):
+    """Interface of the storage backends."""
+
+    @abc.abstractmethod
+    def loadMonth(self, year: int, month: int) -> MonthData:
+        """Load a month - months without data are returned empty."""
+
+    @abc.abstractmethod
+    def saveMonth(self, monthData: MonthData, compact: bool = False) -> None:
+        """Save the changed days of a month - compact the storage if requested."""
+
+    @abc.abstractmethod
+    def monthStamps(self) -> dict[tuple[int, int], list]:
+        """Return a stamp per stored month which changes whenever the month is saved."""
+
+    def snapshotTimes(self, year: int, month: int) -> list[int]:  # noqa: ARG002 - not every storage takes snapshots
+        """Return the times in ns the snapshots of the month were taken - the oldest first."""
+        return []
+
+    def restoreMonth(self, year: int, month: int, generation: int = -1) -> MonthData:
+        """Replace the month by a generation of its snapshots and return it."""
+        msg = f"{monthKey(year, month)} has no snapshot generation {generation}"
+        raise IndexError(msg)
+
+    @abc.abstractmethod
+    def loadWorkPackages(self) -> list[dict]:
+        """Load the work packages."""
+
+    @abc.abstractmethod
+    def saveWorkPackages(self, workPackages: list[dict]) -> None:
+        """Save the work packages."""
+
+    @abc.abstractmethod
+    def loadIntervals(self) -> dict[str, list[int]]:
+        """Load the tracked intervals by the key of their work package - as flat lists of starts and ends."""
+
+    @abc.abstractmethod
+    def saveIntervals(self, intervals: dict[str, list[int]], replace: bool = False) -> None:
+        """Add the new intervals of the work packages by their key - or replace all stored intervals by them."""
+
+    def queryDays(
+        self,
+        first: datetime.date,
+        last: datetime.date,
+        homeOffice: bool | None = None,
+    ) -> list[tuple[datetime.date, DayRecord]]:
+        """Return the stored days between first and last, optionally only (not) in home office."""
+        result = []
+        stored = self.monthStamps()
+        for year, month in monthsBetween(first, last):
+            if (year, month) not in stored:
+                continue
+            for x, day in enumerate(self.loadMonth(year, month).days):
+                date = datetime.date(year, month, x + 1)
+                if first <= date <= last and (homeOffice is None or day.homeOffice == homeOffice):
+                    result.append((date, day))
+        return result
+
+    def forThread(self) -> Storage:
+        """Return a storage which can load months in another thread - it is closed after use."""
+        return self
+
+    def close(self) -> None:  # noqa: B027 - most storages have nothing to release
+        """Release the storage."""
+
+
+class JsonStorage(Storage):
+    """One json file (plus journal) per month and a json file for the work packages."""
+
+    def __init__(self, folder: Path = DATA_FOLDER, workPackagesFile: Path = WORK_PACKAGES_FILE) -> None:
+        self.folder = folder
+        self.workPackagesFile = workPackagesFile
+        self.intervalsFile = workPackagesFile.with_name(INTERVALS_FILE_NAME)
+        self.snapshots = SnapshotStore(folder / "snapshots")
+
+    def loadMonth(self, year: int, month: int) -> MonthData:
+        """Load the month file and its journal."""
+        return loadMonth(year, month, self.folder)
+
+    def saveMonth(self, monthData: MonthData, compact: bool = False) -> None:
+        """Append the changed days to the journal of the month - a snapshot is taken whenever it is compacted."""
+        if saveMonth(monthData, compact, self.folder):
+            file = monthFile(monthData.year, monthData.month, self.folder)
+            self.snapshots.add(monthData.year, monthData.month, file.read_bytes())
+
+    def snapshotTimes(self, year: int, month: int) -> list[int]:
+        """Return the times in ns the snapshots of the month were taken - the oldest first."""
+        return [taken for _, taken in self.snapshots.history(year, month)]
+
+    def restoreMonth(self, year: int, month: int, generation: int = -1) -> MonthData:
+        """Replace the month by a generation of its snapshots - the replaced month is kept as snapshot."""
+        file = monthFile(year, month, self.folder)
+        content = self.snapshots.restore(year, month, generation)
+        # the journal is compacted first, so the snapshot of the replaced month has all its changes
+        self.saveMonth(loadMonth(year, month, self.folder), compact=True)
+        if file.exists():
+            self.snapshots.add(year, month, file.read_bytes())
+        writeIfChanged(file, content.decode())
+        MonthJournal(year, month, self.folder).clear()
+        return loadMonth(year, month, self.folder)
+
+    def monthStamps(self) -> dict[tuple[int, int], list]:
+        """Return name, mtime and size of the month files and journals."""
+        stamps = {}
+        for file in sorted(self.folder.glob("*.json")) + sorted(self.folder.glob("*.journal")):
+            yearAndMonth = parseMonthKey(file.stem)
+            if yearAndMonth is not None:
+                stat = file.stat()
+                stamps.setdefault(yearAndMonth, []).append([file.name, stat.st_mtime_ns, stat.st_size])
+        return stamps
+
+    def loadWorkPackages(self) -> list[dict]:
+        """Load the work packages from their json file - there are none before they were saved the first time."""
+        if not self.workPackagesFile.exists():
+            return []
+        with self.workPackagesFile.open() as fp:
+            return json.load(fp)
+
+    def saveWorkPackages(self, workPackages: list[dict]) -> None:
+        """Save the work packages to their json file - unless they did not change."""
+        writeIfChanged(self.workPackagesFile, json.dumps(workPackages, indent=4))
+
+    def loadIntervals(self) -> dict[str, list[int]]:
+        """Load the intervals from their journal - every line holds intervals of one work package."""
+        intervals = {}
+        if not self.intervalsFile.exists():
+            return intervals
+        with self.intervalsFile.open() as fp:
+            for line in fp:
+                try:
+                    key, flat = json.loads(line)
+                except ValueError:
+                    logging.warning("Ignoring incomplete entry in %s", self.intervalsFile)
+                    continue
+                intervals.setdefault(key, []).extend(flat)
+        return intervals
+
+    def saveIntervals(self, intervals: dict[str, list[int]], replace: bool = False) -> None:
+        """Append the new intervals to their journal - or write it anew with all intervals."""
+        lines = "".join(json.dumps([key, flat]) + "\n" for key, flat in intervals.items() if flat)
+        if replace:
+            writeFileAtomic(self.intervalsFile, lines)
+        elif lines:
+            appendLines(self.intervalsFile, lines)
+
+
+class SqliteStorage(Storage):
+    """All data in a single SQLite database with the days indexed by their date."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS days (
+            date TEXT PRIMARY KEY,
+            startTime INTEGER NOT NULL,
+            endTime INTEGER NOT NULL,
+            vacation INTEGER NOT NULL,
+            za INTEGER NOT NULL,
+            lunch INTEGER NOT NULL,
+            homeOffice INTEGER NOT NULL,
+            detailStart INTEGER NOT NULL,
+            detailEnd INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS daysByHomeOffice ON days (homeOffice, date);
+        CREATE TABLE IF NOT EXISTS detailTimes (
+            date TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            startTime INTEGER NOT NULL,
+            endTime INTEGER NOT NULL,
+            timeType INTEGER NOT NULL,
+            PRIMARY KEY (date, slot)
+        );
+        CREATE TABLE IF NOT EXISTS months (
+            month TEXT PRIMARY KEY,
+            updated INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS workPackages (
+            position INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            ticket TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS workPackagesByTicket ON workPackages (ticket);
+        CREATE TABLE IF NOT EXISTS intervals (
+            workPackage TEXT NOT NULL,
+            startTime INTEGER NOT NULL,
+            endTime INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, database: Path = DATABASE_FILE) -> None:
+        if not database.parent.exists():
+            database.parent.mkdir()
+        self.database = database
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.workPackagesHash = None
+
+    def loadMonth(self, year: int, month: int) -> MonthData:
+        """Load the stored days of the month."""
+        monthData = MonthData(year, month)
+        first, last = monthRange(year, month)
+        for date, day in self.selectDays("date BETWEEN ? AND ?", (first.isoformat(), last.isoformat())):
+            monthData.days[date.day - 1] = day
+        return monthData
+
+    def selectDays(self, where: str, parameters: tuple) -> Iterator[tuple[datetime.date, DayRecord]]:
+        """Return the days matching the where clause together with their detail times."""
+        details = {}
+        detailRows = self.connection.execute(
+            f"SELECT date, slot, startTime, endTime, timeType FROM detailTimes WHERE date IN (SELECT date FROM days WHERE {where})",  # noqa: E501, S608 - only called with constant where clauses
+            parameters,
+        )
+        for date, slot, start, end, timeType in detailRows:
+            details.setdefault(date, emptyDetails()[2])[slot] = (start, end, timeType)
+        rows = self.connection.execute(
+            "SELECT date, startTime, endTime, vacation, za, lunch, homeOffice, detailStart, detailEnd "  # noqa: S608 - see above
+            f"FROM days WHERE {where} ORDER BY date",
+            parameters,
+        )
+        for date, start, end, vacation, za, lunch, homeOffice, detailStart, detailEnd in rows:
+            timestamps = [detailStart, detailEnd, details.get(date) or emptyDetails()[2]]
+            day = DayRecord(start, end, bool(vacation), bool(lunch), bool(homeOffice), timestamps, bool(za))
+            yield datetime.date.fromisoformat(date), day
+
+    def saveMonth(self, monthData: MonthData, compact: bool = False) -> None:
+        """Store the changed days in a single transaction - a checkpoint of the WAL is done if compact is set."""
+        if monthData.changedDays:
+            with self.connection:
+                for x in sorted(monthData.changedDays):
+                    self.storeDay(datetime.date(monthData.year, monthData.month, x + 1), monthData.days[x])
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO months (month, updated) VALUES (?, ?)",
+                    (f"{monthData.year:04d}-{monthData.month:02d}", time.time_ns()),
+                )
+            monthData.changedDays.clear()
+        if compact:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def storeDay(self, date: datetime.date, day: DayRecord) -> None:
+        """Insert or replace a day and its detail times."""
+        isoDate = date.isoformat()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                isoDate,
+                day.start,
+                day.end,
+                day.vacation,
+                day.takesZA,
+                day.lunch,
+                day.homeOffice,
+                day.details[0],
+                day.details[1],
+            ),
+        )
+        self.connection.execute("DELETE FROM detailTimes WHERE date = ?", (isoDate,))
+        self.connection.executemany(
+            "INSERT INTO detailTimes VALUES (?, ?, ?, ?, ?)",
+            [
+                (isoDate, slot, timestamps[0], timestamps[1], timestamps[2] if len(timestamps) > 2 else 0)  # noqa: PLR2004
+                for slot, timestamps in enumerate(day.details[2])
+                if any(timestamps)
+            ],
+        )
+
+    def monthStamps(self) -> dict[tuple[int, int], list]:
+        """Return the time of the last change of every stored month."""
+        stamps = {}
+        for month, updated in self.connection.execute("SELECT month, updated FROM months"):
+            year, _, monthNumber = month.partition("-")
+            stamps[int(year), int(monthNumber)] = ["sqlite", updated]
+        return stamps
+
+    def queryDays(
+        self,
+        first: datetime.date,
+        last: datetime.date,
+        homeOffice: bool | None = None,
+    ) -> list[tuple[datetime.date, DayRecord]]:
+        """Return the stored days between first and last with a single indexed query."""
+        if homeOffice is None:
+            return list(self.selectDays("date BETWEEN ? AND ?", (first.isoformat(), last.isoformat())))
+        return list(
+            self.selectDays("homeOffice = ? AND date BETWEEN ? AND ?", (homeOffice, first.isoformat(), last.isoformat())),
+        )
+
+    def loadWorkPackages(self) -> list[dict]:
+        """Load the work packages in their stored order."""
+        rows = self.connection.execute("SELECT data FROM workPackages ORDER BY position")
+        workPackages = [json.loads(data) for (data,) in rows]
+        self.workPackagesHash = workPackagesHash(workPackages)
+        return workPackages
+
+    def saveWorkPackages(self, workPackages: list[dict]) -> None:
+        """Replace all stored work packages - unless they did not change."""
+        contentHash = workPackagesHash(workPackages)
+        if contentHash == self.workPackagesHash:
+            return
+        with self.connection:
+            self.connection.execute("DELETE FROM workPackages")
+            self.connection.executemany(
+                "INSERT INTO workPackages VALUES (?, ?, ?, ?)",
+                [(x, wp["name"], wp["ticket"], json.dumps(wp)) for x, wp in enumerate(workPackages)],
+            )
+        self.workPackagesHash = contentHash
+
+    def loadIntervals(self) -> dict[str, list[int]]:
+        """Load the intervals in the order they were added."""
+        intervals = {}
+        for key, start, end in self.connection.execute("SELECT workPackage, startTime, endTime FROM intervals ORDER BY rowid"):
+            intervals.setdefault(key, []).extend((start, end))
+        return intervals
+
+    def saveIntervals(self, intervals: dict[str, list[int]], replace: bool = False) -> None:
+        """Insert the new intervals - after deleting all stored ones if they are replaced."""
+        with self.connection:
+            if replace:
+                self.connection.execute("DELETE FROM intervals")
+            self.connection.executemany(
+                "INSERT INTO intervals VALUES (?, ?, ?)",
+                [(key, flat[x], flat[x + 1]) for key, flat in intervals.items() for x in range(0, len(flat) - 1, 2)],
+            )
+
+    def forThread(self) -> Storage:
+        """Return a storage with its own connection, as a connection must not be shared between threads."""
+        return SqliteStorage(self.database)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+
+def workPackagesHash(workPackages: list[dict]) -> bytes:
+    """Return a hash of the serialized work packages."""
+    return hashlib.sha256(json.dumps(workPackages).encode()).digest()
+
+
+def monthRange(year: int, month: int) -> tuple[datetime.date, datetime.date]:
+    """Return the first and the last day of the month."""
+    first = datetime.date(year, month, 1)
+    return first, datetime.date(year, month, MonthData(year, month).daysInMonth())
+
+
+def monthsBetween(first: datetime.date, last: datetime.date) -> Iterator[tuple[int, int]]:
+    """Yield year and month of all months from first to last."""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)  # noqa: PLR2004
+
+
+def copyStorage(source: Storage, target: Storage) -> None:
+    """Copy all months, work packages and intervals from the source into the target - the target is compacted."""
+    for year, month in sorted(source.monthStamps()):
+        monthData = source.loadMonth(year, month)
+        monthData.changedDays.update(range(monthData.daysInMonth()))
+        target.saveMonth(monthData, compact=True)
+    target.saveWorkPackages(source.loadWorkPackages())
+    target.saveIntervals(source.loadIntervals(), replace=True)
+
+
+def migrateToSqlite(source: Storage, database: Path = DATABASE_FILE) -> SqliteStorage:
+    """
+    Build the database from the source and open it.
+
+    It is built in a temporary file which replaces the database once it is complete, so a crash never leaves
+    a partial database behind. The database must not be open.
+    """
+    temporary = database.with_name(f"{database.name}.tmp")
+    for file in (temporary, *walFiles(temporary)):
+        file.unlink(missing_ok=True)
+    target = SqliteStorage(temporary)
+    try:
+        copyStorage(source, target)
+    finally:
+        target.close()
+    # the WAL of the replaced database must not be applied to the new one
+    for file in walFiles(database):
+        file.unlink(missing_ok=True)
+    temporary.replace(database)
+    logging.info("Migrated the data to the database %s", database)
+    return SqliteStorage(database)
+
+
+def walFiles(database: Path) -> tuple[Path, Path]:
+    """Return the write-ahead log and its index of the database."""
+    return database.with_name(f"{database.name}-wal"), database.with_name(f"{database.name}-shm")
+
+
+def openStorage(storageType: str, source: Storage | None = None) -> Storage:
+    """
+    Open the storage of the given type with all data of the source copied into it.
+
+    Without a source the database is only built - from the json files - if it does not exist yet.
+    """
+    if storageType == "sqlite":
+        if source is not None or not DATABASE_FILE.exists():
+            return migrateToSqlite(source or JsonStorage())
+        return SqliteStorage()
+    storage = JsonStorage()
+    if source is not None:
+        copyStorage(source, storage)
+    return storage
@@ -0,0 +1,126 @@
+"""Persistent summary of all tracked months for the ZA balance over the years."""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import hashlib
+import itertools
+import json
+from typing import TYPE_CHECKING
+
+from _model import DATA_FOLDER, SUMMARY_FIELDS
+from _persistence import writeIfChanged
+from _utils import logging
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from _model import MonthData
+    from _storage import Storage
+
+INDEX_FILE_NAME = "summaryIndex.json"
+
+
+def configHash(hours: list[int], lunchBreak: int) -> str:
+    """Return a hash of the settings the month summaries depend on."""
+    return hashlib.sha256(json.dumps([hours, lunchBreak]).encode()).hexdigest()
+
+
+class SummaryIndex:
+    """
+    Summaries of all completed months, cached in a file next to the month files.
+
+    An entry is only recalculated if the stored month or the relevant settings changed.
+    The ZA balance of all months before a given month is a lookup in the prefix sums,
+    plus the running ZA of the current month for the months after it.
+    """
+
+    def __init__(self, folder: Path = DATA_FOLDER) -> None:
+        self.folder = folder
+        self.file = folder / INDEX_FILE_NAME
+        self.entries = self.load()
+        self.keys = []
+        self.prefixZA = [0]
+        self.current = (0, 0)
+        self.runningZA = 0
+
+    def load(self) -> dict[str, dict]:
+        """Load the index from its file."""
+        try:
+            with self.file.open() as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logging.exception("Could not load the summary index - it will be rebuilt")
+            return {}
+
+    def save(self) -> None:
+        """Save the index to its file."""
+        if not self.folder.exists():
+            self.folder.mkdir()
+        writeIfChanged(self.file, json.dumps(self.entries, indent=4))
+
+    def refresh(self, storage: Storage, hours: list[int], lunchBreak: int, today: datetime.date | None = None) -> None:
+        """Bring the index up to date with the stored data of all completed months - scans the whole storage."""
+        today = today or datetime.date.today()  # noqa: DTZ011 - the local date is wanted here
+        self.current = (today.year, today.month)
+        cfgHash = configHash(hours, lunchBreak)
+        changed = False
+        found = set()
+        for yearAndMonth, stamp in storage.monthStamps().items():
+            if yearAndMonth >= self.current:
+                continue
+            key = "{:04d}-{:02d}".format(*yearAndMonth)
+            found.add(key)
+            entry = self.entries.get(key)
+            if entry and entry.get("stamp") == stamp and entry["config"] == cfgHash:
+                continue
+            try:
+                monthData = storage.loadMonth(*yearAndMonth)
+            except (ValueError, KeyError):
+                logging.exception("Could not summarize %s", key)
+                continue
+            self.setEntry(monthData, hours, lunchBreak, stamp)
+            changed = True
+        for key in set(self.entries) - found:
+            del self.entries[key]
+            changed = True
+        if changed:
+            self.save()
+        self.updatePrefixSums()
+
+    def updateMonth(self, monthData: MonthData, hours: list[int], lunchBreak: int) -> None:
+        """Recalculate the entry of a saved month - only completed months have one."""
+        if (monthData.year, monthData.month) >= self.current:
+            return
+        # the stamp of the saved month is unknown - the next refresh reads the month once more
+        self.setEntry(monthData, hours, lunchBreak, None)
+        self.save()
+        self.updatePrefixSums()
+
+    def setEntry(self, monthData: MonthData, hours: list[int], lunchBreak: int, stamp: list | None) -> None:
+        """Store the summary of a completed month."""
+        # completed months count with all of their days
+        summary = monthData.summary(hours, lunchBreak, datetime.date.max)
+        entry = {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+        entry["stamp"] = stamp
+        entry["config"] = configHash(hours, lunchBreak)
+        self.entries[f"{monthData.year:04d}-{monthData.month:02d}"] = entry
+
+    def updatePrefixSums(self) -> None:
+        """Recalculate the accumulated ZA before every month of the index."""
+        self.keys = sorted(self.entries)
+        self.prefixZA = list(itertools.accumulate((self.entries[key]["za"] for key in self.keys), initial=0))
+
+    def isOutdated(self, today: datetime.date) -> bool:
+        """Return whether a new month began since the last refresh."""
+        return self.current != (today.year, today.month)
+
+    def balanceBefore(self, year: int, month: int) -> int:
+        """Return the ZA in seconds accumulated over all months before the given month."""
+        balance = self.prefixZA[bisect.bisect_left(self.keys, f"{year:04d}-{month:02d}")]
+        if (year, month) > self.current:
+            balance += self.runningZA
+        return balance
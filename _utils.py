@@ -1,11 +1,14 @@
+import functools
 import logging
 import sys
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-import keyring
-from jira import JIRA, JIRAError
-from PySide6 import QtCore, QtWidgets
-from requests.exceptions import ConnectTimeout
+from PySide6 import QtCore
+
+if TYPE_CHECKING:
+    from jira import JIRA
 
 HTTP_NOT_FOUND = 404
 HTTP_NOT_AUTHORIZED = 401
@@ -35,11 +38,25 @@ def resource_path(relative_path: str) -> Path:
     return str(base_path / relative_path)
 
 
-def getJiraInstance(urlstart: str, uid: str, password: str | None = None) -> JIRA:
+@functools.cache
+def getKeyring() -> ModuleType:
+    """Return the keyring with the Windows backend - it is imported on first use, as it takes long to import."""
+    import keyring  # noqa: PLC0415 - imported on first use to speed up the start
+    from keyring.backends.Windows import WinVaultKeyring  # noqa: PLC0415
+
+    keyring.set_keyring(WinVaultKeyring())
+    return keyring
+
+
+def getJiraInstance(urlstart: str, uid: str, password: str | None = None) -> "JIRA":
+    # jira imports requests and more, so it is imported on first use to speed up the start
+    from jira import JIRA, JIRAError  # noqa: PLC0415
+    from requests.exceptions import ConnectTimeout  # noqa: PLC0415
+
     if uid is None or uid == "":
         raise ConnectionError("Username is not set! Please set the User ID in the settings.")
     if password is None:
-        password = keyring.get_password("jiraconnection", uid)
+        password = getKeyring().get_password("jiraconnection", uid)
         if password is None:
             raise ConnectionError("Password is not set")
     try:
@@ -59,38 +76,6 @@ def getJiraInstance(urlstart: str, uid: str, password: str | None = None) -> JIR
     return jira
 
 
-def JiraWriteLog(cfg: dict, ticket: str, duration: int) -> bool:
-    try:
-        jira = getJiraInstance(cfg["url"], cfg["uid"])
-    except Exception as e:
-        logging.exception("Error when creating work log")
-        QtWidgets.QMessageBox.critical(None, "Jira Connection Error", str(e), QtWidgets.QMessageBox.Ok)
-        return False
-    try:
-        jira.add_worklog(ticket, timeSpentSeconds=duration)
-    except JIRAError as e:
-        if e.status_code == HTTP_NOT_FOUND:
-            QtWidgets.QMessageBox.critical(
-                None,
-                "Work Log Creation Error",
-                f"Issue {ticket} not found",
-                QtWidgets.QMessageBox.Ok,
-            )
-        else:
-            QtWidgets.QMessageBox.critical(
-                None,
-                "Work Log Creation Error",
-                f"Error: '{e.text}'\nStatus Code: {e.status_code}",
-                QtWidgets.QMessageBox.Ok,
-            )
-        return False
-    except Exception as e:
-        logging.exception("Error when creating work log")
-        QtWidgets.QMessageBox.critical(None, "Work Log Creation Error", str(e), QtWidgets.QMessageBox.Ok)
-        return False
-    return True
-
-
 def timeToMinutes(qtime: QtCore.QTime) -> int:
     return qtime.hour() * 60 + qtime.minute()
 
@@ -0,0 +1,343 @@
+"""Model and table of the work packages, including the archived ones."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from _icons import icon
+from _issuecache import issueKey
+from _jira import FAILED, PENDING, QUEUED, SUCCEEDED
+
+if TYPE_CHECKING:
+    from _issuecache import IssueCache
+    from _registry import WorkPackageRegistry
+    from times import WorkPackage
+
+TICKET, NAME, ISSUE, TIME, START_STOP, LOG, EDIT, REMOVE = range(8)
+COLUMN_COUNT = 8
+HEADERS = {TICKET: "Ticket", NAME: "Name", ISSUE: "Issue", TIME: "Time"}
+TOOLTIPS = {
+    TICKET: "Open the ticket in Jira",
+    START_STOP: "Start or stop tracking",
+    LOG: "Log the time to Jira",
+    EDIT: "Edit the work package",
+    REMOVE: "Delete the work package",
+}
+ACTION_COLUMNS = (START_STOP, LOG, EDIT, REMOVE)
+ICONS = {LOG: "jira.png", EDIT: "edit.png", REMOVE: "delete.png"}
+WORKLOG_TEXTS = {PENDING: "...", SUCCEEDED: "\u2713", FAILED: "\u2717", QUEUED: "\u21bb"}
+WORKLOG_TOOLTIPS = {
+    PENDING: "Logging the time to Jira...",
+    SUCCEEDED: "The time was logged to Jira",
+    QUEUED: "The time is logged once Jira can be reached",
+}
+WORKLOG_COLORS = {FAILED: QtGui.QColor("red"), QUEUED: QtGui.QColor("darkorange")}
+CHECKED_COLOR = QtGui.QColor("LightGreen")
+ARCHIVED_COLOR = QtGui.QColor(100, 100, 100)
+MISSING_COLOR = QtGui.QColor("red")
+# the value the columns are sorted by
+SORT_ROLE = QtCore.Qt.UserRole
+# the work package of the row - the json data for archived work packages
+ENTRY_ROLE = QtCore.Qt.UserRole + 1
+
+
+def formatSeconds(t: float) -> str:
+    """Format a duration in seconds as H:MM:SS."""
+    return f"{int(t // 3600):01d}:{int(t / 60 % 60):02d}:{int(t % 60):02d}"
+
+
+class WorkPackageTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model with one row per work package - archived ones are rows of their json data.
+
+    The issue column shows summary and status of the ticket from the issue cache, if given.
+    stateChanged is emitted when a work package was started, stopped or edited.
+    """
+
+    stateChanged = QtCore.Signal()
+
+    def __init__(
+        self, registry: WorkPackageRegistry, issues: IssueCache | None = None, parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.registry = registry
+        self.issues = issues
+        if issues is not None:
+            issues.updated.connect(self.issuesChanged)
+        self.entries = []
+        self.rows = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Show all work packages of the registry."""
+        self.beginResetModel()
+        for entry in self.entries:
+            self.disconnectEntry(entry)
+        self.entries = [*self.registry, *self.registry.archived.values()]
+        for entry in self.entries:
+            self.connectEntry(entry)
+        self.updateRows()
+        self.endResetModel()
+
+    def setRegistry(self, registry: WorkPackageRegistry) -> None:
+        """Show the work packages of another registry."""
+        self.registry = registry
+        self.reset()
+
+    def updateRows(self) -> None:
+        """Index the rows by their entries."""
+        self.rows = {id(entry): row for row, entry in enumerate(self.entries)}
+
+    def connectEntry(self, entry: WorkPackage | dict) -> None:
+        """Follow the changes of a work package."""
+        if not isinstance(entry, dict):
+            entry.toggled.connect(self.onChanged)
+            entry.edited.connect(self.onChanged)
+            entry.worklogChanged.connect(self.onChanged)
+
+    def disconnectEntry(self, entry: WorkPackage | dict) -> None:
+        """Stop following the changes of a work package."""
+        if not isinstance(entry, dict):
+            entry.toggled.disconnect(self.onChanged)
+            entry.edited.disconnect(self.onChanged)
+            entry.worklogChanged.disconnect(self.onChanged)
+
+    def addEntry(self, entry: WorkPackage | dict) -> None:
+        """Append a row for the work package."""
+        row = len(self.entries)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.entries.append(entry)
+        self.rows[id(entry)] = row
+        self.connectEntry(entry)
+        self.endInsertRows()
+
+    def removeEntry(self, entry: WorkPackage | dict) -> None:
+        """Remove the row of the work package."""
+        row = self.rows.get(id(entry))
+        if row is None:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.disconnectEntry(entry)
+        del self.entries[row]
+        self.updateRows()
+        self.endRemoveRows()
+
+    def onChanged(self) -> None:
+        """Repaint the row of the changed work package."""
+        row = self.rows.get(id(self.sender()))
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, COLUMN_COUNT - 1))
+        self.stateChanged.emit()
+
+    def timeChanged(self, wp: WorkPackage) -> None:
+        """Repaint the time of the work package."""
+        row = self.rows.get(id(wp))
+        if row is not None:
+            self.dataChanged.emit(self.index(row, TIME), self.index(row, TIME), [QtCore.Qt.DisplayRole])
+
+    def issuesChanged(self, keys: list[str]) -> None:
+        """Repaint ticket and issue of the work packages of the fetched issues."""
+        keys = set(keys)
+        for row, entry in enumerate(self.entries):
+            if issueKey(self.fields(entry)[0]) in keys:
+                self.dataChanged.emit(self.index(row, TICKET), self.index(row, ISSUE))
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: B008 - Qt signature
+        """Return the number of work packages."""
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: B008 - Qt signature
+        """Return the number of columns."""
+        if parent.isValid():
+            return 0
+        return COLUMN_COUNT
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> object:
+        """Return the titles of the sortable columns."""
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return HEADERS.get(section, "")
+        return None
+
+    @staticmethod
+    def fields(entry: WorkPackage | dict) -> tuple[str | None, str, float, bool]:
+        """Return ticket, name, total time and tracking state of a work package or of the json data of an archived one."""
+        if isinstance(entry, dict):
+            return entry["ticket"], entry["name"], entry["loggedTime"], False
+        return entry.ticket, entry.name, entry.getTotalTime(), entry.isChecked()
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> object:  # noqa: PLR0911
+        """Return the data of a cell."""
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        column = index.column()
+        if role == ENTRY_ROLE:
+            return entry
+        ticket, name, seconds, tracking = self.fields(entry)
+        archived = isinstance(entry, dict)
+        if column == LOG and not archived and role in (QtCore.Qt.DisplayRole, QtCore.Qt.ForegroundRole, QtCore.Qt.ToolTipRole):
+            return self.worklogData(entry, role)
+        issueCell = column in (TICKET, ISSUE) and role in (QtCore.Qt.ForegroundRole, QtCore.Qt.ToolTipRole) and not archived
+        if issueCell and (data := self.issueData(ticket, role)) is not None:
+            return data
+        if role in (QtCore.Qt.DisplayRole, SORT_ROLE):
+            return self.text(column, role, ticket, name, seconds, archived)
+        if role == QtCore.Qt.DecorationRole and not archived:
+            return self.decoration(column, tracking)
+        if role == QtCore.Qt.BackgroundRole:
+            return CHECKED_COLOR if tracking else None
+        if role == QtCore.Qt.ForegroundRole:
+            return ARCHIVED_COLOR if archived else None
+        if role == QtCore.Qt.ToolTipRole:
+            return "Archived - right click to restore" if archived else TOOLTIPS.get(column)
+        return None
+
+    def text(self, column: int, role: int, ticket: str | None, name: str, seconds: float, archived: bool) -> object:  # noqa: PLR0913
+        """Return the text of a cell - or the value it is sorted by for SORT_ROLE."""
+        if role == SORT_ROLE:
+            issueText = self.issueText(ticket).casefold()
+            return {TICKET: (ticket or "").casefold(), NAME: name.casefold(), ISSUE: issueText, TIME: seconds}.get(column)
+        ticketText = ticket or ("" if archived else "Add Ticket #")
+        return {TICKET: ticketText, NAME: name, ISSUE: self.issueText(ticket), TIME: formatSeconds(seconds)}.get(column)
+
+    def issueText(self, ticket: str | None) -> str:
+        """Return summary and status of the issue of the ticket, as far as they are known."""
+        issue = self.issues.get(ticket) if self.issues is not None and ticket else None
+        if issue is None or issue.get("missing"):
+            return ""
+        return f"{issue['summary']} [{issue['status']}]"
+
+    def issueData(self, ticket: str | None, role: int) -> object:
+        """Return color and tooltip of ticket and issue cells - marking tickets Jira does not know."""
+        if self.issues is None or not ticket:
+            return None
+        if self.issues.isMissing(ticket):
+            if role == QtCore.Qt.ForegroundRole:
+                return MISSING_COLOR
+            return f"Issue {ticket} not found in Jira"
+        issue = self.issues.get(ticket)
+        if role == QtCore.Qt.ToolTipRole and issue is not None and not issue.get("missing"):
+            return f"{ticket}: {issue['summary']}\nStatus: {issue['status']}\nProject: {issue['project']}"
+        return None
+
+    @staticmethod
+    def decoration(column: int, tracking: bool) -> QtGui.QIcon | None:
+        """Return the icon of the button like cells."""
+        if column == START_STOP:
+            return icon("pause.png" if tracking else "play.png")
+        return icon(ICONS[column]) if column in ICONS else None
+
+    @staticmethod
+    def worklogData(wp: WorkPackage, role: int) -> object:
+        """Return the data of the log cell, which shows the state of logging the time to Jira."""
+        if role == QtCore.Qt.DisplayRole:
+            return WORKLOG_TEXTS.get(wp.worklogState)
+        if role == QtCore.Qt.ForegroundRole:
+            return WORKLOG_COLORS.get(wp.worklogState)
+        if wp.worklogState is None:
+            return TOOLTIPS[LOG]
+        return wp.worklogError or WORKLOG_TOOLTIPS[wp.worklogState]
+
+
+class WorkPackageFilterModel(QtCore.QSortFilterProxyModel):
+    """Filter the work packages by a part of their name or ticket and hide the archived ones unless requested."""
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.text = ""
+        self.showArchived = False
+        self.setSortRole(SORT_ROLE)
+
+    def setText(self, text: str) -> None:
+        """Only show the work packages whose name or ticket contains text."""
+        self.text = text.casefold()
+        self.invalidateFilter()
+
+    def setShowArchived(self, showArchived: bool) -> None:
+        """Show or hide the archived work packages."""
+        self.showArchived = showArchived
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, sourceRow: int, sourceParent: QtCore.QModelIndex) -> bool:  # noqa: ARG002 - Qt signature
+        """Return True if the work package matches the filter."""
+        entry = self.sourceModel().entries[sourceRow]
+        if isinstance(entry, dict) and not self.showArchived:
+            return False
+        ticket, name, _, _ = WorkPackageTableModel.fields(entry)
+        return self.text in name.casefold() or self.text in (ticket or "").casefold()
+
+
+class WorkPackageTable(QtWidgets.QTableView):
+    """Table of the work packages - the icon cells act as buttons."""
+
+    ticketClicked = QtCore.Signal(object)
+    startStopClicked = QtCore.Signal(object)
+    logClicked = QtCore.Signal(object)
+    editClicked = QtCore.Signal(object)
+    removeClicked = QtCore.Signal(object)
+    archiveRequested = QtCore.Signal(object)
+    restoreRequested = QtCore.Signal(object)
+
+    def __init__(self, model: WorkPackageFilterModel, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setModel(model)
+        self.setSortingEnabled(True)
+        self.sortByColumn(-1, QtCore.Qt.AscendingOrder)
+        self.verticalHeader().hide()
+        self.setShowGrid(False)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(NAME, QtWidgets.QHeaderView.Stretch)
+        header.setSectionResizeMode(ISSUE, QtWidgets.QHeaderView.Stretch)
+        iconWidth = self.style().pixelMetric(QtWidgets.QStyle.PM_SmallIconSize) + 16
+        for column in ACTION_COLUMNS:
+            header.setSectionResizeMode(column, QtWidgets.QHeaderView.Fixed)
+            self.setColumnWidth(column, iconWidth)
+        self.setColumnWidth(LOG, iconWidth + self.fontMetrics().horizontalAdvance("..."))
+        self.setColumnWidth(TIME, self.fontMetrics().horizontalAdvance("000:00:00") + 16)
+        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.showContextMenu)
+        self.clicked.connect(self.onClicked)
+        model.modelReset.connect(lambda: self.resizeColumnToContents(TICKET))
+
+    def onClicked(self, index: QtCore.QModelIndex) -> None:
+        """Handle the clicks on the button like cells."""
+        entry = index.data(ENTRY_ROLE)
+        if isinstance(entry, dict):
+            return
+        signal = {
+            TICKET: self.ticketClicked,
+            START_STOP: self.startStopClicked,
+            LOG: self.logClicked,
+            EDIT: self.editClicked,
+            REMOVE: self.removeClicked,
+        }.get(index.column())
+        if signal is not None:
+            signal.emit(entry)
+
+    def showContextMenu(self, pos: QtCore.QPoint) -> None:
+        """Offer to archive or restore a work package."""
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        entry = index.data(ENTRY_ROLE)
+        contextMenu = QtWidgets.QMenu(self)
+        if isinstance(entry, dict):
+            restore = contextMenu.addAction("Restore")
+            remove = contextMenu.addAction("Delete")
+            action = contextMenu.exec_(self.viewport().mapToGlobal(pos))
+            if action == restore:
+                self.restoreRequested.emit(entry)
+            elif action == remove:
+                self.removeClicked.emit(entry)
+        else:
+            archive = contextMenu.addAction("Archive")
+            action = contextMenu.exec_(self.viewport().mapToGlobal(pos))
+            if action == archive:
+                self.archiveRequested.emit(entry)
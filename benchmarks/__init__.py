@@ -0,0 +1 @@
+"""Headless benchmarks of the start and the hot paths - run with python benchmarks/run.py."""
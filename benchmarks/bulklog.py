@@ -0,0 +1,107 @@
+"""
+Harness of logging all work packages to Jira against a local stand-in server.
+
+The work packages are logged once with a single thread and once with the thread pool and rate limiter of the main window.
+Both runs have to create exactly one worklog with the right time per ticket - missing tickets have to fail.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from generate import generateWorkPackages  # noqa: E402
+from jiraserver import JiraServer  # noqa: E402
+from PySide6 import QtWidgets  # noqa: E402
+
+import _jira  # noqa: E402
+from _storage import WORK_PACKAGES_FILE  # noqa: E402
+from _utils import getJiraInstance, logging  # noqa: E402
+
+UID = "benchmark"
+
+
+def logAll(server: JiraServer, workPackages: int, maxThreads: int | None, seed: int) -> float:
+    """Log all work packages of a new data set with a new main window. Return the seconds it took."""
+    import times  # noqa: PLC0415 - imported after the data folder was set up
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        generateWorkPackages(folder / WORK_PACKAGES_FILE, workPackages, random.Random(seed))  # noqa: S311 - no cryptography here
+        (folder / "settings.json").write_text(json.dumps({"url": server.url, "uid": UID}))
+        os.chdir(folder)
+        try:
+            window = times.MainWindow()
+            if maxThreads is not None:
+                window.jiraWorker = _jira.JiraWorker(window, maxThreads)
+            expected = {wp.ticket: int(wp.getTotalTime()) for wp in window.workPackages if wp.ticket and wp.getTotalTime() >= 1}
+            server.worklogs.clear()
+            start = time.perf_counter()
+            window.logAllWorkPackages()
+            while window.worklogBatch is not None:
+                app.processEvents()
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+            window.jiraWorker.wait()
+            window.close()
+        finally:
+            os.chdir(cwd)
+
+    check(server, expected)
+    return elapsed
+
+
+def check(server: JiraServer, expected: dict[str, int]) -> None:
+    """Check that every ticket but the missing ones got exactly one worklog with its time."""
+    logged = {}
+    for ticket, seconds, _ in server.worklogs:
+        if ticket in logged:
+            raise AssertionError(f"{ticket} was logged twice")
+        logged[ticket] = seconds
+    wanted = {ticket: seconds for ticket, seconds in expected.items() if ticket not in server.missing}
+    if logged != wanted:
+        raise AssertionError(f"logged {len(logged)} worklogs instead of {len(wanted)} or with the wrong time")
+
+
+def main() -> None:
+    """Run the harness with the parameters given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--work-packages", type=int, default=50, help="number of work packages")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds the server takes for a request")
+    parser.add_argument("--server-rate", type=float, default=10, help="requests per second allowed by the server")
+    parser.add_argument("--missing", type=int, default=2, help="number of tickets unknown to the server")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random work packages")
+    args = parser.parse_args()
+
+    # the tickets of the generated work packages are PR-1000 and following
+    missing = {f"PR-{1000 + x}" for x in range(args.missing)}
+    with JiraServer(args.latency, args.server_rate, missing) as server:
+        # logged in beforehand, as there is no password in the keyring
+        _jira.SESSIONS[server.url, UID] = getJiraInstance(server.url, UID, "password")
+        for name, maxThreads in (("single thread", 1), ("thread pool", None)):
+            server.requests = server.refused = 0
+            elapsed = logAll(server, args.work_packages, maxThreads, args.seed)
+            logging.info(
+                "%-14s %6.2f s  %4d worklogs  %4d requests  %4d refused with 429",
+                name,
+                elapsed,
+                len(server.worklogs),
+                server.requests,
+                server.refused,
+            )
+        _jira.closeSessions()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Generate synthetic month files and work packages for the benchmarks."""
+
+import argparse
+import datetime
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from _model import DATA_FOLDER, DETAIL_SLOTS, DayRecord, MonthData
+from _storage import WORK_PACKAGES_FILE
+from _utils import logging
+
+
+def randomDay(rng: random.Random, weekday: int) -> DayRecord:
+    """Return a day with plausible times for the day of the week."""
+    if weekday > 5:  # noqa: PLR2004 - weekend
+        return DayRecord()
+    if rng.random() < 0.08:  # noqa: PLR2004 - vacation
+        return DayRecord(vacation=True, za=rng.random() < 0.2)  # noqa: PLR2004
+    start = rng.randint(6 * 60 + 30, 9 * 60 + 30)
+    end = start + rng.randint(7 * 60, 10 * 60)
+    day = DayRecord(start, end, lunch=rng.random() < 0.9, homeOffice=rng.random() < 0.6)  # noqa: PLR2004
+    if rng.random() < 0.3:  # noqa: PLR2004 - some days are tracked in detail
+        middle = (start + end) // 2
+        details = [(start, middle, 0), (middle + 30, end, 1)] + [(0, 0, 0)] * (DETAIL_SLOTS - 2)
+        day.setDetails([start, end, details])
+    return day
+
+
+def generateMonths(folder: Path, last: datetime.date, years: int, rng: random.Random) -> int:
+    """Write month files for the years up to the month of last. Return the number of months written."""
+    count = 0
+    year, month = last.year - years, last.month
+    while (year, month) <= (last.year, last.month):
+        monthData = MonthData(year, month)
+        for x in range(monthData.daysInMonth()):
+            monthData.days[x] = randomDay(rng, monthData.dayOfWeek(x))
+        monthData.save(folder)
+        count += 1
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)  # noqa: PLR2004
+    return count
+
+
+def generateWorkPackages(file: Path, count: int, rng: random.Random) -> None:
+    """Write count work packages with random logged times."""
+    workPackages = [
+        {
+            "name": f"Work Package {x}",
+            "ticket": f"PR-{1000 + x}" if rng.random() < 0.8 else None,  # noqa: PLR2004
+            "loggedTime": rng.randint(0, 40 * 3600),
+        }
+        for x in range(count)
+    ]
+    file.write_text(json.dumps(workPackages, indent=4))
+
+
+def generate(folder: Path, years: int, workPackages: int, seed: int = 0) -> None:
+    """Generate a complete data set in folder - month files in its data folder and the work packages next to it."""
+    rng = random.Random(seed)  # noqa: S311 - no cryptography here
+    months = generateMonths(folder / DATA_FOLDER, datetime.date.today(), years, rng)  # noqa: DTZ011
+    generateWorkPackages(folder / WORK_PACKAGES_FILE, workPackages, rng)
+    logging.info("Generated %d months and %d work packages in %s", months, workPackages, folder)
+
+
+def main() -> None:
+    """Generate the data set given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("folder", type=Path, help="folder to generate the data in")
+    parser.add_argument("--years", type=int, default=20, help="number of years of month files")
+    parser.add_argument("--work-packages", type=int, default=1000, help="number of work packages")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random data")
+    args = parser.parse_args()
+    args.folder.mkdir(parents=True, exist_ok=True)
+    generate(args.folder, args.years, args.work_packages, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Local stand-in of the Jira REST api with latency and rate limit - enough for logging work and searching issues."""
+
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+
+HTTP_OK = 200
+HTTP_CREATED = 201
+HTTP_NOT_AUTHORIZED = 401
+HTTP_NOT_FOUND = 404
+HTTP_TOO_MANY_REQUESTS = 429
+
+WORKLOG_PATH = re.compile(r"/rest/api/2/issue/([^/]+)/worklog")
+SEARCH_PATH = "/rest/api/2/search"
+QUOTED = re.compile(r'"([^"]+)"')
+SERVER_INFO = {"version": "9.12.0", "versionNumbers": [9, 12, 0], "deploymentType": "Server", "baseUrl": ""}
+
+
+class JiraHandler(BaseHTTPRequestHandler):
+    """Answer the requests of the jira package like a Jira server would."""
+
+    protocol_version = "HTTP/1.1"
+    server: "JiraServer"
+
+    def log_message(self, *_: object) -> None:
+        """Keep the output of the benchmarks clean."""
+
+    def reply(self, status: int, body: object, headers: dict[str, str] | None = None) -> None:
+        """Send the body as json."""
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def admit(self) -> bool:
+        """Wait for the latency and check authorization and rate limit - answer the request if it is refused."""
+        time.sleep(self.server.latency)
+        if self.headers.get("Authorization") is None:
+            self.reply(HTTP_NOT_AUTHORIZED, {"errorMessages": ["You are not authenticated"]})
+            return False
+        wait = self.server.take()
+        if wait:
+            self.reply(HTTP_TOO_MANY_REQUESTS, {"errorMessages": ["Rate limit exceeded"]}, {"Retry-After": str(wait)})
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        """Answer the server info requested on login and the worklogs of a ticket."""
+        if not self.admit():
+            return
+        match = WORKLOG_PATH.fullmatch(self.path.split("?")[0])
+        if match is not None:
+            with self.server.lock:
+                worklogs = [
+                    {"id": str(x + 1), "timeSpentSeconds": seconds, "comment": comment}
+                    for x, (ticket, seconds, comment) in enumerate(self.server.worklogs)
+                    if ticket == match.group(1)
+                ]
+            self.reply(HTTP_OK, {"startAt": 0, "maxResults": len(worklogs), "total": len(worklogs), "worklogs": worklogs})
+        elif self.path.startswith("/rest/api/2/serverInfo"):
+            self.reply(HTTP_OK, SERVER_INFO)
+        elif self.path.startswith("/rest/api/2/field"):
+            self.reply(HTTP_OK, [])
+        else:
+            self.reply(HTTP_NOT_FOUND, {"errorMessages": [f"{self.path} not found"]})
+
+    def do_POST(self) -> None:
+        """Record a worklog."""
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.admit():
+            return
+        if self.path.split("?")[0] == SEARCH_PATH:
+            self.search(body)
+            return
+        match = WORKLOG_PATH.fullmatch(self.path.split("?")[0])
+        if match is None:
+            self.reply(HTTP_NOT_FOUND, {"errorMessages": [f"{self.path} not found"]})
+            return
+        ticket = match.group(1)
+        if ticket in self.server.missing:
+            self.reply(HTTP_NOT_FOUND, {"errorMessages": ["Issue Does Not Exist"]})
+            return
+        with self.server.lock:
+            self.server.worklogs.append((ticket, body.get("timeSpentSeconds"), body.get("comment")))
+            worklogId = len(self.server.worklogs)
+        self.reply(HTTP_CREATED, {"id": str(worklogId), "timeSpentSeconds": body.get("timeSpentSeconds")})
+
+    def search(self, body: dict) -> None:
+        """Answer a search for the quoted keys in the jql - the missing tickets are not found."""
+        keys = [key for key in QUOTED.findall(body.get("jql", "")) if key not in self.server.missing]
+        with self.server.lock:
+            self.server.searches += 1
+        issues = [
+            {
+                "key": key,
+                "fields": {
+                    "summary": f"Summary of {key}",
+                    "status": {"name": "Open"},
+                    "project": {"key": key.split("-")[0], "name": f"Project {key.split('-')[0]}"},
+                },
+            }
+            for key in keys
+        ]
+        self.reply(HTTP_OK, {"startAt": 0, "maxResults": len(issues), "total": len(issues), "issues": issues})
+
+
+class JiraServer(ThreadingHTTPServer):
+    """
+    Stand-in Jira server on a free local port, serving in a background thread.
+
+    Every request waits latency seconds. More than rate requests per second are refused with 429 and Retry-After.
+    Worklogs of the missing tickets are refused with 404 - all others are recorded in worklogs with their comment.
+    Searches find every quoted key of the query but the missing tickets.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, rate: float = math.inf, missing: set[str] | None = None) -> None:
+        """Create the server - it serves when entered as context manager."""
+        super().__init__(("127.0.0.1", 0), JiraHandler)
+        self.latency = latency
+        self.rate = rate
+        self.missing = missing or set()
+        self.worklogs: list[tuple[str, int, str | None]] = []
+        self.requests = self.refused = self.searches = 0
+        self.lock = threading.Lock()
+        self.window: list[float] = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Return the url to connect to."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def take(self) -> int:
+        """Count a request - return the seconds until the next one is allowed if it exceeds the rate, else 0."""
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            self.window = [x for x in self.window if x > now - 1]
+            if len(self.window) < self.rate:
+                self.window.append(now)
+                return 0
+            self.refused += 1
+            return max(1, math.ceil(self.window[0] + 1 - now))
+
+    def __enter__(self) -> Self:
+        """Start serving."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop serving."""
+        self.shutdown()
+        self.server_close()
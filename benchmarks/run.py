@@ -0,0 +1,192 @@
+"""
+Benchmarks of the start and the hot paths of the main window.
+
+They run headless (QT_QPA_PLATFORM=offscreen) on a synthetic data set and store the results as json,
+so the numbers of two commits can be compared with --compare.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import PySide6  # noqa: E402
+from generate import generate  # noqa: E402
+from PySide6 import QtWidgets  # noqa: E402
+
+from _utils import logging  # noqa: E402
+
+RESULTS_FOLDER = Path(__file__).resolve().parent / "results"
+
+
+def measure(function: Callable[[], None], repeats: int) -> dict:
+    """Call the function repeatedly and return its durations in ms."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeats": repeats,
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+    }
+
+
+def commitHash() -> str:
+    """Return the current commit or "unknown" outside of a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607 - git from the path is fine here
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def runBenchmarks(repeats: int) -> dict:
+    """Run all benchmarks in the current folder and return their results."""
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import times  # noqa: PLC0415 - imported after the data folder was set up
+
+    results = {}
+
+    def run(name: str, function: Callable[[], None], count: int = repeats) -> None:
+        results[name] = measure(function, count)
+        logging.info("%-24s median %9.3f ms  min %9.3f ms", name, results[name]["median"], results[name]["min"])
+
+    windows = []
+
+    def createMainWindow() -> None:
+        windows.append(times.MainWindow())
+
+    run("MainWindow", createMainWindow, max(1, repeats // 20))
+    for window in windows[:-1]:
+        window.monthCache.wait()
+        window.deleteLater()
+    window = windows[-1]
+    window.show()
+    app.processEvents()
+    window.monthCache.wait()
+
+    today = datetime.date.today()  # noqa: DTZ011 - the local date is wanted here
+    run("Storage.loadMonth", lambda: window.storage.loadMonth(today.year, today.month))
+    run("MainWindow.loadMonth", window.loadMonth)
+
+    def editDay() -> None:
+        day = window.monthData.days[0]
+        day.start = (day.start + 1) % (12 * 60)
+        window.refreshDay(0)
+
+    def saveMonth() -> None:
+        editDay()
+        window.saveMonth()
+
+    def compactMonth() -> None:
+        editDay()
+        window.saveMonth(compact=True)
+
+    run("saveMonth", saveMonth)
+    run("saveMonth.compact", compactMonth)
+    run("updateDateLabels", window.updateDateLabels)
+
+    def browseYear() -> None:
+        date = window.datetime.date()
+        for x in range(1, 13):
+            window.datetime.setDate(date.addMonths(-x))
+        window.datetime.setDate(date)
+
+    run("onMonthChanged.year", browseYear, max(1, repeats // 10))
+    window.monthCache.wait()
+
+    tracked = next(iter(window.workPackages))
+    tracked.trigger()
+    run("WorkPackageRegistry.search", lambda: window.workPackages.search("ckage 12"))
+    run("cyclicFunction", window.cyclicFunction)
+    view = window.createWorkPackageView()
+    view.show()
+    app.processEvents()
+    run("updateChildrenData", view.updateChildrenData)
+    tracked.trigger()
+
+    window.close()
+    window.monthCache.wait()
+    return results
+
+
+def compare(results: dict, baselineFile: Path) -> None:
+    """Log the change of the medians against the results in baselineFile."""
+    with baselineFile.open() as fp:
+        baseline = json.load(fp)
+    logging.info("Compared with %s (%s):", baselineFile, baseline["commit"])
+    for name, result in results["results"].items():
+        if name in baseline["results"]:
+            old = baseline["results"][name]["median"]
+            logging.info("%-24s %9.3f ms -> %9.3f ms  (x%.2f)", name, old, result["median"], result["median"] / old)
+
+
+def main() -> None:
+    """Generate the data set, run the benchmarks and store the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=20, help="number of years of month files")
+    parser.add_argument("--work-packages", type=int, default=1000, help="number of work packages")
+    parser.add_argument("--storage", choices=("json", "sqlite"), default="json", help="storage backend")
+    parser.add_argument("--repeats", type=int, default=100, help="repeats of the fast benchmarks")
+    parser.add_argument("--output", type=Path, help="result file - default is results/<commit>.json")
+    parser.add_argument("--compare", type=Path, help="result file to compare with")
+    args = parser.parse_args()
+
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        generate(folder, args.years, args.work_packages)
+        shutil.copytree(ROOT / "pics", folder / "pics")
+        (folder / "settings.json").write_text(json.dumps({"storage": args.storage}))
+        os.chdir(folder)
+        try:
+            results = runBenchmarks(args.repeats)
+        finally:
+            os.chdir(cwd)
+
+    commit = commitHash()
+    output = {
+        "commit": commit,
+        "time": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "qt": PySide6.__version__,
+        "parameters": {
+            "years": args.years,
+            "workPackages": args.work_packages,
+            "storage": args.storage,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    outputFile = args.output or RESULTS_FOLDER / f"{commit}.json"
+    outputFile.parent.mkdir(parents=True, exist_ok=True)
+    outputFile.write_text(json.dumps(output, indent=4))
+    logging.info("Results written to %s", outputFile)
+    if args.compare:
+        compare(output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,2 @@
+pyside6-rcc pics.qrc -o _resources.py
 pyinstaller times.spec -y
\ No newline at end of file
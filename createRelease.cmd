@@ -1,3 +1,4 @@
 REM This is using Inno Setup to create a release. Install and adapt the path to iscc.exe below if needed
+pyside6-rcc pics.qrc -o _resources.py
 pyinstaller times.spec -y
 "C:\Program Files (x86)\Inno Setup 6\iscc.exe" times.iss
\ No newline at end of file
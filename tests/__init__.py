@@ -0,0 +1 @@
+"""Tests of the storage, the persistence helpers and the data structures of the time tracker."""
@@ -0,0 +1,24 @@
+"""Shared fixtures of the tests."""
+
+import os
+from collections.abc import Callable
+
+import pytest
+from PySide6 import QtCore, QtWidgets
+
+# the tests run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def app() -> QtWidgets.QApplication:
+    """Return the application the timers, signals and widgets need."""
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def waitUntil(app: QtWidgets.QApplication, condition: Callable[[], object], timeout: int = 2000) -> bool:
+    """Process the events until the condition is met or the timeout in ms expired. Return the condition."""
+    deadline = QtCore.QDeadlineTimer(timeout)
+    while not condition() and not deadline.hasExpired():
+        app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+    return bool(condition())
@@ -0,0 +1,70 @@
+"""Tests of logging all work packages to Jira at once against the local stand-in server."""
+
+import json
+import random
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PySide6 import QtWidgets
+
+import _jira
+from _storage import WORK_PACKAGES_FILE
+from _utils import getJiraInstance
+from benchmarks.generate import generateWorkPackages
+from benchmarks.jiraserver import JiraServer
+from tests.conftest import waitUntil
+
+UID = "tester"
+
+
+@pytest.fixture
+def server() -> Iterator[JiraServer]:
+    """Return a server refusing more than two requests per second - logged in beforehand, as there is no keyring."""
+    with JiraServer(rate=2) as server:
+        _jira.SESSIONS[server.url, UID] = getJiraInstance(server.url, UID, "password")
+        yield server
+        _jira.closeSessions()
+
+
+def test_every_ticket_is_logged_once_and_missing_ones_are_reported(
+    app: QtWidgets.QApplication,
+    server: JiraServer,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Requests refused with 429 are retried after Retry-After - only the missing tickets fail in the summary."""
+    import times  # noqa: PLC0415 - the main window module is only needed here
+
+    generateWorkPackages(tmp_path / WORK_PACKAGES_FILE, 8, random.Random(0))  # noqa: S311 - no cryptography here
+    (tmp_path / "settings.json").write_text(json.dumps({"url": server.url, "uid": UID}))
+    monkeypatch.chdir(tmp_path)
+    summaries = []
+    monkeypatch.setattr(times.dialogs, "WorklogSummaryDialog", lambda _, rows: summaries.append(rows) or QtWidgets.QDialog())
+
+    window = times.MainWindow()
+    expected = {wp.ticket: int(wp.getTotalTime()) for wp in window.workPackages if wp.ticket and wp.getTotalTime() >= 1}
+    missing = sorted(expected)[0]
+    server.missing.add(missing)
+    # the requests of the start are done - all worklogs are sent within the same second
+    window.jiraWorker.wait()
+    time.sleep(1)
+    server.refused = 0
+
+    window.logAllWorkPackages()
+    assert waitUntil(app, lambda: window.worklogBatch is None, 30_000)
+    window.jiraWorker.wait()
+    window.close()
+
+    assert server.refused > 0
+    logged = [ticket for ticket, _, _ in server.worklogs]
+    assert sorted(logged) == sorted(set(logged))
+    assert {ticket: seconds for ticket, seconds, _ in server.worklogs} == {
+        ticket: seconds for ticket, seconds in expected.items() if ticket != missing
+    }
+    [rows] = summaries
+    failed = {ticket: error for ticket, _, _, error in rows if error is not None}
+    assert list(failed) == [missing]
+    assert missing in failed[missing]
+    assert len(rows) == len(expected)
@@ -0,0 +1,59 @@
+"""Tests of the settings store."""
+
+import json
+import os
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from _config import DEFAULTS, ConfigStore
+
+
+def test_missing_and_wrongly_typed_settings_get_their_default(tmp_path: Path) -> None:
+    """Settings which are missing or have the wrong type fall back to their default - the hours become QTimes."""
+    file = tmp_path / "settings.json"
+    file.write_text(json.dumps({"lunchBreak": 45, "minimize": "yes", "hours": [0, 480, 480, 480, 480, 300, 0, 0]}))
+
+    config = ConfigStore(file)
+
+    assert config["lunchBreak"] == 45
+    assert config["minimize"] == DEFAULTS["minimize"]
+    assert config["storage"] == DEFAULTS["storage"]
+    assert config["hours"][1] == QtCore.QTime(8, 0)
+    assert ConfigStore(tmp_path / "missing.json")["url"] == DEFAULTS["url"]
+
+
+def test_update_saves_and_announces_only_the_changed_settings(tmp_path: Path) -> None:
+    """Updating writes the file and emits the names of the settings that really changed."""
+    file = tmp_path / "settings.json"
+    config = ConfigStore(file)
+    announced = []
+    config.changed.connect(announced.append)
+
+    config.update({"lunchBreak": 45, "storage": DEFAULTS["storage"]})
+    config.update({"lunchBreak": 45})
+
+    assert announced == [{"lunchBreak"}]
+    saved = json.loads(file.read_text())
+    assert saved["lunchBreak"] == 45
+    assert saved["hours"] == DEFAULTS["hours"]
+
+
+def test_reload_takes_over_changes_of_other_instances(tmp_path: Path) -> None:
+    """Reloading reads the file only if it was changed by someone else."""
+    file = tmp_path / "settings.json"
+    config = ConfigStore(file)
+    config.update({"uid": "me"})
+    announced = []
+    config.changed.connect(announced.append)
+
+    config.reload()
+    assert announced == []
+
+    file.write_text(json.dumps({**json.loads(file.read_text()), "uid": "someone"}))
+    # the modification time may not have advanced on a coarse file system clock
+    os.utime(file, ns=(config.mtime + 1_000_000, config.mtime + 1_000_000))
+    config.reload()
+
+    assert announced == [{"uid"}]
+    assert config["uid"] == "someone"
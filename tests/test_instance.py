@@ -0,0 +1,81 @@
+"""Tests of the single instance handling."""
+
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PySide6 import QtNetwork
+
+from _instance import ACKNOWLEDGED, NOT_RUNNING, UNANSWERED, InstanceServer, isServing, sendCommand, serverName
+
+# a running instance in its own process - the blocking calls of the sending one hold the interpreter lock
+SERVING = """
+import sys
+from PySide6 import QtCore
+from _instance import InstanceServer
+app = QtCore.QCoreApplication([])
+server = InstanceServer(name=sys.argv[1])
+server.commandReceived.connect(lambda command: print(command, flush=True))
+print("listening", flush=True)
+app.exec()
+"""
+
+
+@pytest.fixture
+def instance(tmp_path: Path) -> Iterator[tuple[str, subprocess.Popen]]:
+    """Return the server name and the process of a running instance."""
+    name = serverName(tmp_path)
+    process = subprocess.Popen(  # noqa: S603 - runs this interpreter
+        [sys.executable, "-c", SERVING, name],
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout.readline() == "listening\n"
+        yield name, process
+    finally:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.usefixtures("app")
+def test_commands_are_acknowledged_by_the_running_instance(instance: tuple[str, subprocess.Popen], tmp_path: Path) -> None:
+    """The running instance confirms and announces known commands - without an instance nobody answers."""
+    name, process = instance
+    assert sendCommand("restore", serverName(tmp_path / "other")) == NOT_RUNNING
+
+    assert sendCommand("start-day", name) == ACKNOWLEDGED
+    assert process.stdout.readline() == "start-day\n"
+    assert sendCommand("reboot", name) == UNANSWERED
+
+
+@pytest.mark.usefixtures("app")
+def test_a_hanging_instance_does_not_answer(tmp_path: Path) -> None:
+    """An instance accepting the connection without answering in time is reported as such."""
+    name = serverName(tmp_path)
+    hanging = QtNetwork.QLocalServer()
+    assert hanging.listen(name)
+    try:
+        # the event loop does not run while sending - just like in a busy instance
+        assert sendCommand("restore", name) == UNANSWERED
+    finally:
+        hanging.close()
+
+
+@pytest.mark.usefixtures("app")
+def test_a_second_server_does_not_replace_the_running_one(tmp_path: Path) -> None:
+    """A server started while another one is listening keeps out of its way."""
+    name = serverName(tmp_path)
+    first = InstanceServer(name=name)
+    second = InstanceServer(name=name)
+    try:
+        assert first.server.isListening()
+        assert not second.server.isListening()
+        assert isServing(name)
+    finally:
+        first.server.close()
+        second.server.close()
+    assert not isServing(name)
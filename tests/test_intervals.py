@@ -0,0 +1,81 @@
+"""Tests of the interval log and its rollups."""
+
+import datetime
+
+from _intervals import IntervalLog, splitByDay
+
+
+def timestamp(day: int, hour: int, minute: int = 0) -> float:
+    """Return the local epoch seconds of a time in October 2026."""
+    return datetime.datetime(2026, 10, day, hour, minute).timestamp()  # noqa: DTZ001 - days are local days
+
+
+def test_rollups_per_day_week_and_month() -> None:
+    """The tracked seconds are summed per day, ISO week and month."""
+    log = IntervalLog()
+    log.add(timestamp(12, 9), timestamp(12, 10))
+    log.add(timestamp(13, 9), timestamp(13, 9, 30))
+    log.add(timestamp(19, 9), timestamp(19, 11))
+
+    assert log.day(datetime.date(2026, 10, 12)) == 3600
+    assert log.week(datetime.date(2026, 10, 18)) == 5400
+    assert log.week(datetime.date(2026, 10, 19)) == 7200
+    assert log.month(2026, 10) == 12600
+    assert log.dailyTotals(datetime.date(2026, 10, 13), datetime.date(2026, 10, 31)) == [
+        (datetime.date(2026, 10, 13), 1800),
+        (datetime.date(2026, 10, 19), 7200),
+    ]
+
+
+def test_interval_over_midnight_is_split() -> None:
+    """An interval over midnight counts on both days."""
+    log = IntervalLog()
+    log.add(timestamp(31, 23), timestamp(31, 23) + 7200)
+
+    assert log.day(datetime.date(2026, 10, 31)) == 3600
+    assert log.day(datetime.date(2026, 11, 1)) == 3600
+    assert log.month(2026, 10) == log.month(2026, 11) == 3600
+    assert [date for date, _ in splitByDay(timestamp(30, 12), timestamp(31, 12))] == [
+        datetime.date(2026, 10, 30),
+        datetime.date(2026, 10, 31),
+    ]
+
+
+def test_adjacent_intervals_are_merged() -> None:
+    """An interval starting where the last one ended extends it - empty intervals are ignored."""
+    log = IntervalLog()
+    log.add(timestamp(12, 9), timestamp(12, 10))
+    log.add(timestamp(12, 10), timestamp(12, 11))
+    log.add(timestamp(12, 12), timestamp(12, 12))
+
+    assert list(log) == [(round(timestamp(12, 9)), round(timestamp(12, 11)))]
+
+
+def test_json_round_trip() -> None:
+    """The log is restored with its rollups from the flat list of starts and ends."""
+    log = IntervalLog()
+    log.add(timestamp(12, 9), timestamp(12, 10))
+    log.add(timestamp(14, 9), timestamp(14, 10))
+
+    restored = IntervalLog.fromJson(log.asJson())
+
+    assert list(restored) == list(log)
+    assert restored.days == log.days
+    assert restored.weeks == log.weeks
+
+
+def test_only_the_intervals_added_since_the_last_save_are_unsaved() -> None:
+    """Added intervals stay unsaved until marked saved - loaded ones are saved unless they come from old data."""
+    log = IntervalLog.fromJson([100, 200])
+    assert not log.unsaved
+
+    log.add(200, 300)
+    log.add(400, 500)
+    assert log.unsaved.tolist() == [200, 300, 400, 500]
+    log.markSaved()
+    log.add(500, 600)
+    assert log.unsaved.tolist() == [500, 600]
+
+    # replaying the saved intervals gives the same log, also where they were merged
+    assert list(IntervalLog.fromJson([100, 200, 200, 300, 400, 500, 500, 600])) == list(log)
+    assert IntervalLog.fromJson([100, 200], saved=False).unsaved.tolist() == [100, 200]
@@ -0,0 +1,170 @@
+"""Tests of the cache of the Jira issues."""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from jira import JIRAError
+
+import _issuecache
+from _issuecache import MISSING_TTL, TTL, IssueCache
+
+URL = "https://jira.example.com"
+
+
+class FakeWorker:
+    """Keep the submitted operations - their callbacks are called by the tests."""
+
+    def __init__(self) -> None:
+        """Create the worker without operations."""
+        self.submitted = []
+
+    def submit(
+        self,
+        operation: Callable[[], object],
+        onSuccess: Callable[[object], None],
+        onFailure: Callable[[Exception], None],
+    ) -> None:
+        """Keep the operation with its callbacks."""
+        self.submitted.append((operation, onSuccess, onFailure))
+
+
+@pytest.fixture
+def searches(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Return the keys of the searches run - every key but the ones starting with NO is found."""
+    searched = []
+
+    def search(url: str, uid: str, keys: list[str]) -> dict[str, dict]:  # noqa: ARG001 - a single server is searched
+        searched.append(keys)
+        return {key: {"summary": f"Summary of {key}"} for key in keys if not key.startswith("NO")}
+
+    monkeypatch.setattr(_issuecache, "searchIssues", search)
+    return searched
+
+
+@pytest.fixture
+def connection() -> list[str]:
+    """Return url and user the cache connects with - changeable by the tests."""
+    return [URL, "me"]
+
+
+@pytest.fixture
+def cache(tmp_path: Path, connection: list[str]) -> IssueCache:
+    """Return an empty cache with a fake worker."""
+    return IssueCache(FakeWorker(), lambda: tuple(connection), tmp_path / "issues.json")
+
+
+def runAll(cache: IssueCache) -> None:
+    """Run the submitted searches and hand their results to the callbacks."""
+    submitted, cache.worker.submitted = cache.worker.submitted, []
+    for operation, onSuccess, onFailure in submitted:
+        try:
+            result = operation()
+        except JIRAError as e:
+            onFailure(e)
+        else:
+            onSuccess(result)
+
+
+@pytest.mark.usefixtures("app")
+def test_requested_keys_are_fetched_in_batches(
+    cache: IssueCache,
+    searches: list[list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The valid keys requested are collected and searched in batches - keys being fetched are not requested again."""
+    monkeypatch.setattr(_issuecache, "BATCH_SIZE", 2)
+    updated = []
+    cache.updated.connect(updated.append)
+
+    cache.request(["pr-1", "PR-2", "not a key", None])
+    cache.request(["PR-3", "NO-1"])
+    assert cache.timer.isActive()
+    cache.fetch()
+    cache.request(["PR-1"])
+
+    assert not cache.requested
+    runAll(cache)
+    assert searches == [["NO-1", "PR-1"], ["PR-2", "PR-3"]]
+    assert updated == [["NO-1", "PR-1"], ["PR-2", "PR-3"]]
+    assert cache.get("pr-1")["summary"] == "Summary of PR-1"
+    assert cache.isMissing("NO-1")
+    assert not cache.fetching
+    assert IssueCache(FakeWorker(), cache.connection, cache.file).issues == cache.issues
+
+
+@pytest.mark.usefixtures("app")
+def test_issues_are_fetched_again_after_their_ttl(cache: IssueCache, searches: list[list[str]]) -> None:
+    """Issues are fetched again once outdated - missing keys sooner than found ones."""
+    cache.request(["PR-1", "NO-1"])
+    cache.fetch()
+    runAll(cache)
+
+    cache.request(["PR-1", "NO-1"])
+    assert not cache.requested
+
+    cache.issues["NO-1"]["fetched"] = time.time() - MISSING_TTL - 1
+    cache.issues["PR-1"]["fetched"] = time.time() - MISSING_TTL - 1
+    assert not cache.isMissing("NO-1")
+    cache.request(["PR-1", "NO-1"])
+    assert cache.requested == {"NO-1"}
+
+    cache.issues["PR-1"]["fetched"] = time.time() - TTL - 1
+    cache.request(["PR-1"])
+    assert cache.requested == {"NO-1", "PR-1"}
+    assert cache.get("PR-1")["summary"] == "Summary of PR-1"
+    assert len(searches) == 1
+
+
+@pytest.mark.usefixtures("app")
+def test_searches_before_a_clear_are_dropped(
+    cache: IssueCache,
+    searches: list[list[str]],  # noqa: ARG001 - the searches are faked
+    connection: list[str],
+) -> None:
+    """Results of searches started before the clear or for another server are not cached."""
+    cache.request(["PR-1"])
+    cache.fetch()
+    stale, cache.worker.submitted = cache.worker.submitted, []
+
+    cache.clear()
+    assert not cache.fetching
+    cache.request(["PR-1"])
+    cache.fetch()
+    current, cache.worker.submitted = cache.worker.submitted, stale
+    runAll(cache)
+    assert cache.get("PR-1") is None
+    assert cache.fetching == {"PR-1"}
+
+    cache.worker.submitted = current
+    runAll(cache)
+    assert cache.get("PR-1") is not None
+    assert not cache.fetching
+
+    cache.request(["PR-2"])
+    cache.fetch()
+    connection[0] = "https://other.example.com"
+    runAll(cache)
+    assert cache.get("PR-2") is None
+
+
+@pytest.mark.usefixtures("app")
+def test_failed_searches_keep_the_issues(cache: IssueCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed search is reported with its keys - they are requested again on the next request."""
+
+    def fail(url: str, uid: str, keys: list[str]) -> None:  # noqa: ARG001 - it fails anyway
+        raise JIRAError("Service Unavailable", status_code=503)
+
+    monkeypatch.setattr(_issuecache, "searchIssues", fail)
+    failures = []
+    cache.failed.connect(lambda keys, message: failures.append((keys, message)))
+    cache.request(["PR-1"])
+    cache.fetch()
+    runAll(cache)
+
+    assert failures[0][0] == ["PR-1"]
+    assert "503" in failures[0][1]
+    assert cache.get("PR-1") is None
+    cache.request(["PR-1"])
+    assert cache.requested == {"PR-1"}
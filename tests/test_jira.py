@@ -0,0 +1,185 @@
+"""Tests of the shared Jira sessions, the background worker and the rate limiting."""
+
+import datetime
+import email.utils
+import threading
+import time
+from collections.abc import Callable, Iterator
+from types import SimpleNamespace
+
+import pytest
+from jira import JIRAError
+from PySide6 import QtWidgets
+
+import _jira
+from _jira import DEFAULT_RETRY_AFTER, JiraWorker, TokenBucket, closeSessions, getSession, retryAfter, withSession
+from tests.conftest import waitUntil
+
+URL = "https://jira.example.com"
+
+
+class FakeSession:
+    """A logged in session which only remembers whether it was closed."""
+
+    def __init__(self, url: str, uid: str) -> None:
+        """Create the session of the user."""
+        self.url = url
+        self.uid = uid
+        self.closed = False
+
+    def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+
+@pytest.fixture
+def logins(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[FakeSession]]:
+    """Return the sessions logged in - logging in creates a fake session."""
+    sessions = []
+
+    def login(url: str, uid: str) -> FakeSession:
+        sessions.append(FakeSession(url, uid))
+        return sessions[-1]
+
+    monkeypatch.setattr(_jira, "getJiraInstance", login)
+    closeSessions()
+    yield sessions
+    closeSessions()
+
+
+def runInThreads(count: int, target: Callable[[], object]) -> list[object]:
+    """Run the target in several threads at once and return their results."""
+    results = [None] * count
+
+    def run(x: int) -> None:
+        results[x] = target()
+
+    threads = [threading.Thread(target=run, args=(x,)) for x in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_threads_share_one_login_per_user(logins: list[FakeSession]) -> None:
+    """All threads get the same session of a user - logged in only once."""
+    sessions = runInThreads(8, lambda: getSession(URL, "me"))
+
+    assert len(logins) == 1
+    assert all(session is logins[0] for session in sessions)
+    assert getSession(URL, "other") is not logins[0]
+
+
+def test_a_slow_login_does_not_block_other_users(logins: list[FakeSession], monkeypatch: pytest.MonkeyPatch) -> None:
+    """The sessions of other users are handed out while a login is still running."""
+    getSession(URL, "other")
+    loggingIn = threading.Event()
+    proceed = threading.Event()
+    login = _jira.getJiraInstance
+
+    def slowLogin(url: str, uid: str) -> FakeSession:
+        loggingIn.set()
+        assert proceed.wait(5)
+        return login(url, uid)
+
+    monkeypatch.setattr(_jira, "getJiraInstance", slowLogin)
+    slow = threading.Thread(target=getSession, args=(URL, "me"))
+    slow.start()
+    try:
+        assert loggingIn.wait(5)
+        assert getSession(URL, "other") is logins[0]
+    finally:
+        proceed.set()
+        slow.join(5)
+    assert [session.uid for session in logins] == ["other", "me"]
+
+
+def test_a_rejected_session_is_replaced_once(logins: list[FakeSession]) -> None:
+    """An operation rejected with 401 is repeated with a new session - the rejected one is closed."""
+    used = []
+
+    def operation(jira: FakeSession) -> str:
+        used.append(jira)
+        if len(used) == 1:
+            raise JIRAError("session expired", status_code=401)
+        return "done"
+
+    assert withSession(URL, "me", operation) == "done"
+    assert used == logins
+    assert len(logins) == 2
+    assert logins[0].closed
+    assert getSession(URL, "me") is logins[1]
+
+
+def test_other_errors_are_not_retried(logins: list[FakeSession]) -> None:
+    """Errors other than 401 reach the caller after one attempt and keep the session."""
+
+    def operation(jira: FakeSession) -> None:  # noqa: ARG001 - the session is not needed to fail
+        raise JIRAError("issue does not exist", status_code=404)
+
+    with pytest.raises(JIRAError):
+        withSession(URL, "me", operation)
+    assert len(logins) == 1
+    assert not logins[0].closed
+
+
+def test_the_worker_calls_back_in_the_gui_thread(app: QtWidgets.QApplication) -> None:
+    """Operations run in the background - their results and errors are handed to the callbacks in the GUI thread."""
+    worker = JiraWorker(maxThreads=2)
+    results = []
+
+    def fail() -> None:
+        raise JIRAError("issue does not exist", status_code=404)
+
+    worker.submit(threading.get_ident, lambda result: results.append((result, threading.get_ident())))
+    worker.submit(fail, onFailure=lambda error: results.append((error.status_code, threading.get_ident())))
+    assert worker.isBusy()
+
+    assert waitUntil(app, lambda: not worker.isBusy())
+    assert sorted(thread for _, thread in results) == [threading.get_ident()] * 2
+    assert threading.get_ident() not in [result for result, _ in results]
+    assert 404 in [result for result, _ in results]
+
+
+@pytest.mark.usefixtures("app")
+def test_finish_calls_back_before_returning() -> None:
+    """Finishing the worker waits for the operations and their callbacks - also for the ones submitted by callbacks."""
+    worker = JiraWorker()
+    results = []
+    worker.submit(lambda: 1, lambda result: worker.submit(lambda: result + 1, results.append))
+
+    worker.finish()
+
+    assert results == [2]
+    assert not worker.isBusy()
+
+
+def test_the_token_bucket_limits_the_rate() -> None:
+    """A burst of capacity requests passes at once - further ones wait for the refill, blocked ones for the block."""
+    bucket = TokenBucket(rate=20, capacity=3)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert 0.08 <= time.monotonic() - start < 0.5
+
+    bucket.block(0.2)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+
+def rejected(headers: dict[str, str]) -> JIRAError:
+    """Return the error of a request rejected with 429 and the headers."""
+    return JIRAError("rate limit exceeded", status_code=429, response=SimpleNamespace(headers=headers))
+
+
+def test_retry_after_is_read_in_seconds_or_as_date() -> None:
+    """Retry-After gives the seconds or the date to wait until - without a usable one the default is taken."""
+    inTenSeconds = email.utils.format_datetime(datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=10))
+
+    assert retryAfter(rejected({"Retry-After": "3"})) == 3
+    assert 8 < retryAfter(rejected({"Retry-After": inTenSeconds})) <= 10
+    assert retryAfter(rejected({"Retry-After": "soon"})) == DEFAULT_RETRY_AFTER
+    assert retryAfter(rejected({})) == DEFAULT_RETRY_AFTER
+    assert retryAfter(ValueError("no response")) == DEFAULT_RETRY_AFTER
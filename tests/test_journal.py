@@ -0,0 +1,86 @@
+"""Tests of the month journal and its compaction."""
+
+from pathlib import Path
+
+import pytest
+
+import _journal
+from _journal import MonthJournal, loadMonth, saveMonth
+from _model import DayRecord, MonthData, monthFile
+
+
+def changedMonth(start: int, *days: int) -> MonthData:
+    """Return October 2026 with the days starting at start and marked as changed."""
+    monthData = MonthData(2026, 10)
+    for x in days:
+        monthData.days[x] = DayRecord(start, start + 480)
+        monthData.markChanged(x)
+    return monthData
+
+
+def test_replay_applies_the_latest_state_of_every_day(tmp_path: Path) -> None:
+    """Every line holds the complete day, so the last line of a day wins."""
+    journal = MonthJournal(2026, 10, tmp_path)
+    journal.append(changedMonth(420, 0, 1), [0, 1])
+    journal.append(changedMonth(480, 1), [1])
+
+    monthData = loadMonth(2026, 10, tmp_path)
+
+    assert monthData.days[0].start == 420
+    assert monthData.days[1].start == 480
+    assert monthData.days[2].start == 0
+
+
+def test_replay_skips_a_torn_line(tmp_path: Path) -> None:
+    """An incomplete line left behind by a crash only loses that single change."""
+    journal = MonthJournal(2026, 10, tmp_path)
+    journal.append(changedMonth(420, 0), [0])
+    with journal.file.open("a") as fp:
+        fp.write("[1, [480, 9")
+
+    assert not journal.endsWithNewline()
+    monthData = loadMonth(2026, 10, tmp_path)
+    assert monthData.days[0].start == 420
+    assert monthData.days[1].start == 0
+
+
+def test_append_after_a_torn_line_starts_a_new_line(tmp_path: Path) -> None:
+    """The entries written after a crash are not glued to the incomplete line."""
+    journal = MonthJournal(2026, 10, tmp_path)
+    journal.file.write_text("[0, [420, 9")
+    journal.append(changedMonth(540, 2), [2])
+
+    assert journal.endsWithNewline()
+    assert loadMonth(2026, 10, tmp_path).days[2].start == 540
+
+
+def test_save_compacts_into_the_month_file(tmp_path: Path) -> None:
+    """Compacting writes the month file with the journal applied and removes the journal."""
+    monthData = changedMonth(420, 0, 5)
+
+    assert not saveMonth(monthData, folder=tmp_path)
+    assert not monthData.changedDays
+    assert not monthFile(2026, 10, tmp_path).exists()
+
+    monthData.days[5].start = 450
+    monthData.markChanged(5)
+    assert saveMonth(monthData, compact=True, folder=tmp_path)
+
+    assert not MonthJournal(2026, 10, tmp_path).file.exists()
+    loaded = loadMonth(2026, 10, tmp_path)
+    assert [loaded.days[0].start, loaded.days[5].start] == [420, 450]
+
+
+def test_save_compacts_a_big_journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The journal is compacted without being asked once it exceeds COMPACT_SIZE."""
+    monkeypatch.setattr(_journal, "COMPACT_SIZE", 1)
+
+    assert saveMonth(changedMonth(420, 3), folder=tmp_path)
+    assert monthFile(2026, 10, tmp_path).exists()
+    assert loadMonth(2026, 10, tmp_path).days[3].start == 420
+
+
+def test_save_without_changes_writes_nothing(tmp_path: Path) -> None:
+    """Neither a journal nor a month file is created for an unchanged month."""
+    assert not saveMonth(MonthData(2026, 10), compact=True, folder=tmp_path)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,51 @@
+"""Tests of the running totals of a month."""
+
+import datetime
+
+from _model import SUMMARY_FIELDS, DayRecord, MonthData, MonthTotals
+
+# planned minutes per weekday - Monday is 1
+HOURS = [0, 480, 480, 480, 480, 300, 0, 0]
+LUNCH_BREAK = 30
+TODAY = datetime.date(2026, 10, 18)
+
+
+def fields(monthData: MonthData, totals: MonthTotals) -> tuple[int, ...]:
+    """Return the running summary and check it against a complete calculation."""
+    summary = MonthTotals(monthData, HOURS, LUNCH_BREAK, TODAY).summary
+    assert [getattr(totals.summary, x) for x in SUMMARY_FIELDS] == [getattr(summary, x) for x in SUMMARY_FIELDS]
+    return tuple(getattr(totals.summary, x) for x in SUMMARY_FIELDS)
+
+
+def test_updated_days_match_a_complete_calculation() -> None:
+    """Editing days only adjusts the summary by their difference - with the same result as calculating it again."""
+    monthData = MonthData(2026, 10)
+    totals = MonthTotals(monthData, HOURS, LUNCH_BREAK, TODAY)
+    fields(monthData, totals)
+
+    # Thursday, Friday and Monday
+    monthData.days[0] = DayRecord(480, 1020, homeOffice=False)
+    monthData.days[1] = DayRecord(480, 810)
+    monthData.days[4] = DayRecord(vacation=True, za=True)
+    for x in (0, 1, 4):
+        totals.updateDay(x)
+    za, worked, _, _, officeDays = fields(monthData, totals)
+
+    assert worked == (510 + 300) * 60
+    assert officeDays == 1
+
+    monthData.days[0].end = 1080
+    totals.updateDay(0)
+    assert fields(monthData, totals)[0] == za + 3600
+
+
+def test_future_days_of_the_current_month_do_not_count_towards_za() -> None:
+    """Only the days up to today add ZA in the current month - the worked time of later days is counted anyway."""
+    empty = MonthTotals(MonthData(2026, 10), HOURS, LUNCH_BREAK, TODAY).summary
+    monthData = MonthData(2026, 10)
+    monthData.days[19] = DayRecord(480, 1200)
+
+    summary = MonthTotals(monthData, HOURS, LUNCH_BREAK, TODAY).summary
+
+    assert summary.za == empty.za
+    assert summary.worked == (1200 - 480 - LUNCH_BREAK) * 60
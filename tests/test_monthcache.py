@@ -0,0 +1,87 @@
+"""Tests of the cache of the loaded months."""
+
+from pathlib import Path
+
+import pytest
+from PySide6 import QtWidgets
+
+from _model import DayRecord, MonthData
+from _monthcache import MonthCache, monthBytes
+from _storage import JsonStorage
+from tests.conftest import waitUntil
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> JsonStorage:
+    """Return a json storage which records the months it loads."""
+    storage = JsonStorage(tmp_path / "data", tmp_path / "workpackages.json")
+    storage.loads = []
+    loadMonth = storage.loadMonth
+
+    def recordedLoad(year: int, month: int) -> MonthData:
+        storage.loads.append((year, month))
+        return loadMonth(year, month)
+
+    monkeypatch.setattr(storage, "loadMonth", recordedLoad)
+    return storage
+
+
+def test_the_least_recently_used_months_are_evicted(storage: JsonStorage) -> None:
+    """Beyond the maximum number of months the least recently used ones are removed - unless they have unsaved changes."""
+    cache = MonthCache(storage, maxMonths=3)
+    january = cache.get(2026, 1)
+    january.days[0] = DayRecord(480, 960)
+    january.markChanged(0)
+    cache.get(2026, 2)
+    cache.get(2026, 3)
+    cache.get(2026, 2)
+    cache.get(2026, 4)
+    assert list(cache.months) == [(2026, 1), (2026, 2), (2026, 4)]
+
+    cache.get(2026, 2)
+    cache.get(2026, 5)
+    assert list(cache.months) == [(2026, 1), (2026, 2), (2026, 5)]
+    assert storage.loads == [(2026, x) for x in range(1, 6)]
+
+
+def test_months_are_evicted_by_their_size(storage: JsonStorage) -> None:
+    """The cached months are limited by their size as well - the most recent one is always kept."""
+    size = monthBytes(MonthData(2026, 1))
+    cache = MonthCache(storage, maxBytes=2 * size)
+    for month in (1, 3, 5):
+        cache.get(2026, month)
+
+    assert list(cache.months) == [(2026, 3), (2026, 5)]
+
+    cache.maxBytes = 0
+    cache.evict()
+    assert list(cache.months) == [(2026, 5)]
+
+
+def test_neighbors_are_prefetched_in_the_background(app: QtWidgets.QApplication, storage: JsonStorage) -> None:
+    """The months before and after are loaded once in the background - getting them needs no load anymore."""
+    cache = MonthCache(storage)
+    cache.get(2026, 1)
+    cache.prefetchNeighbors(2026, 1)
+    cache.prefetchNeighbors(2026, 1)
+
+    assert waitUntil(app, lambda: not cache.pending)
+    assert sorted(cache.months) == [(2025, 12), (2026, 1), (2026, 2)]
+    cache.get(2025, 12)
+    cache.get(2026, 2)
+    assert sorted(storage.loads) == [(2025, 12), (2026, 1), (2026, 2)]
+
+
+def test_months_loaded_for_a_previous_storage_are_dropped(
+    app: QtWidgets.QApplication,
+    storage: JsonStorage,
+    tmp_path: Path,
+) -> None:
+    """A month still loading when the storage is switched is not taken over."""
+    cache = MonthCache(storage)
+    cache.prefetch(2026, 2)
+    cache.setStorage(JsonStorage(tmp_path / "other", tmp_path / "other.json"))
+    cache.wait()
+    app.processEvents()
+
+    assert not cache.months
@@ -0,0 +1,98 @@
+"""Tests of the outbox of the worklogs waiting for Jira."""
+
+import time
+
+import pytest
+
+import _outbox
+from _outbox import BACKOFF_MAX, BACKOFF_START, JITTER, WorklogOutbox, backoff, newWorklog
+
+
+class FakeWorkPackage:
+    """A work package with nothing but its queued worklogs."""
+
+    def __init__(self, *entries: dict) -> None:
+        """Create the work package with the entries queued."""
+        self.queuedWorklogs = list(entries)
+
+
+class Sender:
+    """Record the worklogs sent and the saves before them."""
+
+    def __init__(self) -> None:
+        """Create the sender without anything sent."""
+        self.sent = []
+        self.saves = 0
+
+    def send(self, wp: FakeWorkPackage, entry: dict, checkFirst: bool) -> None:
+        """Record the worklog with the number of saves before it."""
+        self.sent.append((wp, entry["key"], entry["attempts"], checkFirst, self.saves))
+
+    def save(self) -> None:
+        """Count the save."""
+        self.saves += 1
+
+
+def test_backoff_doubles_up_to_its_maximum(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The delay doubles with every failed attempt up to the maximum - and is spread by the jitter."""
+    monkeypatch.setattr(_outbox.random, "uniform", lambda low, high: (low + high) / 2)
+    assert [backoff(x) for x in (1, 2, 3)] == [BACKOFF_START, 2 * BACKOFF_START, 4 * BACKOFF_START]
+    assert backoff(30) == BACKOFF_MAX
+
+    monkeypatch.undo()
+    delays = {backoff(1) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(BACKOFF_START * (1 - JITTER) <= x <= BACKOFF_START * (1 + JITTER) for x in delays)
+
+
+def test_new_worklogs_have_a_unique_key() -> None:
+    """The key identifies the worklog in Jira, so every entry gets its own."""
+    first, second = newWorklog("PR-1", 60), newWorklog("PR-1", 60)
+
+    assert first["key"] != second["key"]
+    assert (first["ticket"], first["seconds"], first["attempts"]) == ("PR-1", 60, 0)
+
+
+@pytest.mark.usefixtures("app")
+def test_due_worklogs_are_counted_and_saved_before_they_are_sent() -> None:
+    """Only due worklogs are sent, each once until it is answered - repeated attempts check Jira first."""
+    due, later = newWorklog("PR-1", 60), newWorklog("PR-2", 120)
+    later["attempts"], later["nextAttempt"] = 1, time.time() + 3600
+    wp = FakeWorkPackage(due, later)
+    sender = Sender()
+    outbox = WorklogOutbox([wp], sender.send, sender.save)
+
+    outbox.drain()
+    outbox.drain()
+
+    assert sender.sent == [(wp, due["key"], 1, False, 1)]
+    assert outbox.timer.isActive()
+
+    outbox.drain(force=True)
+    assert sender.sent[1:] == [(wp, later["key"], 2, True, 2)]
+
+
+@pytest.mark.usefixtures("app")
+def test_failed_worklogs_wait_for_their_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed worklog is retried after the backoff - a written one makes the waiting ones go at once."""
+    monkeypatch.setattr(_outbox, "backoff", lambda attempts: 60 * attempts)
+    first, second = newWorklog("PR-1", 60), newWorklog("PR-2", 120)
+    wp = FakeWorkPackage(first, second)
+    sender = Sender()
+    outbox = WorklogOutbox([wp], sender.send, sender.save)
+    outbox.drain(workPackages=[])
+    assert sender.sent == []
+
+    outbox.drain()
+    outbox.retryLater(first, "Jira is down")
+    assert 59 <= first["nextAttempt"] - time.time() <= 61
+    assert first["error"] == "Jira is down"
+    assert 58_000 <= outbox.timer.remainingTime() <= 61_000
+
+    wp.queuedWorklogs.remove(second)
+    outbox.written(second)
+    assert [key for _, key, _, _, _ in sender.sent] == [first["key"], second["key"], first["key"]]
+    assert not outbox.sending - {first["key"]}
+
+    outbox.rejected(first)
+    assert not outbox.sending
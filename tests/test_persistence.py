@@ -0,0 +1,58 @@
+"""Tests of writing the data files and coalescing the saves."""
+
+import os
+from pathlib import Path
+
+import pytest
+from PySide6 import QtWidgets
+
+from _persistence import SaveCoordinator, writeIfChanged
+from tests.conftest import waitUntil
+
+
+def test_write_if_changed_skips_the_same_content(tmp_path: Path) -> None:
+    """A file is only written if its content changes."""
+    file = tmp_path / "data.json"
+    assert writeIfChanged(file, "[1]")
+    os.utime(file, ns=(0, 0))
+
+    assert not writeIfChanged(file, "[1]")
+    assert file.stat().st_mtime_ns == 0
+    assert writeIfChanged(file, "[2]")
+    assert file.read_text() == "[2]"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_write_if_changed_compares_with_an_existing_file(tmp_path: Path) -> None:
+    """The content of a file not written before is read once to compare with."""
+    file = tmp_path / "existing.json"
+    file.write_text("{}")
+
+    assert not writeIfChanged(file, "{}")
+    assert writeIfChanged(file, "[]")
+
+
+@pytest.mark.usefixtures("app")
+def test_save_coordinator_coalesces_requests() -> None:
+    """Requests with the same key are saved once - pending saves are done on flush."""
+    saves = []
+    coordinator = SaveCoordinator(delay=10000)
+    coordinator.request("month", lambda: saves.append("month 1"))
+    coordinator.request("month", lambda: saves.append("month 2"))
+    coordinator.request("workPackages", lambda: saves.append("workPackages"))
+
+    assert saves == []
+    coordinator.flush()
+    assert saves == ["month 2", "workPackages"]
+    coordinator.flush()
+    assert saves == ["month 2", "workPackages"]
+
+
+def test_save_coordinator_saves_after_the_delay(app: QtWidgets.QApplication) -> None:
+    """The save is done once no further request came in for the delay."""
+    saves = []
+    coordinator = SaveCoordinator(delay=10)
+    coordinator.request("month", lambda: saves.append("month"))
+
+    assert waitUntil(app, lambda: saves)
+    assert saves == ["month"]
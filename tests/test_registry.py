@@ -0,0 +1,73 @@
+"""Tests of the index of the work packages."""
+
+import pytest
+
+from _registry import WorkPackageRegistry
+
+
+class FakeWorkPackage:
+    """The part of a work package the registry uses."""
+
+    def __init__(self, name: str, ticket: str | None = None) -> None:
+        """Create the fake with its name and ticket."""
+        self.name = name
+        self.ticket = ticket
+
+    def isChecked(self) -> bool:
+        """Return False - the fake is never tracked."""
+        return False
+
+
+@pytest.fixture
+def registry() -> WorkPackageRegistry:
+    """Return a registry with a few work packages."""
+    registry = WorkPackageRegistry()
+    for name, ticket in (
+        ("Code Review", "PR-1234"),
+        ("Meetings", None),
+        ("Release Notes", "PR-1300"),
+        ("review board", "QA-7"),
+    ):
+        registry.add(FakeWorkPackage(name, ticket))
+    return registry
+
+
+def names(workPackages: list[FakeWorkPackage]) -> list[str]:
+    """Return the names of the work packages."""
+    return [wp.name for wp in workPackages]
+
+
+def test_search_by_name_and_ticket_ignoring_the_case(registry: WorkPackageRegistry) -> None:
+    """Name and ticket are searched for the text - the order of the registry is kept."""
+    assert names(registry.search("REVIEW")) == ["Code Review", "review board"]
+    assert names(registry.search("pr-1")) == ["Code Review", "Release Notes"]
+    assert names(registry.search("qa-7")) == ["review board"]
+    assert registry.search("nothing like this") == []
+
+
+def test_search_with_short_and_empty_texts(registry: WorkPackageRegistry) -> None:
+    """Texts shorter than the grams are searched without the index - an empty text finds everything."""
+    assert names(registry.search("e")) == ["Code Review", "Meetings", "Release Notes", "review board"]
+    assert names(registry.search("7")) == ["review board"]
+    assert len(registry.search("")) == len(registry)
+
+
+def test_search_follows_renames_and_removals(registry: WorkPackageRegistry) -> None:
+    """The index is updated when a work package is renamed or removed."""
+    meetings = registry.get("Meetings")
+    meetings.name = "Standup"
+    registry.reindex(meetings)
+
+    assert registry.search("meetings") == []
+    assert registry.search("standup") == [meetings]
+    assert "Standup" in registry
+
+    registry.remove(meetings)
+    assert registry.search("standup") == []
+    assert registry.withTicket("PR-1234") == [registry.get("Code Review")]
+
+
+def test_names_are_unique(registry: WorkPackageRegistry) -> None:
+    """A second work package with the same name is refused."""
+    with pytest.raises(ValueError, match="already exists"):
+        registry.add(FakeWorkPackage("Meetings"))
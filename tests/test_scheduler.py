@@ -0,0 +1,57 @@
+"""Tests of the timers driving the periodic updates."""
+
+import pytest
+from PySide6 import QtCore, QtWidgets
+
+from _scheduler import MIDNIGHT_MARGIN, TickScheduler
+from tests.conftest import waitUntil
+
+
+def test_ticks_only_while_tracking(app: QtWidgets.QApplication) -> None:
+    """Tracking starts the ticks at the interval for the visibility - without tracking there are none."""
+    scheduler = TickScheduler(visibleInterval=20, hiddenInterval=1000)
+    ticks = []
+    scheduler.tick.connect(lambda: ticks.append(1))
+    assert not scheduler.tickTimer.isActive()
+
+    scheduler.setState(tracking=True, visible=True)
+    assert ticks == [1]
+    assert scheduler.tickTimer.interval() == 20
+    assert waitUntil(app, lambda: len(ticks) >= 3)
+
+    scheduler.setState(tracking=True, visible=False)
+    assert scheduler.tickTimer.interval() == 1000
+
+    scheduler.setState(tracking=False, visible=False)
+    assert not scheduler.tickTimer.isActive()
+
+
+@pytest.mark.usefixtures("app")
+def test_an_unchanged_state_keeps_the_timer_running() -> None:
+    """Setting the same state again neither ticks at once nor restarts the interval."""
+    scheduler = TickScheduler(visibleInterval=1000)
+    ticks = []
+    scheduler.tick.connect(lambda: ticks.append(1))
+    scheduler.setState(tracking=True, visible=True)
+    remaining = scheduler.tickTimer.remainingTime()
+
+    scheduler.setState(tracking=True, visible=True)
+
+    assert ticks == [1]
+    assert scheduler.tickTimer.remainingTime() <= remaining
+
+
+@pytest.mark.usefixtures("app")
+def test_midnight_announces_the_new_day() -> None:
+    """The midnight timer is due shortly after the next midnight and rescheduled once it fired."""
+    scheduler = TickScheduler()
+    now = QtCore.QDateTime.currentDateTime()
+    untilMidnight = now.msecsTo(QtCore.QDateTime(now.date().addDays(1), QtCore.QTime(0, 0)))
+    assert abs(scheduler.midnightTimer.remainingTime() - untilMidnight - MIDNIGHT_MARGIN) < 1000
+
+    days = []
+    scheduler.dayChanged.connect(lambda: days.append(1))
+    scheduler.onMidnight()
+
+    assert days == [1]
+    assert scheduler.midnightTimer.isActive()
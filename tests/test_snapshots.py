@@ -0,0 +1,73 @@
+"""Tests of the snapshots of the month files."""
+
+from pathlib import Path
+
+from _model import DayRecord, MonthData
+from _snapshots import SnapshotStore
+from _storage import JsonStorage
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Every generation is restored with its content - the latest one by default."""
+    store = SnapshotStore(tmp_path)
+    for content in (b"first", b"second", b"third"):
+        assert store.add(2026, 10, content)
+
+    assert store.restore(2026, 10) == b"third"
+    assert [store.restore(2026, 10, x) for x in range(3)] == [b"first", b"second", b"third"]
+    taken = [takenAt for _, takenAt in store.history(2026, 10)]
+    assert taken == sorted(taken)
+
+
+def test_unchanged_content_is_no_new_generation(tmp_path: Path) -> None:
+    """A snapshot equal to the latest one is not taken."""
+    store = SnapshotStore(tmp_path)
+    assert store.add(2026, 10, b"same")
+    assert not store.add(2026, 10, b"same")
+    assert len(store.history(2026, 10)) == 1
+
+
+def test_identical_months_share_their_content(tmp_path: Path) -> None:
+    """The content is stored once per hash."""
+    store = SnapshotStore(tmp_path)
+    store.add(2026, 9, b"empty month")
+    store.add(2026, 10, b"empty month")
+
+    assert len(list(store.objects.iterdir())) == 1
+    assert store.restore(2026, 9) == store.restore(2026, 10) == b"empty month"
+
+
+def test_old_generations_are_pruned(tmp_path: Path) -> None:
+    """Only the last generations are kept - content still used by another month is kept as well."""
+    store = SnapshotStore(tmp_path, generations=2)
+    store.add(2026, 9, b"a")
+    for content in (b"a", b"b", b"c"):
+        store.add(2026, 10, content)
+
+    assert [store.restore(2026, 10, x) for x in range(2)] == [b"b", b"c"]
+    assert len(list(store.objects.iterdir())) == 3
+    store.add(2026, 9, b"d")
+    store.add(2026, 9, b"e")
+    assert len(list(store.objects.iterdir())) == 4
+
+
+def test_month_without_snapshots(tmp_path: Path) -> None:
+    """A month without snapshots has an empty history."""
+    assert SnapshotStore(tmp_path).history(2026, 10) == []
+
+
+def test_restore_month(tmp_path: Path) -> None:
+    """A restored month replaces the month file and its journal - the replaced month is kept as snapshot."""
+    storage = JsonStorage(tmp_path, tmp_path / "workpackages.json")
+    monthData = MonthData(2026, 9)
+    for start, compact in ((420, True), (300, True), (360, False)):
+        monthData.days[0] = DayRecord(start, start + 480)
+        monthData.markChanged(0)
+        storage.saveMonth(monthData, compact)
+    assert len(storage.snapshotTimes(2026, 9)) == 2
+
+    assert storage.restoreMonth(2026, 9, 0).days[0].start == 420
+    assert storage.loadMonth(2026, 9).days[0].start == 420
+    assert not (tmp_path / "September 2026.journal").exists()
+    # the month as it was before the restore - with the journal applied
+    assert storage.restoreMonth(2026, 9).days[0].start == 360
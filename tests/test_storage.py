@@ -0,0 +1,159 @@
+"""Tests of the storage backends and of copying the data between them."""
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+import _storage
+from _model import DayRecord, MonthData, emptyDetails
+from _storage import JsonStorage, SqliteStorage, copyStorage, migrateToSqlite, openStorage
+
+WORK_PACKAGES = [{"name": "Review", "ticket": "PR-1", "loggedTime": 60}, {"name": "Meetings", "ticket": None, "loggedTime": 0}]
+INTERVALS = {"review": [100, 200, 300, 400], "meetings": [150, 250]}
+
+
+def saveDays(storage: _storage.Storage, year: int, month: int, starts: dict[int, int], compact: bool = False) -> None:
+    """Save the days of the month starting at the given minutes."""
+    monthData = MonthData(year, month)
+    for x, start in starts.items():
+        monthData.days[x] = DayRecord(start, start + 480, homeOffice=False)
+        monthData.markChanged(x)
+    storage.saveMonth(monthData, compact)
+
+
+def starts(storage: _storage.Storage, year: int, month: int) -> list[int]:
+    """Return the start minutes of all days of the month."""
+    return [day.start for day in storage.loadMonth(year, month).days]
+
+
+@pytest.fixture
+def jsonStorage(tmp_path: Path) -> JsonStorage:
+    """Return json files with two months and the work packages."""
+    storage = JsonStorage(tmp_path / "data", tmp_path / "workpackages.json")
+    saveDays(storage, 2026, 9, {0: 420, 29: 450}, compact=True)
+    saveDays(storage, 2026, 10, {4: 480})
+    storage.saveWorkPackages(WORK_PACKAGES)
+    storage.saveIntervals({"review": [100, 200], "meetings": [150, 250]})
+    storage.saveIntervals({"review": [300, 400]})
+    return storage
+
+
+def test_migration_copies_all_months_and_work_packages(jsonStorage: JsonStorage, tmp_path: Path) -> None:
+    """The database holds the compacted months, the journals and the work packages of the json files."""
+    database = migrateToSqlite(jsonStorage, tmp_path / "data" / "times.sqlite")
+    try:
+        assert set(database.monthStamps()) == {(2026, 9), (2026, 10)}
+        assert starts(database, 2026, 9) == starts(jsonStorage, 2026, 9)
+        assert starts(database, 2026, 10) == starts(jsonStorage, 2026, 10)
+        assert database.loadWorkPackages() == WORK_PACKAGES
+        assert database.loadIntervals() == INTERVALS
+        days = database.queryDays(datetime.date(2026, 9, 1), datetime.date(2026, 10, 31), homeOffice=False)
+        assert [date for date, _ in days] == [datetime.date(2026, 9, 1), datetime.date(2026, 9, 30), datetime.date(2026, 10, 5)]
+    finally:
+        database.close()
+
+
+def test_migration_replaces_a_partial_database(jsonStorage: JsonStorage, tmp_path: Path) -> None:
+    """A database and a temporary file left behind by a crash do not end up in the migrated database."""
+    file = tmp_path / "data" / "times.sqlite"
+    stale = SqliteStorage(file)
+    saveDays(stale, 2025, 1, {0: 60})
+    stale.close()
+    (tmp_path / "data" / "times.sqlite.tmp").write_bytes(b"torn")
+
+    database = migrateToSqlite(jsonStorage, file)
+    try:
+        assert set(database.monthStamps()) == {(2026, 9), (2026, 10)}
+        assert not (tmp_path / "data" / "times.sqlite.tmp").exists()
+    finally:
+        database.close()
+
+
+def test_copy_back_to_json_keeps_the_changes_made_in_the_database(jsonStorage: JsonStorage, tmp_path: Path) -> None:
+    """Switching back and forth keeps the edits made in either storage."""
+    database = migrateToSqlite(jsonStorage, tmp_path / "data" / "times.sqlite")
+    saveDays(database, 2026, 10, {4: 500, 6: 510})
+    database.saveIntervals({"meetings": [500, 600]})
+    copyStorage(database, jsonStorage)
+    database.close()
+
+    assert starts(jsonStorage, 2026, 10)[4:7] == [500, 0, 510]
+    assert jsonStorage.loadWorkPackages() == WORK_PACKAGES
+    assert jsonStorage.loadIntervals() == {**INTERVALS, "meetings": [150, 250, 500, 600]}
+
+
+def test_open_storage_builds_the_database_once(
+    jsonStorage: JsonStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a source the database is only built from the json files if it does not exist."""
+    # the data of the fixture is where the storages look by default
+    monkeypatch.chdir(tmp_path)
+    database = openStorage("sqlite")
+    database.close()
+    saveDays(jsonStorage, 2026, 11, {0: 420})
+
+    database = openStorage("sqlite")
+    try:
+        assert (2026, 11) not in database.monthStamps()
+    finally:
+        database.close()
+
+    database = openStorage("sqlite", jsonStorage)
+    try:
+        assert (2026, 11) in database.monthStamps()
+    finally:
+        database.close()
+
+
+def test_json_storage_without_work_packages(tmp_path: Path) -> None:
+    """There are no work packages before they were saved the first time."""
+    assert JsonStorage(tmp_path, tmp_path / "workpackages.json").loadWorkPackages() == []
+
+
+def test_storage_is_abstract() -> None:
+    """A storage has to implement loading and saving of the months and work packages."""
+    with pytest.raises(TypeError, match="abstract"):
+        _storage.Storage()
+
+
+def test_query_days_of_json_files(jsonStorage: JsonStorage, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The days are queried over months with the stored months looked up once."""
+    calls = []
+    monthStamps = jsonStorage.monthStamps
+    monkeypatch.setattr(jsonStorage, "monthStamps", lambda: calls.append(1) or monthStamps())
+
+    days = jsonStorage.queryDays(datetime.date(2025, 1, 1), datetime.date(2026, 12, 31), homeOffice=False)
+
+    assert [date for date, _ in days] == [datetime.date(2026, 9, 1), datetime.date(2026, 9, 30), datetime.date(2026, 10, 5)]
+    assert len(calls) == 1
+
+
+def test_days_read_back_from_the_database_equal_the_saved_ones(tmp_path: Path) -> None:
+    """Days without detail times get the same empty details as new days - with detail times they keep them."""
+    database = SqliteStorage(tmp_path / "times.sqlite")
+    try:
+        monthData = MonthData(2026, 10)
+        monthData.days[1].setDetails([480, 600, [(480, 540, 1), (540, 600, 0), *emptyDetails()[2][2:]]])
+        monthData.markChanged(0)
+        monthData.markChanged(1)
+        database.saveMonth(monthData)
+
+        loaded = database.loadMonth(2026, 10)
+
+        assert loaded.days[0].details == emptyDetails()
+        assert loaded.days[1].details == [480, 600, [(480, 540, 1), (540, 600, 0), *emptyDetails()[2][2:]]]
+    finally:
+        database.close()
+
+
+def test_intervals_are_appended_to_their_journal(jsonStorage: JsonStorage) -> None:
+    """Saving intervals only appends them - an incomplete line left by a crash is skipped."""
+    with jsonStorage.intervalsFile.open("a") as fp:
+        fp.write('["review", [500')
+    size = jsonStorage.intervalsFile.stat().st_size
+
+    jsonStorage.saveIntervals({"review": [700, 800]})
+
+    assert jsonStorage.intervalsFile.stat().st_size - size < 30
+    assert jsonStorage.loadIntervals() == {**INTERVALS, "review": [100, 200, 300, 400, 700, 800]}
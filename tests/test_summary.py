@@ -0,0 +1,101 @@
+"""Tests of the summary index of the ZA balance."""
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+from _model import DayRecord, MonthData
+from _storage import JsonStorage
+from _summary import SummaryIndex
+
+# planned minutes per weekday - Monday is 1
+HOURS = [0, 480, 480, 480, 480, 300, 0, 0]
+LUNCH_BREAK = 30
+TODAY = datetime.date(2026, 10, 18)
+
+
+def storeMonth(storage: JsonStorage, year: int, month: int, overtime: int) -> MonthData:
+    """Store a month with the planned time worked on its first working day plus the overtime in minutes."""
+    monthData = MonthData(year, month)
+    first = next(x for x in range(len(monthData.days)) if HOURS[datetime.date(year, month, x + 1).isoweekday()])
+    planned = HOURS[datetime.date(year, month, first + 1).isoweekday()]
+    monthData.days[first] = DayRecord(480, 480 + planned + LUNCH_BREAK + overtime)
+    monthData.markChanged(first)
+    storage.saveMonth(monthData, compact=True)
+    return monthData
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> JsonStorage:
+    """Return a json storage with two completed months, the current one and a future one."""
+    storage = JsonStorage(tmp_path / "data", tmp_path / "workpackages.json")
+    storeMonth(storage, 2026, 8, 60)
+    storeMonth(storage, 2026, 9, 120)
+    storeMonth(storage, 2026, 10, 30)
+    storeMonth(storage, 2026, 12, 0)
+    return storage
+
+
+def za(storage: JsonStorage, year: int, month: int) -> int:
+    """Return the ZA of a completed month calculated from its stored data."""
+    return storage.loadMonth(year, month).summary(HOURS, LUNCH_BREAK, datetime.date.max).za
+
+
+def test_balance_sums_up_the_completed_months(storage: JsonStorage, tmp_path: Path) -> None:
+    """The balance before a month is the ZA of all completed months before it - read again from the index file."""
+    index = SummaryIndex(tmp_path / "data")
+    index.refresh(storage, HOURS, LUNCH_BREAK, TODAY)
+
+    assert index.balanceBefore(2026, 8) == 0
+    assert index.balanceBefore(2026, 9) == za(storage, 2026, 8)
+    assert index.balanceBefore(2026, 10) == za(storage, 2026, 8) + za(storage, 2026, 9)
+    assert sorted(index.entries) == ["2026-08", "2026-09"]
+
+    reloaded = SummaryIndex(tmp_path / "data")
+    assert reloaded.entries == index.entries
+
+
+def test_months_after_the_current_one_include_its_running_za(storage: JsonStorage, tmp_path: Path) -> None:
+    """The running ZA of the current month is carried into the months after it."""
+    index = SummaryIndex(tmp_path / "data")
+    index.refresh(storage, HOURS, LUNCH_BREAK, TODAY)
+    index.runningZA = 1800
+
+    assert index.balanceBefore(2026, 11) == index.balanceBefore(2026, 10) + 1800
+    assert index.balanceBefore(2027, 1) == index.balanceBefore(2026, 10) + 1800
+
+
+def test_saved_months_update_their_entry_without_scanning_the_storage(
+    storage: JsonStorage,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Saving a completed month only recalculates its own entry - the current month has none."""
+    index = SummaryIndex(tmp_path / "data")
+    index.refresh(storage, HOURS, LUNCH_BREAK, TODAY)
+    before = index.balanceBefore(2026, 10)
+    monkeypatch.setattr(storage, "monthStamps", lambda: pytest.fail("the storage was scanned"))
+
+    september = storage.loadMonth(2026, 9)
+    september.days[-1] = DayRecord(480, 1020)
+    index.updateMonth(september, HOURS, LUNCH_BREAK)
+    index.updateMonth(storage.loadMonth(2026, 10), HOURS, LUNCH_BREAK)
+
+    assert index.balanceBefore(2026, 10) - before == (1020 - 480 - LUNCH_BREAK) * 60
+    assert sorted(index.entries) == ["2026-08", "2026-09"]
+
+
+def test_changed_settings_and_a_new_month_are_recalculated(storage: JsonStorage, tmp_path: Path) -> None:
+    """Other planned hours recalculate all entries - the month completed since the last refresh is added."""
+    index = SummaryIndex(tmp_path / "data")
+    index.refresh(storage, HOURS, LUNCH_BREAK, TODAY)
+    before = index.balanceBefore(2026, 10)
+
+    index.refresh(storage, [0, 420, 420, 420, 420, 300, 0, 0], LUNCH_BREAK, TODAY)
+    assert index.balanceBefore(2026, 10) > before
+
+    nextMonth = datetime.date(2026, 11, 2)
+    assert index.isOutdated(nextMonth)
+    index.refresh(storage, HOURS, LUNCH_BREAK, nextMonth)
+    assert sorted(index.entries) == ["2026-08", "2026-09", "2026-10"]
@@ -1,27 +1,55 @@
 """Main application window for time tracking."""
+# ruff: noqa: E402 - the start time is taken before the imports, so the time to the first paint includes them
 
 from __future__ import annotations
 
-import calendar
-import json
-import os
-import shutil
 import sys
 import time
-from pathlib import Path
+import uuid
+from typing import TYPE_CHECKING
+
+STARTED = time.perf_counter()
 
-import psutil
-import win32com.client
-import win32gui
-import win32process
 from PySide6 import QtCore, QtGui, QtWidgets
 
 import _dialogs as dialogs
-from _utils import JiraWriteLog, logging, minutesToTime, resource_path, timeToHourString, timeToMinutes
+from _config import ConfigStore
+from _icons import icon
+from _instance import ACKNOWLEDGED, COMMANDS, UNANSWERED, InstanceServer, sendCommand
+from _intervals import IntervalLog, splitByDay
+from _issuecache import IssueCache, issueKey, isValidKey
+from _jira import (
+    FAILED,
+    PENDING,
+    QUEUED,
+    SUCCEEDED,
+    JiraWorker,
+    TokenBucket,
+    closeSessions,
+    errorMessage,
+    isTransient,
+    writeWorklog,
+)
+from _monthcache import MonthCache
+from _monthview import DATE, MonthTableModel, MonthView
+from _outbox import WorklogOutbox, newWorklog
+from _persistence import SaveCoordinator
+from _registry import WorkPackageRegistry
+from _scheduler import TickScheduler
+from _storage import openStorage
+from _summary import SummaryIndex
+from _utils import logging, timeToMinutes
+from _workpackageview import TICKET, WorkPackageFilterModel, WorkPackageTable, WorkPackageTableModel, formatSeconds
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Iterable
 
 version = "replace me for real version"
-
-MAXIMUM_DAILY_ALLOWED_WORK_HOURS = 10
+# the window should be painted within this time after the start (in seconds)
+FIRST_PAINT_TARGET = 1.0
+# number of work packages in the tray menu - the others are in its "More..." submenu
+RECENT_WORK_PACKAGES = 10
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -35,58 +63,67 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle(f"Times {version}")
         self.setMinimumWidth(500)
 
-        self.dateButtons = []
-        self.plannedTimeLabels = []
-        self.starttimeTime = []
-        self.endtimeTime = []
-        self.autoTimes = []
-        self.diffTimeLabels = []
-        self.vacationCheckBoxes = []
-        self.fullTimeLabels = []
-        self.breakCheckBoxes = []
-        self.HOCheckBoxes = []
-
-        mainWidget = self.createMainWidget()
+        self.setStyleSheet("QPushButton:checked {background-color: LightGreen;}")
+        self.saveCoordinator = SaveCoordinator(self)
 
         vSplitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
         vSplitter.addWidget(self.createTopLine())
-        vSplitter.addWidget(self.createScrollArea(mainWidget))
+        vSplitter.addWidget(self.createMonthView())
         vSplitter.setChildrenCollapsible(False)
         vSplitter.handle(1).setCursor(QtCore.Qt.ArrowCursor)
 
-        self.settings = dialogs.SettingsDialog(self)
+        self.detailTimesDialog = None
+        self.settingsDialog = None
+        self.firstPaint = None
+        self.config = ConfigStore(parent=self)
+        self.config.changed.connect(self.onConfigChanged)
+        dialogs.AdvancedTimeEdit.connectHoursAndMinutes = self.config["connectHoursAndMinutes"]
+        self.storage = openStorage(self.config["storage"])
+        self.monthCache = MonthCache(self.storage, self)
         self.loadMonth()
-        self.config = self.settings.getConfig()
-        self.workPackages = self.loadWorkPackages()
-        self.workPackageView = WorkPackageView(self)
+        self.summaryIndex = SummaryIndex()
+        self.carriedZA = 0
+        self.loadWorkPackages()
+        self.createJiraServices()
+        self.workPackageView = None
         self.workpackagesButton.setChecked(self.config["wpActive"])
 
         self.hSplitter = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
         self.hSplitter.addWidget(vSplitter)
         self.hSplitter.setChildrenCollapsible(False)
-        wpl = self.config["wpLocation"]
-        if wpl < 2:  # noqa: PLR2004  - could be fixed at some point by making it an enum...
-            self.hSplitter.insertWidget(wpl, self.workPackageView)
-
-        self.workPackageView.setVisible(self.config["wpActive"])
+        if self.config["wpActive"]:
+            self.createWorkPackageView().show()
 
         self.setCentralWidget(self.hSplitter)
 
         self.app = app
+        self.menu = None
         if self.app:
             self.app.setQuitOnLastWindowClosed(not self.config["minimize"])
-            self.menu = None
             self.trayActions = {}
             self.trayIcon = None
             self.createTray()
 
         self.updateDateLabels()
-        self.resize(QtCore.QSize(mainWidget.sizeHint().width() + 20, self.size().height() + 50))
-
-        self.cyclicCounter = 0
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.cyclicFunction)
-        self.timer.start(1000)
+        self.resize(QtCore.QSize(self.monthView.sizeHint().width() + 20, self.size().height() + 50))
+
+        self.workPackagesSaved = time.monotonic()
+        self.scheduler = TickScheduler(self)
+        self.scheduler.tick.connect(self.cyclicFunction)
+        self.scheduler.dayChanged.connect(self.colorDates)
+        self.updateTickRate()
+
+    def createJiraServices(self) -> None:
+        """Create the background worker of the Jira operations with its rate limiter, worklog outbox and issue cache."""
+        self.jiraWorker = JiraWorker(self)
+        self.jiraLimiter = TokenBucket()
+        # the results of the worklogs sent by logAllWorkPackages by their key - None while pending
+        self.worklogBatch: dict[str, tuple[str, str, str, str | None] | None] | None = None
+        self.worklogOutbox = WorklogOutbox(self.workPackages, self.sendWorklog, self.saveWorkPackages, self)
+        # the worklogs still queued when the last session ended
+        self.worklogOutbox.drain(force=True)
+        self.issueCache = IssueCache(self.jiraWorker, lambda: (self.config["url"], self.config["uid"]), parent=self)
+        self.requestIssues()
 
     def createTopLine(self) -> QtWidgets.QGroupBox:
         """Create the top line with controls."""
@@ -97,14 +134,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self.datetime.setDisplayFormat("MMMM yyyy")
         self.datetime.dateChanged.connect(self.onMonthChanged)
         layout.addWidget(self.datetime, 0, 0, 1, 3)
-        self.oldDateTime = self.datetime.date()
 
         self.onSitePercentage = QtWidgets.QLabel("'HO%")
         self.onSitePercentage.setToolTip("Display the % of office days in the complete month")
         layout.addWidget(self.onSitePercentage, 0, 5)
 
+        self.hoursZABalance = QtWidgets.QLabel("ZA Balance")
+        self.hoursZABalance.setToolTip("Display the ZA carried over from all previous months including this month")
         self.hoursZA = QtWidgets.QLabel("ZA")
         self.hoursTotal = QtWidgets.QLabel("Total")
+        layout.addWidget(self.hoursZABalance, 0, 6)
         layout.addWidget(self.hoursZA, 0, 7)
         layout.addWidget(self.hoursTotal, 0, 8)
 
@@ -120,131 +159,96 @@ class MainWindow(QtWidgets.QMainWindow):
         topLine.setFixedHeight(40)
         return topLine
 
-    def createDayWidgets(self, day: int, layout: QtWidgets.QGridLayout) -> None:
-        """Create widgets for the day of the month."""
-        dateButton = QtWidgets.QPushButton(str(day))
-        dateButton.clicked.connect(self.openDetailTimesDialog)
-        self.dateButtons.append(dateButton)
-        layout.addWidget(dateButton, day, 0)
-
-        label = QtWidgets.QLabel(str(day))
-        self.plannedTimeLabels.append(label)
-        layout.addWidget(label, day, 1)
-
-        starttime = dialogs.AdvancedTimeEdit()
-        starttime.editingFinished.connect(self.updateDateLabels)
-        self.starttimeTime.append(starttime)
-        layout.addWidget(starttime, day, 2)
-
-        endtime = dialogs.AdvancedTimeEdit()
-        endtime.editingFinished.connect(self.updateDateLabels)
-        self.endtimeTime.append(endtime)
-        layout.addWidget(endtime, day, 4)
-
-        autoTime = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("time.png")), "")
-        autoTime.setObjectName(str(day))
-        autoTime.setToolTip(
-            "If start time is 00:00, it will set it to the current time\n"
-            "If start time is something different, it will set the end time to the current time"
-        )
-        autoTime.clicked.connect(self.autoUpdateTime)
-        self.autoTimes.append(autoTime)
-        layout.addWidget(autoTime, day, 5)
-
-        label = QtWidgets.QLabel("")
-        self.diffTimeLabels.append(label)
-        layout.addWidget(label, day, 6)
-
-        checkbox = dialogs.VacationButton()
-        checkbox.clicked.connect(self.updateDateLabels)
-        self.vacationCheckBoxes.append(checkbox)
-        layout.addWidget(checkbox, day, 7)
-
-        label = QtWidgets.QLabel("")
-        self.fullTimeLabels.append(label)
-        layout.addWidget(label, day, 8)
-
-        breakCheckBox = QtWidgets.QPushButton()
-        breakCheckBox.clicked.connect(self.updateDateLabels)
-        breakCheckBox.setCheckable(True)
-        breakCheckBox.setIcon(QtGui.QPixmap(resource_path("lunch.png")))
-        breakCheckBox.setToolTip(
-            "Green if you had lunch - will reduce the worked time on this day by the configured normal lunch break"
-        )
-        self.breakCheckBoxes.append(breakCheckBox)
-        layout.addWidget(breakCheckBox, day, 9)
-
-        HOCheckBox = QtWidgets.QPushButton()
-        HOCheckBox.setCheckable(True)
-        HOCheckBox.setChecked(True)
-        HOCheckBox.setIcon(QtGui.QPixmap(resource_path("house.png")))
-        HOCheckBox.setToolTip("Green if you worked from home - helps you remember that")
-        HOCheckBox.clicked.connect(self.updateonSitePercentage)
-        self.HOCheckBoxes.append(HOCheckBox)
-        layout.addWidget(HOCheckBox, day, 10)
-
-    def createMainWidget(self) -> QtWidgets.QWidget:
-        """Create the main widget containing all day widgets."""
-        mainWidget = QtWidgets.QGroupBox()
-        mainWidgetLayout = QtWidgets.QGridLayout()
-        for days in range(31):
-            self.createDayWidgets(days, mainWidgetLayout)
-
-        mainWidgetLayout.setRowStretch(31, 100)
-        self.setStyleSheet("QPushButton:checked {background-color: LightGreen;}")
-        mainWidget.setLayout(mainWidgetLayout)
-        return mainWidget
-
-    def createScrollArea(self, widget: QtWidgets.Qw) -> QtWidgets.QScrollArea:
-        """Create the scroll area for the main widget."""
-        scrollArea = QtWidgets.QScrollArea()
-        scrollArea.setWidget(widget)
-        scrollArea.setWidgetResizable(True)
-        scrollArea.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scrollArea.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
-        scrollArea.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
-        return scrollArea
+    def createMonthView(self) -> MonthView:
+        """Create the table showing the days of the month."""
+        self.monthModel = MonthTableModel(self)
+        self.monthModel.totalsChanged.connect(self.showTotals)
+        self.monthModel.dayEdited.connect(self.requestMonthSave)
+        self.monthView = MonthView(self.monthModel)
+        self.monthView.dateClicked.connect(self.openDetailTimesDialog)
+        self.monthView.autoTimeClicked.connect(self.autoUpdateTime)
+        self.monthView.restoreClicked.connect(self.restoreMonth)
+        return self.monthView
 
     def cyclicFunction(self) -> None:
-        """Update work packages and UI. Saves the workpackage data every 60 calls."""
-        self.cyclicCounter = self.cyclicCounter % 60 + 1
-        self.colorDates()
-        self.workPackageView.updateChildrenData()
-        for wp in self.workPackages:
-            if wp.isChecked():
-                wp.setText(str(wp))
-                if self.cyclicCounter // 60:
-                    self.saveWorkPackages()
+        """Update the tracked work packages. Requests a save of the workpackage data once a minute."""
+        if self.workPackageView is not None:
+            self.workPackageView.updateChildrenData()
+        if self.workPackages.active is not None and self.menu is not None and self.menu.isVisible():
+            self.workPackages.active.setText(str(self.workPackages.active))
+        if time.monotonic() - self.workPackagesSaved >= 60:  # noqa: PLR2004
+            self.workPackagesSaved = time.monotonic()
+            self.saveCoordinator.request("workPackages", self.saveWorkPackages)
+
+    def updateTickRate(self) -> None:
+        """Tick only while a work package is tracked - slowly if no window shows it."""
+        tracking = self.workPackages.active is not None
+        viewShown = self.workPackageView is not None and self.isShown(self.workPackageView)
+        self.scheduler.setState(tracking, self.isShown(self) or viewShown)
+
+    @staticmethod
+    def isShown(widget: QtWidgets.QWidget) -> bool:
+        """Return True if the widget can be seen."""
+        return widget.isVisible() and not widget.window().isMinimized()
+
+    def onWorkPackageTriggered(self, checked: bool = False) -> None:
+        """Save the changed tracking state and adapt the tick rate."""
+        self.saveCoordinator.request("workPackages", self.saveWorkPackages)
+        self.updateTickRate()
+        if checked:
+            self.markWorkPackageUsed(self.sender())
 
     def stopAllTracking(self, checked: bool | None = None) -> None:
-        """Stop tracking on all work packages."""
-        if checked:
-            for wp in self.workPackages:
-                if wp.isChecked() and wp != self.sender():
-                    wp.trigger()
+        """Stop tracking on the previously tracked work package when another one is started."""
+        previous = self.workPackages.setTracking(self.sender(), bool(checked))
+        if previous is not None and previous.isChecked():
+            previous.trigger()
+
+    def onWorkPackageEdited(self) -> None:
+        """Update the indexes and fetch the issue after name or ticket of a work package changed."""
+        wp = self.sender()
+        self.workPackages.reindex(wp)
+        if self.issueCache.isChecked():
+            self.issueCache.request([wp.ticket])
+
+    def requestIssues(self) -> None:
+        """Fetch the issues of all work packages which are not cached yet or outdated - if Jira is asked at all."""
+        if self.issueCache.isChecked():
+            self.issueCache.request(wp.ticket for wp in self.workPackages)
 
     def createTray(self) -> None:
         """Create the system tray icon and its context menu."""
-        self.trayIcon = QtWidgets.QSystemTrayIcon(QtGui.QIcon(resource_path("time.png")), self.app)
+        self.trayIcon = QtWidgets.QSystemTrayIcon(icon("time.png"), self.app)
         self.trayIcon.show()
         self.trayIcon.activated.connect(self.trayActivated)
         self.createTrayMenu()
 
     def createTrayMenu(self) -> None:
-        """Create the context menu for the system tray icon."""
+        """Create the context menu for the system tray icon with the most recently used work packages."""
         self.menu = QtWidgets.QMenu()
+        self.menu.aboutToShow.connect(self.updateTrayMenu)
 
         action_newWP = QtGui.QAction("New Work Package")
         action_newWP.triggered.connect(self.newWorkPackage)
         self.menu.addAction(action_newWP)
         self.trayActions["New Work Package"] = action_newWP
 
+        action_findWP = QtGui.QAction("Find Work Package...")
+        action_findWP.triggered.connect(self.findWorkPackage)
+        self.menu.addAction(action_findWP)
+        self.trayActions["Find Work Package"] = action_findWP
+
+        action_logAll = QtGui.QAction("Log All to Jira")
+        action_logAll.triggered.connect(self.logAllWorkPackages)
+        self.menu.addAction(action_logAll)
+        self.trayActions["Log All to Jira"] = action_logAll
+
         self.menu.addSeparator()
 
-        if self.workPackages:
-            for wp in self.workPackages:
-                self.menu.addAction(wp)
-            self.menu.addSeparator()
+        self.moreMenu = QtWidgets.QMenu("More...", self.menu)
+        self.moreMenu.aboutToShow.connect(self.fillMoreMenu)
+        self.moreAction = self.menu.addMenu(self.moreMenu)
+        self.menu.addSeparator()
 
         action_startDay = QtGui.QAction("Start Day")
         action_startDay.triggered.connect(self.startDay)
@@ -268,8 +272,79 @@ class MainWindow(QtWidgets.QMainWindow):
         self.menu.addAction(action_exit)
         self.trayActions["Exit"] = action_exit
 
+        self.recentWorkPackages = []
+        self.fillTrayMenu()
+
         self.trayIcon.setContextMenu(self.menu)
 
+    def fillTrayMenu(self) -> None:
+        """Put the most recently used work packages into the tray menu - instead of the ones in it."""
+        for wp in self.recentWorkPackages:
+            self.menu.removeAction(wp)
+        # least recently used first
+        self.usedWorkPackages = dict.fromkeys(sorted(self.workPackages, key=lambda wp: wp.lastUsed()))
+        self.recentWorkPackages = list(reversed(self.usedWorkPackages))[:RECENT_WORK_PACKAGES]
+        self.menu.insertActions(self.moreAction, self.recentWorkPackages)
+        self.updateMoreAction()
+
+    def markWorkPackageUsed(self, wp: WorkPackage) -> None:
+        """Move the work package to the top of the work packages in the tray menu."""
+        if self.menu is None:
+            return
+        self.usedWorkPackages.pop(wp, None)
+        self.usedWorkPackages[wp] = None
+        if self.recentWorkPackages and self.recentWorkPackages[0] is wp:
+            return
+        if wp in self.recentWorkPackages:
+            self.recentWorkPackages.remove(wp)
+        elif len(self.recentWorkPackages) >= RECENT_WORK_PACKAGES:
+            self.menu.removeAction(self.recentWorkPackages.pop())
+        self.menu.insertAction(self.recentWorkPackages[0] if self.recentWorkPackages else self.moreAction, wp)
+        self.recentWorkPackages.insert(0, wp)
+        self.updateMoreAction()
+
+    def forgetWorkPackage(self, wp: WorkPackage) -> None:
+        """Remove the work package from the tray menu - the next recently used one takes its place."""
+        if self.menu is None:
+            return
+        self.usedWorkPackages.pop(wp, None)
+        if wp in self.recentWorkPackages:
+            self.recentWorkPackages.remove(wp)
+            self.menu.removeAction(wp)
+            for other in reversed(self.usedWorkPackages):
+                if other not in self.recentWorkPackages:
+                    self.menu.insertAction(self.moreAction, other)
+                    self.recentWorkPackages.append(other)
+                    break
+        self.updateMoreAction()
+
+    def updateMoreAction(self) -> None:
+        """Only show the "More..." submenu if not all work packages are in the tray menu."""
+        self.moreAction.setVisible(len(self.workPackages) > len(self.recentWorkPackages))
+
+    def fillMoreMenu(self) -> None:
+        """Fill the "More..." submenu with the work packages which are not in the tray menu."""
+        self.moreMenu.clear()
+        recent = set(self.recentWorkPackages)
+        for wp in self.workPackages:
+            if wp not in recent:
+                wp.setText(str(wp))
+                self.moreMenu.addAction(wp)
+
+    def updateTrayMenu(self) -> None:
+        """Bring the tray menu up to date before it is shown - it is not updated while hidden."""
+        self.colorDates()
+        for wp in self.recentWorkPackages:
+            wp.setText(str(wp))
+
+    def onInstanceCommand(self, command: str) -> None:
+        """Run the command of another started instance."""
+        if command == "start-day":
+            self.startDay()
+        elif command == "end-day":
+            self.endDay()
+        self.restore()
+
     def trayActivated(self, reason: QtWidgets.QSystemTrayIcon.ActivationReason) -> None:
         """Handle activation of the system tray icon."""
         if reason == QtWidgets.QSystemTrayIcon.Trigger:
@@ -287,267 +362,348 @@ class MainWindow(QtWidgets.QMainWindow):
         """Set the start time for the current day to the current time."""
         self.datetime.setDate(QtCore.QDate.currentDate())
         x = QtCore.QDate.currentDate().day() - 1
-        h = QtCore.QTime.currentTime().hour()
-        m = QtCore.QTime.currentTime().minute()
-        self.starttimeTime[x].setTime(QtCore.QTime(h, m))
-        self.updateDateLabels()
-        self.saveMonth()
+        self.monthData.days[x].start = timeToMinutes(QtCore.QTime.currentTime())
+        self.refreshDay(x)
 
     def endDay(self) -> None:
         """Set the end time for the current day to the current time."""
         self.datetime.setDate(QtCore.QDate.currentDate())
         x = QtCore.QDate.currentDate().day() - 1
-        h = QtCore.QTime.currentTime().hour()
-        m = QtCore.QTime.currentTime().minute()
-        self.endtimeTime[x].setTime(QtCore.QTime(h, m))
-        self.updateDateLabels()
-        self.saveMonth()
+        self.monthData.days[x].end = timeToMinutes(QtCore.QTime.currentTime())
+        self.refreshDay(x)
 
-    def loadWorkPackages(self) -> list[WorkPackage]:
-        """Load work packages from a JSON file."""
-        file = Path("workpackages.json")
-        workPackages = []
+    def loadWorkPackages(self) -> WorkPackageRegistry:
+        """Load work packages from the storage."""
+        self.workPackages = WorkPackageRegistry()
         try:
-            with file.open() as fp:
-                jsonWP = json.load(fp)
-            for wpJson in jsonWP:
-                wp = WorkPackage(wpJson["name"], wpJson["ticket"], wpJson["loggedTime"])
-                wp.triggered.connect(self.stopAllTracking)
-                workPackages.append(wp)
+            intervals = self.storage.loadIntervals()
+            for wpJson in self.storage.loadWorkPackages():
+                if wpJson.get("archived"):
+                    self.workPackages.archived[wpJson["name"]] = wpJson
+                else:
+                    self.addWorkPackage(WorkPackage.fromJson(wpJson, intervals.get(wpJson.get("key"))))
         except Exception:  # noqa: BLE001 - this should be okay for ruff because it is logged as exception with traceback
             logging.exception("Could not load work packages")
-        return workPackages
+        return self.workPackages
+
+    def reloadWorkPackages(self) -> None:
+        """Replace the work packages by the ones of the storage."""
+        self.loadWorkPackages()
+        self.worklogOutbox.registry = self.workPackages
+        if self.menu is not None:
+            self.fillTrayMenu()
+        if self.workPackageView is not None:
+            self.workPackageView.model.setRegistry(self.workPackages)
+        self.updateTickRate()
+
+    def addWorkPackage(self, wp: WorkPackage) -> None:
+        """Connect the work package and add it to the registry."""
+        wp.triggered.connect(self.stopAllTracking)
+        wp.triggered.connect(self.onWorkPackageTriggered)
+        wp.edited.connect(self.onWorkPackageEdited)
+        self.workPackages.add(wp)
 
     def saveWorkPackages(self) -> None:
-        """Save the current work packages to a JSON file."""
-        file = Path("workpackages.json")
-        if self.workPackages:
+        """Save the current work packages to the storage - of their intervals only the ones added since the last save."""
+        if self.workPackages or self.workPackages.archived:
             workPackages = [wp.asJson() for wp in self.workPackages]
-            with file.open("w") as fp:
-                json.dump(workPackages, fp, indent=4)
+            self.saveIntervals(self.workPackages)
+            self.storage.saveWorkPackages(workPackages + list(self.workPackages.archived.values()))
+
+    def saveIntervals(self, workPackages: Iterable[WorkPackage]) -> None:
+        """Add the unsaved intervals of the work packages to the storage."""
+        workPackages = [wp for wp in workPackages if wp.intervals.unsaved]
+        if workPackages:
+            self.storage.saveIntervals({wp.key: wp.intervals.unsaved.tolist() for wp in workPackages})
+            for wp in workPackages:
+                wp.intervals.markSaved()
 
     def newWorkPackage(self) -> None:
         """Create a new work package with a unique name and start logging time on it."""
         name, ok = QtWidgets.QInputDialog.getText(
             self, "Name of new Work Package", "Please put in the name", QtWidgets.QLineEdit.Normal
         )
-        while name in [wp.name for wp in self.workPackages] and ok:
+        while name in self.workPackages and ok:
             name, ok = QtWidgets.QInputDialog.getText(
                 self, "Name of new Work Package", "The name has to be unique", QtWidgets.QLineEdit.Normal
             )
         if ok:
             wp = WorkPackage(name)
-            wp.triggered.connect(self.stopAllTracking)
+            self.addWorkPackage(wp)
             wp.trigger()
-            self.workPackages.append(wp)
-            self.createTrayMenu()
-            self.workPackageView.addWorkPackage(wp)
+            if self.workPackageView is not None:
+                self.workPackageView.addWorkPackage(wp)
 
-    def removeWorkPackage(self, wp: WorkPackage) -> None:
-        """Remove a work package from the list and update the tray menu."""
-        self.workPackages.remove(wp)
-        self.createTrayMenu()
+    def logWorkPackage(self, wp: WorkPackage) -> None:
+        """Queue the time of the work package for its Jira ticket and send it - with the already queued - in the background."""
+        if not wp.reserveWorklog() and not wp.queuedWorklogs:
+            logging.info("no ticket or time to log.")
+            return
+        self.worklogOutbox.drain(force=True, workPackages=[wp])
+
+    def sendWorklog(self, wp: WorkPackage, entry: dict, checkFirst: bool) -> None:
+        """Write the queued worklog of the work package to Jira in the background."""
+        wp.setWorklogState(PENDING)
+        url, uid = self.config["url"], self.config["uid"]
+        ticket, seconds, key = entry["ticket"], entry["seconds"], entry["key"]
+        self.jiraWorker.submit(
+            lambda: writeWorklog(url, uid, ticket, seconds, self.jiraLimiter, key, checkFirst),
+            lambda _: self.onWorklogWritten(wp, entry),
+            lambda error: self.onWorklogFailed(wp, entry, error),
+        )
+
+    def onWorklogWritten(self, wp: WorkPackage, entry: dict) -> None:
+        """Drop the reserved time once Jira confirmed the worklog."""
+        logging.info("log written - releasing the reserved time.")
+        wp.releaseWorklog(entry)
+        if not wp.queuedWorklogs:
+            wp.setWorklogState(SUCCEEDED)
+        self.saveWorkPackages()
+        self.recordWorklogResult(wp, entry)
+        self.worklogOutbox.written(entry)
+
+    def onWorklogFailed(self, wp: WorkPackage, entry: dict, error: Exception) -> None:
+        """
+        Queue the worklog again if Jira could not be reached - else give the reserved time back to the work package.
+
+        The failure is shown at the work package and as notification of the tray icon - or in the summary of the batch.
+        """
+        message = errorMessage(error, entry["ticket"])
+        if isTransient(error):
+            self.worklogOutbox.retryLater(entry, message)
+            message = f"{message}\nQueued - the next try is at {time.strftime('%H:%M', time.localtime(entry['nextAttempt']))}"
+            wp.setWorklogState(QUEUED, message)
+            # notify only once - not after every retry
+            title = "Work Log Queued" if entry["attempts"] == 1 else None
+        else:
+            self.worklogOutbox.rejected(entry)
+            wp.releaseWorklog(entry, written=False)
+            wp.setWorklogState(FAILED, message)
+            title = "Work Log Creation Error"
+        self.saveWorkPackages()
+        if self.recordWorklogResult(wp, entry, message):
+            return
+        if self.menu is not None and title is not None:
+            self.trayIcon.showMessage(title, f"{wp.name}: {message}", QtWidgets.QSystemTrayIcon.Warning)
+
+    def logAllWorkPackages(self) -> None:
+        """Log the time of all work packages with ticket to Jira at once and show the results in one summary."""
+        if self.worklogBatch is not None:
+            return
+        # reserveWorklog is called for every work package, not only until one has queued worklogs
+        batch = {wp for wp in self.workPackages if wp.reserveWorklog() is not None or wp.queuedWorklogs}
+        keys = [entry["key"] for wp, entry in self.worklogOutbox.waiting() if wp in batch]
+        if not keys:
+            QtWidgets.QMessageBox.information(self, "Log All to Jira", "No work package with ticket and time to log.")
+            return
+        self.worklogBatch = dict.fromkeys(keys)
+        self.worklogOutbox.drain(force=True, workPackages=batch)
+
+    def recordWorklogResult(self, wp: WorkPackage, entry: dict, error: str | None = None) -> bool:
+        """Note the result of a worklog of the batch and show the summary after the last one. Return False if not in it."""
+        if self.worklogBatch is None or entry["key"] not in self.worklogBatch:
+            return False
+        self.worklogBatch[entry["key"]] = (entry["ticket"], wp.name, formatSeconds(entry["seconds"]), error)
+        if all(row is not None for row in self.worklogBatch.values()):
+            rows = list(self.worklogBatch.values())
+            self.worklogBatch = None
+            dialogs.WorklogSummaryDialog(self, rows).show()
+        return True
+
+    def hasQueuedWorklogs(self, wp: WorkPackage) -> bool:
+        """Tell the user if time of the work package is still waiting for Jira - it must not be deleted or archived then."""
+        if not wp.queuedWorklogs:
+            return False
+        QtWidgets.QMessageBox.information(
+            self,
+            "Work Log Queued",
+            f"Time of {wp.name} is waiting to be logged to Jira. Try again once it was logged.",
+        )
+        return True
+
+    def findWorkPackage(self) -> None:
+        """Let the user pick a work package by name or ticket and start tracking on it."""
+        dialog = WorkPackagePickerDialog(self, self.workPackages)
+        if dialog.exec() and dialog.selected is not None and not dialog.selected.isChecked():
+            dialog.selected.trigger()
+
+    def removeWorkPackage(self, entry: WorkPackage | dict) -> None:
+        """Remove a work package - or an archived one given by its json data - and update the tray menu."""
+        if isinstance(entry, dict):
+            del self.workPackages.archived[entry["name"]]
+        else:
+            self.workPackages.remove(entry)
+            self.forgetWorkPackage(entry)
+        if self.workPackageView is not None:
+            self.workPackageView.removeWorkPackage(entry)
+        self.updateTickRate()
+
+    def archiveWorkPackage(self, wp: WorkPackage) -> None:
+        """Stop tracking on the work package and keep it only as json data until it is restored."""
+        if self.hasQueuedWorklogs(wp):
+            return
+        if wp.isChecked():
+            wp.trigger()
+        # archived work packages are only kept as json - their unsaved intervals are stored now
+        self.saveIntervals([wp])
+        data = self.workPackages.archive(wp)
+        self.forgetWorkPackage(wp)
+        if self.workPackageView is not None:
+            self.workPackageView.removeWorkPackage(wp)
+            self.workPackageView.addWorkPackage(data)
+        self.saveCoordinator.request("workPackages", self.saveWorkPackages)
+
+    def restoreWorkPackage(self, data: dict) -> None:
+        """Create the work package of archived json data again."""
+        self.workPackages.unarchive(data["name"])
+        wp = WorkPackage.fromJson(data, self.storage.loadIntervals().get(data.get("key")))
+        self.addWorkPackage(wp)
+        if self.workPackageView is not None:
+            self.workPackageView.removeWorkPackage(data)
+            self.workPackageView.addWorkPackage(wp)
+        self.markWorkPackageUsed(wp)
+        self.saveCoordinator.request("workPackages", self.saveWorkPackages)
+
+    def createWorkPackageView(self) -> WorkPackageView:
+        """Create the work package view on first use and place it according to the settings."""
+        if self.workPackageView is None:
+            self.workPackageView = WorkPackageView(self)
+            wpl = self.config["wpLocation"]
+            if wpl < 2:  # noqa: PLR2004  - could be fixed at some point by making it an enum...
+                self.hSplitter.insertWidget(wpl, self.workPackageView)
+        return self.workPackageView
 
     def openWorkPackageView(self) -> None:
         """Show or hide the work package view based on the button state."""
-        self.workPackageView.setVisible(self.workpackagesButton.isChecked())
+        if self.workpackagesButton.isChecked():
+            self.createWorkPackageView().show()
+        elif self.workPackageView is not None:
+            self.workPackageView.hide()
 
     def onSettingsClicked(self) -> None:
-        """Open the settings dialog and apply changes if accepted."""
-        if self.settings.exec():
-            oldConfig = self.config
-            self.config = self.settings.getConfig()
-            wplChanged = self.config["wpLocation"] != oldConfig["wpLocation"]
+        """Open the settings dialog - accepted changes are applied by onConfigChanged."""
+        self.config.reload()
+        if self.settingsDialog is None:
+            self.settingsDialog = dialogs.SettingsDialog(self, self.config)
+        else:
+            self.settingsDialog.load()
+        self.settingsDialog.exec()
+
+    def onConfigChanged(self, keys: set[str]) -> None:
+        """Apply the changed settings."""
+        if "connectHoursAndMinutes" in keys:
+            dialogs.AdvancedTimeEdit.connectHoursAndMinutes = self.config["connectHoursAndMinutes"]
+        if "storage" in keys:
+            self.switchStorage()
+        if keys & {"storage", "hours", "lunchBreak"}:
+            self.refreshSummaryIndex()
+        if keys & {"storage", "hours", "lunchBreak", "timeLabelsInHours", "forecastEndTimes", "officePercentage"}:
             self.updateDateLabels()
+        if keys & {"url", "uid"}:
+            closeSessions()
+            if "url" in keys:
+                self.issueCache.clear()
+            self.requestIssues()
+        if self.app and "minimize" in keys:
             self.app.setQuitOnLastWindowClosed(not self.config["minimize"])
-            if wplChanged:
-                self.workPackageView.hide()
-                wpl = self.config["wpLocation"]
-                if wpl < 2:  # noqa: PLR2004  - could be fixed at some point by making it an enum...
-                    self.hSplitter.insertWidget(wpl, self.workPackageView)
-                    self.workpackagesButton.setChecked(True)
-                    self.workPackageView.show()
-                    height = self.height()
-                    self.adjustSize()
-                    self.resize(self.width(), height)
-                else:
-                    self.workPackageView.setParent(None)
-                    self.workPackageView = WorkPackageView(self)
-                    self.workPackageView.show()
-                    self.workPackageView.adjustSize()
-                    height = self.height()
-                    self.adjustSize()
-                    self.resize(self.width(), height)
-
-    def openDetailTimesDialog(self) -> None:
-        """Open the detail times dialog for a specific day."""
-        pushButton = self.sender()
-        dlg = dialogs.DetailTimesDialog(self, pushButton.text(), pushButton.timestamps[2])
-        if dlg.exec():
-            pushButton.timestamps = dlg.getDetails()
-            if self.config["dailyOfficePercentageAutoCalc"] and (pushButton.timestamps[0] or pushButton.timestamps[1]):
-                totalTime = pushButton.timestamps[1] - pushButton.timestamps[0]
-                officeTime = totalTime
-                for start, end, state in pushButton.timestamps[2]:
-                    if state == 0:
-                        officeTime -= end - start
-                self.HOCheckBoxes[self.dateButtons.index(pushButton)].setChecked(
-                    officeTime / totalTime * 100 <= self.config["dailyOfficePercentage"]
-                )
-            self.updateDateLabels()
-
-    def colorDates(self, day: int | None = None) -> None:
-        """
-        Color the date buttons based on the current date.
-
-        if day is set only color this specific day
-        """
-        date = self.datetime.date()
-        month = date.month()
-        today = QtCore.QDate.currentDate()
+        if "wpLocation" in keys:
+            self.createWorkPackageView().hide()
+            wpl = self.config["wpLocation"]
+            if wpl < 2:  # noqa: PLR2004  - could be fixed at some point by making it an enum...
+                self.hSplitter.insertWidget(wpl, self.workPackageView)
+                self.workpackagesButton.setChecked(True)
+                self.workPackageView.show()
+                height = self.height()
+                self.adjustSize()
+                self.resize(self.width(), height)
+            else:
+                self.workPackageView.setParent(None)
+                self.workPackageView = WorkPackageView(self)
+                self.workPackageView.show()
+                self.workPackageView.adjustSize()
+                height = self.height()
+                self.adjustSize()
+                self.resize(self.width(), height)
+
+    def switchStorage(self) -> None:
+        """Copy everything to the configured storage and continue with it - tracking continues on the same work package."""
+        tracked = self.workPackages.active
+        if tracked is not None:
+            tracked.trigger()
+        # the callbacks of the worklogs sent refer to the work packages and entries replaced below
+        self.jiraWorker.finish()
+        self.saveCoordinator.flush()
+        self.saveMonth(compact=True)
+        self.saveWorkPackages()
+        self.monthCache.wait()
+        previous = self.storage
+        self.storage = openStorage(self.config["storage"], previous)
+        previous.close()
+        self.monthCache.setStorage(self.storage)
+        self.loadMonth()
+        self.reloadWorkPackages()
+        if tracked is not None and (wp := self.workPackages.get(tracked.name)) is not None:
+            wp.trigger()
 
-        if day is None:
-            start = 0
-            end = date.daysInMonth()
+    def openDetailTimesDialog(self, x: int) -> None:
+        """Open the detail times dialog for a specific day."""
+        day = self.monthData.days[x]
+        title = self.monthModel.index(x, DATE).data()
+        if self.detailTimesDialog is None:
+            self.detailTimesDialog = dialogs.DetailTimesDialog(self, title, day.details[2])
         else:
-            start = day
-            end = day + 1
-        for x in range(start, end):
-            if x + 1 < today.day() and month == today.month():
-                self.dateButtons[x].setStyleSheet("color: rgb(100, 100, 100)")
-            elif x + 1 == today.day() and month == today.month():
-                self.dateButtons[x].setStyleSheet("color: red")
-                self.trayActions["Start Day"].setDisabled(self.starttimeTime[x].time().msecsSinceStartOfDay())
-            else:
-                self.dateButtons[x].setStyleSheet("")
+            self.detailTimesDialog.setData(title, day.details[2])
+        if self.detailTimesDialog.exec():
+            day.setDetails(self.detailTimesDialog.getDetails())
+            if self.config["dailyOfficePercentageAutoCalc"] and (day.details[0] or day.details[1]):
+                day.applyDailyOfficePercentage(self.config["dailyOfficePercentage"])
+            self.refreshDay(x)
+
+    def colorDates(self) -> None:
+        """Update the coloring of the dates and the start day action to the current date."""
+        today = QtCore.QDate.currentDate().toPython()
+        self.monthModel.setToday(today)
+        if self.app and self.monthData.isCurrentMonth(today):
+            self.trayActions["Start Day"].setDisabled(bool(self.monthData.days[today.day - 1].start))
 
     def updateDateLabels(self) -> None:
         """Update all date labels and calculations for the current month."""
-        dayString = ["", *list(calendar.day_abbr)]
-        if self.config["timeLabelsInHours"]:
-            hours = [timeToHourString(x) for x in self.config["hours"]]
-        else:
-            hours = [x.toString("h:mm") for x in self.config["hours"]]
-
-        zero = QtCore.QTime(0, 0)
-        seconds = [zero.secsTo(x) for x in self.config["hours"]]
-
-        date = self.datetime.date()
-        month = date.month()
-        year = date.year()
-
-        ZA = 0
-        tH = 0  # total time worked (seconds)
-        pTH = 0  # planned total time this month (seconds)
-
-        for x in range(31):
-            if x < date.daysInMonth():
-                self.dateButtons[x].show()
-                self.plannedTimeLabels[x].show()
-                dayOfWeek = QtCore.QDate(year, month, x + 1).dayOfWeek()
-                self.dateButtons[x].setText(f"{dayString[dayOfWeek]} {x + 1}.{month}.{year}")
-                self.plannedTimeLabels[x].setText(hours[dayOfWeek])
-
-                self.colorDates(x)
-
-                self.detailInputs(x)
-
-                calcNeeded = seconds[dayOfWeek] and (
-                    not self.vacationCheckBoxes[x].isChecked()
-                    or (self.vacationCheckBoxes[x].isChecked() and self.vacationCheckBoxes[x].isZA)
-                )
-                if calcNeeded:
-                    self.vacationCheckBoxes[x].show()
-                    self.starttimeTime[x].show()
-                    self.endtimeTime[x].show()
-                    self.autoTimes[x].show()
-                    self.diffTimeLabels[x].show()
-                    self.fullTimeLabels[x].show()
-                    self.starttimeTime[x].setEnabled(not self.vacationCheckBoxes[x].isZA)
-                    self.endtimeTime[x].setEnabled(not self.vacationCheckBoxes[x].isZA)
-                    self.autoTimes[x].setEnabled(not self.vacationCheckBoxes[x].isZA)
-                    if self.vacationCheckBoxes[x].isZA:
-                        self.breakCheckBoxes[x].hide()
-                        self.HOCheckBoxes[x].hide()
-                    else:
-                        self.breakCheckBoxes[x].show()
-                        self.HOCheckBoxes[x].show()
-
-                    ZA += self.calcTimes(x, seconds[dayOfWeek])
-                    tH += self.workedDayHours(x)
-                    pTH += seconds[dayOfWeek]
-                else:
-                    self.hideMostDay(x)
-            else:
-                self.hideAllDay(x)
-        self.setZAHours(ZA)
+        self.updateCarriedZA()
+        self.monthModel.setMonth(self.monthData, self.config)
+
+    def updateCarriedZA(self) -> None:
+        """Update the ZA carried over from the months before the current month."""
+        if self.summaryIndex.isOutdated(QtCore.QDate.currentDate().toPython()):
+            self.refreshSummaryIndex()
+        self.carriedZA = self.summaryIndex.balanceBefore(self.monthData.year, self.monthData.month)
+
+    def refreshSummaryIndex(self) -> None:
+        """Summarize all stored months again and take the running ZA of the current month from the month cache."""
+        today = QtCore.QDate.currentDate().toPython()
+        plannedMinutes = [timeToMinutes(x) for x in self.config["hours"]]
+        self.summaryIndex.refresh(self.storage, plannedMinutes, self.config["lunchBreak"], today)
+        current = self.monthCache.get(today.year, today.month)
+        self.summaryIndex.runningZA = current.summary(plannedMinutes, self.config["lunchBreak"], today).za
+
+    def refreshDay(self, x: int) -> None:
+        """Recalculate a single changed day and adjust the month totals by its difference."""
+        self.monthModel.dayChanged(x)
+
+    def showTotals(self) -> None:
+        """Show the running totals of the month."""
+        summary = self.monthModel.totals.summary
+        if self.monthData.isCurrentMonth(self.monthModel.totals.today):
+            self.summaryIndex.runningZA = summary.za
+        self.setZAHours(summary.za)
+        tH = summary.worked
+        pTH = summary.planned
         self.hoursTotal.setText(f"{tH // 3600}:{tH % 3600 // 60:002}/{pTH // 3600}:{pTH % 3600 // 60:002}")
         self.updateonSitePercentage()
 
-    def calcTimes(self, x: int, daySeconds: int) -> int:
-        """Calculate and set the time differences for a specific day."""
-        self.addEndTime(x, daySeconds)
-
-        # calc diff time
-        newStart = self.starttimeTime[x].time().addSecs(daySeconds)
-        diff = newStart.secsTo(self.endtimeTime[x].time())
-        if self.breakCheckBoxes[x].isChecked() and self.endtimeTime[x].time().msecsSinceStartOfDay():
-            diff -= self.config["lunchBreak"] * 60
-        if diff < 0:
-            diffTime = QtCore.QTime(0, 0).addSecs(-diff)
-            if self.config["timeLabelsInHours"]:
-                self.diffTimeLabels[x].setText("-" + timeToHourString(diffTime))
-            else:
-                self.diffTimeLabels[x].setText(diffTime.toString("-h:mm"))
-        elif diff > 0:
-            diffTime = QtCore.QTime(0, 0).addSecs(diff)
-            if self.config["timeLabelsInHours"]:
-                self.diffTimeLabels[x].setText(timeToHourString(diffTime))
-            else:
-                self.diffTimeLabels[x].setText(diffTime.toString("h:mm"))
-        else:
-            self.diffTimeLabels[x].hide()
-
-        month = self.datetime.date().month()
-        today = QtCore.QDate.currentDate()
-        if x + 1 <= today.day() or month is not today.month():
-            return diff
-        return 0
-
-    def hideMostDay(self, x: int) -> None:
-        """Hide most widgets for a specific day, keeping date and planned time visible."""
-        self.starttimeTime[x].hide()
-        self.endtimeTime[x].hide()
-        self.autoTimes[x].hide()
-        self.diffTimeLabels[x].hide()
-        self.fullTimeLabels[x].hide()
-        self.breakCheckBoxes[x].hide()
-        self.HOCheckBoxes[x].hide()
-
-    def hideAllDay(self, x: int) -> None:
-        """Hide all widgets for a specific day."""
-        self.dateButtons[x].hide()
-        self.plannedTimeLabels[x].hide()
-        self.starttimeTime[x].hide()
-        self.endtimeTime[x].hide()
-        self.autoTimes[x].hide()
-        self.diffTimeLabels[x].hide()
-        self.vacationCheckBoxes[x].hide()
-        self.fullTimeLabels[x].hide()
-        self.breakCheckBoxes[x].hide()
-        self.HOCheckBoxes[x].hide()
-
     def updateonSitePercentage(self) -> None:
-        """Calculate and update the on-site work percentage."""
-        workingDays = 0
-        officeDays = 0
-        for HOCheckBox in self.HOCheckBoxes:
-            if not HOCheckBox.isHidden():
-                workingDays += 1
-                if not HOCheckBox.isChecked():
-                    officeDays += 1
-        if workingDays:
-            onSitePercentage = officeDays / workingDays * 100
+        """Update the on-site work percentage."""
+        onSitePercentage = self.monthModel.totals.summary.officePercentage
+        if onSitePercentage is not None:
             self.onSitePercentage.setText(f"{onSitePercentage:.0f}%")
             if onSitePercentage < self.config["officePercentage"]:
                 self.onSitePercentage.setStyleSheet("color: red")
@@ -555,163 +711,145 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.onSitePercentage.setStyleSheet("")
                 self.onSitePercentage.setStyle(None)
 
-    def detailInputs(self, index: int) -> None:
-        """Enable/disable inputs based on stored timestamps."""
-        if self.dateButtons[index].timestamps[0] and self.dateButtons[index].timestamps[1]:
-            self.starttimeTime[index].setTime(QtCore.QTime(minutesToTime(self.dateButtons[index].timestamps[0])))
-            self.endtimeTime[index].setTime(QtCore.QTime(minutesToTime(self.dateButtons[index].timestamps[1])))
-            self.starttimeTime[index].setEnabled(False)
-            self.endtimeTime[index].setEnabled(False)
-        else:
-            self.starttimeTime[index].setEnabled(True)
-            self.endtimeTime[index].setEnabled(True)
-
-    def addEndTime(self, index: int, daySeconds: int) -> None:
-        """Automatically set end time if only start time is set and forecastEndTimes is enabled."""
-        if (
-            not self.endtimeTime[index].time().msecsSinceStartOfDay()
-            and self.starttimeTime[index].time().msecsSinceStartOfDay()
-            and self.config["forecastEndTimes"]
-        ):
-            # no end time set yet but start time is --> automatically set endtime
-            startTimeSeconds = QtCore.QTime(0, 0).secsTo(self.starttimeTime[index].time())
-            diffTime = self.endtimeTime[index].time().addSecs(startTimeSeconds + daySeconds)
-            if self.breakCheckBoxes[index].isChecked():
-                diffTime = diffTime.addSecs(self.config["lunchBreak"] * 60)
-            self.endtimeTime[index].setTime(diffTime)
-
-    def workedDayHours(self, index: int) -> int:
-        """Calculate and set the worked hours for a day."""
-        if self.starttimeTime[index].time().msecsSinceStartOfDay():
-            diff = self.starttimeTime[index].time().secsTo(self.endtimeTime[index].time())
-            if self.breakCheckBoxes[index].isChecked():
-                diff -= self.config["lunchBreak"] * 60
-            diffTime = QtCore.QTime(0, 0).addSecs(diff)
-            if self.config["timeLabelsInHours"]:
-                self.fullTimeLabels[index].setText(timeToHourString(diffTime))
-            else:
-                self.fullTimeLabels[index].setText(diffTime.toString("hh:mm"))
-            # mark the time red if it is more than 10 hours
-            if diff > MAXIMUM_DAILY_ALLOWED_WORK_HOURS * 3600:
-                self.fullTimeLabels[index].setStyleSheet("color: red")
-            else:
-                self.fullTimeLabels[index].setStyleSheet("")
-                self.fullTimeLabels[index].setStyle(None)
-                # setting the style sheet alone did not remove the red color on Windows
-            return diff
-        self.fullTimeLabels[index].setText("")
-        return 0
-
     def setZAHours(self, za: int) -> None:
-        """Set the ZA hours label."""
-        if za < 0:
-            za = abs(za)
-            self.hoursZA.setText(f"ZA: -{za // 3600}:{za % 3600 // 60:002}")
-        elif za >= 0:
-            self.hoursZA.setText(f"ZA: {za // 3600}:{za % 3600 // 60:002}")
+        """Set the ZA hours label and the ZA balance including the previous months."""
+        self.hoursZA.setText(f"ZA: {self.formatHours(za)}")
+        self.hoursZABalance.setText(f"Σ ZA: {self.formatHours(self.carriedZA + za)}")
+
+    @staticmethod
+    def formatHours(seconds: int) -> str:
+        """Format seconds as hours and minutes."""
+        sign = "-" if seconds < 0 else ""
+        seconds = abs(seconds)
+        return f"{sign}{seconds // 3600}:{seconds % 3600 // 60:002}"
 
     def onMonthChanged(self) -> None:
         """Handle the month change event to save and load data."""
         self.saveMonth()
-        self.oldDateTime = self.datetime.date()
         self.loadMonth()
         self.updateDateLabels()
 
-    def saveMonth(self) -> None:
-        """Save all data for the selected month."""
-        data = {"MonthAndYear": self.oldDateTime.toString("MMMM yyyy")}
-        for x in range(self.oldDateTime.daysInMonth()):
-            s = timeToMinutes(self.starttimeTime[x].time())
-            e = timeToMinutes(self.endtimeTime[x].time())
-            v = self.vacationCheckBoxes[x].isChecked()
-            lb = self.breakCheckBoxes[x].isChecked()
-            ho = self.HOCheckBoxes[x].isChecked()
-            timestamps = self.dateButtons[x].timestamps
-            za = v and self.vacationCheckBoxes[x].isZA
-            data[f"{x}"] = [s, e, v, lb, ho, timestamps, za]
-        dataFolder = Path("data")
-        if not dataFolder.exists():
-            dataFolder.mkdir()
-        monthFile = dataFolder / f"{data['MonthAndYear']}.json"
-        with monthFile.open("w") as fp:
-            json.dump(data, fp, indent=4)
+    def requestMonthSave(self) -> None:
+        """Save the loaded month once the current burst of edits is over."""
+        self.saveCoordinator.request("month", self.saveMonth)
+
+    def saveMonth(self, compact: bool = False) -> None:
+        """Save the changes of the loaded month - compact its journal into the month file if requested."""
+        self.storage.saveMonth(self.monthData, compact)
+        self.updateSummary()
+
+    def updateSummary(self) -> None:
+        """Update the summary of the loaded month in the summary index."""
+        plannedMinutes = [timeToMinutes(x) for x in self.config["hours"]]
+        self.summaryIndex.updateMonth(self.monthData, plannedMinutes, self.config["lunchBreak"])
 
     def loadMonth(self) -> None:
-        """Load all data for the selected month."""
-        file = Path(rf"data\{self.oldDateTime.toString('MMMM yyyy')}.json")
-        if file.exists():
-            shutil.copy(file, str(file).replace(".json", ".json.bak"))
-            with file.open() as fp:
-                data = json.load(fp)
-                date = self.datetime.date()
-                for x in range(date.daysInMonth()):
-                    # backwards compatibility:
-                    _data = data[f"{x}"]
-                    if len(_data) == 3:  # noqa: PLR2004
-                        s, e, v = _data
-                        lb = True
-                        ho = True
-                        timestamps = [0, 0, [(0, 0)] * 10]
-                        za = False
-                    elif len(_data) == 4:  # noqa: PLR2004
-                        s, e, v, lb = _data
-                        ho = True
-                        timestamps = [0, 0, [(0, 0)] * 10]
-                        za = False
-                    elif len(_data) == 5:  # noqa: PLR2004
-                        s, e, v, lb, timestamps = _data
-                        ho = True
-                        za = False
-                    elif len(_data) == 6:  # noqa: PLR2004
-                        s, e, v, lb, ho, timestamps = _data
-                        za = False
-                    else:
-                        s, e, v, lb, ho, timestamps, za = _data
-                    self.starttimeTime[x].setTime(minutesToTime(s))
-                    self.endtimeTime[x].setTime(minutesToTime(e))
-                    self.vacationCheckBoxes[x].setChecked(v)
-                    self.breakCheckBoxes[x].setChecked(lb)
-                    self.HOCheckBoxes[x].setChecked(ho)
-                    self.dateButtons[x].timestamps = timestamps
-                    self.vacationCheckBoxes[x].isZA = za
-        else:
-            date = self.datetime.date()
-            for x in range(date.daysInMonth()):
-                self.starttimeTime[x].setTime(minutesToTime(0))
-                self.endtimeTime[x].setTime(minutesToTime(0))
-                self.vacationCheckBoxes[x].setChecked(False)
-                self.breakCheckBoxes[x].setChecked(True)
-                self.dateButtons[x].timestamps = [0, 0, [(0, 0)] * 10]
-
-    def autoUpdateTime(self) -> None:
+        """Load all data for the selected month - the months before and after are loaded in the background."""
+        date = self.datetime.date()
+        self.monthData = self.monthCache.get(date.year(), date.month())
+        self.monthCache.prefetchNeighbors(date.year(), date.month())
+
+    def restoreMonth(self) -> None:
+        """Replace the shown month by one of its snapshots chosen by the user."""
+        self.saveCoordinator.flush()
+        self.saveMonth(compact=True)
+        self.monthCache.wait()
+        date = self.datetime.date()
+        year, month = date.year(), date.month()
+        taken = self.storage.snapshotTimes(year, month)
+        if not taken:
+            QtWidgets.QMessageBox.information(self, "Restore Month", "There are no snapshots of this month.")
+            return
+        # the latest first - numbered, as snapshots may be taken within the same second
+        items = [
+            f"{x + 1}. {QtCore.QDateTime.fromMSecsSinceEpoch(ns // 1_000_000).toString('yyyy-MM-dd hh:mm:ss')}"
+            for x, ns in enumerate(reversed(taken))
+        ]
+        item, ok = QtWidgets.QInputDialog.getItem(
+            self, "Restore Month", f"Restore {date.toString('MMMM yyyy')} as saved at:", items, 0, False
+        )
+        if not ok:
+            return
+        self.monthData = self.storage.restoreMonth(year, month, -1 - items.index(item))
+        self.monthCache.put(self.monthData)
+        self.updateSummary()
+        self.updateDateLabels()
+
+    def autoUpdateTime(self, x: int) -> None:
         """Automatically set start or end time to current time."""
-        x = int(self.sender().objectName())
-        h = QtCore.QTime.currentTime().hour()
-        m = QtCore.QTime.currentTime().minute()
-        if not self.starttimeTime[x].time().msecsSinceStartOfDay():
-            self.starttimeTime[x].setTime(QtCore.QTime(h, m))
+        day = self.monthData.days[x]
+        now = timeToMinutes(QtCore.QTime.currentTime())
+        if not day.start:
+            day.start = now
         else:
-            if m == 60:  # noqa: PLR2004  # it magically is 60 minutes
-                m = 0
-                h += 1
-            self.endtimeTime[x].setTime(QtCore.QTime(h, m))
-        self.updateDateLabels()
+            day.end = now
+        self.refreshDay(x)
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """Handle the close event to save data before exiting."""
-        self.saveMonth()
+        self.saveCoordinator.flush()
+        self.saveMonth(compact=True)
         super().closeEvent(event)
 
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """Log the time from the start until the window was painted for the first time."""
+        super().paintEvent(event)
+        if self.firstPaint is None:
+            self.firstPaint = time.perf_counter() - STARTED
+            if self.firstPaint > FIRST_PAINT_TARGET:
+                logging.warning("First paint after %.3f s - the target is %.1f s", self.firstPaint, FIRST_PAINT_TARGET)
+            else:
+                logging.info("First paint after %.3f s", self.firstPaint)
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        """Catch up with the current date and settings and tick fast again when the window is shown."""
+        super().showEvent(event)
+        self.config.reload()
+        self.colorDates()
+        self.updateTickRate()
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        """Tick slowly while the window is hidden."""
+        super().hideEvent(event)
+        self.updateTickRate()
+
+    def changeEvent(self, event: QtCore.QEvent) -> None:
+        """Adapt the tick rate when the window is minimized or restored."""
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self.updateTickRate()
+
 
 class WorkPackage(QtGui.QAction):
     """Work package to track time spent on a specific task."""
 
-    def __init__(self, name: str, ticket: str | None = None, loggedtime: int = 0) -> None:
+    # name, ticket or logged time were changed other than by tracking
+    edited = QtCore.Signal()
+    # the state of logging the time to Jira changed
+    worklogChanged = QtCore.Signal()
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        ticket: str | None = None,
+        loggedtime: int = 0,
+        intervals: IntervalLog | None = None,
+        queuedWorklogs: list[dict] | None = None,
+        key: str | None = None,
+    ) -> None:
         """Work package to track time spent on a specific task."""
         self.name = name
         self.ticket = ticket
         self.loggedTime = loggedtime
+        # identifies the intervals of the work package in the storage - unlike the name it is never changed
+        self.key = key or uuid.uuid4().hex
+        # every tracked interval - unlike loggedTime it is neither reset nor edited
+        self.intervals = intervals if intervals is not None else IntervalLog()
+        # the worklogs waiting for Jira - their time is already taken from loggedTime
+        self.queuedWorklogs = list(queuedWorklogs or [])
         self.currentStartTimeStamp = None
+        self.worklogState = QUEUED if self.queuedWorklogs else None
+        self.worklogError = ""
         super().__init__(text=name)
         self.setCheckable(True)
         self.setChecked(False)
@@ -722,13 +860,21 @@ class WorkPackage(QtGui.QAction):
         """Return the string representation of the work package."""
         return f"{self.name} - {self.ftime()}"
 
+    def lastUsed(self) -> float:
+        """Return the time tracking on the work package stopped the last time - 0 if it was never tracked."""
+        if self.currentStartTimeStamp:
+            return time.time()
+        return self.intervals.ends[-1] if len(self.intervals) else 0
+
     def startTracking(self) -> None:
         """Start tracking by storing the current time."""
         self.currentStartTimeStamp = time.time()
 
     def stopTracking(self) -> None:
         """Stop tracking and add the current time to logged time."""
-        self.loggedTime += time.time() - self.currentStartTimeStamp
+        now = time.time()
+        self.intervals.add(self.currentStartTimeStamp, now)
+        self.loggedTime += now - self.currentStartTimeStamp
         self.currentStartTimeStamp = None
 
     def _triggered(self) -> None:
@@ -741,8 +887,41 @@ class WorkPackage(QtGui.QAction):
     def resetTime(self) -> None:
         """Reset the tracked time to zero."""
         if self.isChecked():
-            self.currentStartTimeStamp = time.time()
+            now = time.time()
+            self.intervals.add(self.currentStartTimeStamp, now)
+            self.currentStartTimeStamp = now
         self.loggedTime = 0
+        self.edited.emit()
+
+    def deductTime(self, seconds: int) -> None:
+        """Subtract the seconds logged to Jira - the time tracked in the meantime is kept."""
+        if self.isChecked():
+            self.convertCurrentToLogged()
+        self.loggedTime = max(0, self.loggedTime - seconds)
+        self.edited.emit()
+
+    def reserveWorklog(self) -> dict | None:
+        """Move the time into a new queued worklog and return it - None if there is no ticket or time."""
+        seconds = int(self.getTotalTime())
+        if not self.ticket or not seconds:
+            return None
+        entry = newWorklog(self.ticket, seconds)
+        self.queuedWorklogs.append(entry)
+        self.deductTime(seconds)
+        return entry
+
+    def releaseWorklog(self, entry: dict, written: bool = True) -> None:
+        """Remove the queued worklog - its time is given back if it was not written to Jira."""
+        self.queuedWorklogs.remove(entry)
+        if not written:
+            self.loggedTime += entry["seconds"]
+            self.edited.emit()
+
+    def setWorklogState(self, state: str | None, error: str = "") -> None:
+        """Set the state of logging the time to Jira."""
+        self.worklogState = state
+        self.worklogError = error
+        self.worklogChanged.emit()
 
     def getCurrentTime(self) -> float:
         """Return the currently tracked time in seconds."""
@@ -754,15 +933,23 @@ class WorkPackage(QtGui.QAction):
         """Return the total logged time in seconds."""
         return self.getCurrentTime() + self.loggedTime
 
+    def getDayTime(self, date: datetime.date) -> float:
+        """Return the seconds tracked on the date - including the currently tracked time."""
+        seconds = self.intervals.day(date)
+        if self.currentStartTimeStamp:
+            seconds += sum(x for day, x in splitByDay(self.currentStartTimeStamp, time.time()) if day == date)
+        return seconds
+
     def ftime(self) -> str:
         """Return the formatted time string HH:MM:SS."""
-        t = self.getTotalTime()
-        return f"{int(t // 3600):01d}:{int(t / 60 % 60):02d}:{int(t % 60):02d}"
+        return formatSeconds(self.getTotalTime())
 
     def convertCurrentToLogged(self) -> None:
         """Convert the currently tracked time to logged time."""
-        self.loggedTime += time.time() - self.currentStartTimeStamp
-        self.currentStartTimeStamp = time.time()
+        now = time.time()
+        self.intervals.add(self.currentStartTimeStamp, now)
+        self.loggedTime += now - self.currentStartTimeStamp
+        self.currentStartTimeStamp = now
 
     def asJson(self) -> dict:
         """Return the work package as a JSON serializable dictionary."""
@@ -772,214 +959,160 @@ class WorkPackage(QtGui.QAction):
             "name": self.name,
             "ticket": self.ticket,
             "loggedTime": self.getTotalTime(),
+            "key": self.key,
+            "queuedWorklogs": self.queuedWorklogs,
         }
 
+    @classmethod
+    def fromJson(cls, data: dict, intervals: list[int] | None = None) -> WorkPackage:
+        """
+        Return the work package of its json data and its stored intervals.
 
-class WorkPackageWidget(QtWidgets.QWidget):
-    """Widget to display a work package."""
-
-    started = QtCore.Signal(bool)
-
-    def __init__(self, parent: QtWidgets.QWidget | None = None, workpackage: WorkPackage = None) -> None:
-        """Widget to display a work package."""
-        super().__init__(parent)
-        self._workpackage = None
-
-        grid = QtWidgets.QGridLayout()
-        self.ticket = QtWidgets.QPushButton()
-        self.name = QtWidgets.QLabel()
-        self.time = QtWidgets.QLabel()
-        self.startStopButton = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("play.png")), "")
-        self.startStopButton.setCheckable(True)
-        self.logButton = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("jira.png")), "Log to Jira")
-        self.editButton = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("edit.png")), "")
-        self.removeButton = QtWidgets.QPushButton(QtGui.QPixmap(resource_path("delete.png")), "")
-
-        self.ticket.clicked.connect(self.openUrl)
-        self.logButton.clicked.connect(self.logToJira)
-        self.editButton.clicked.connect(self.editWP)
-        self.removeButton.clicked.connect(self.removeWP)
-
-        grid.addWidget(self.ticket, 0, 0)
-        grid.addWidget(self.name, 0, 1)
-        grid.addWidget(self.time, 0, 2)
-        grid.addWidget(self.startStopButton, 0, 3)
-        grid.addWidget(self.logButton, 0, 4)
-        grid.addWidget(self.editButton, 0, 5)
-        grid.addWidget(self.removeButton, 0, 6)
-        self.setLayout(grid)
-
-        if workpackage:
-            self._workpackage = workpackage
-            self.startStopButton.clicked.connect(self._workpackage.trigger)
-            self.updateData()
-
-    def isActive(self) -> bool:
-        """Return True if the work package is active."""
-        return self._workpackage.isChecked()
-
-    def updateData(self) -> None:
-        """Update the displayed data."""
-        if self._workpackage.ticket:
-            self.ticket.setText(self._workpackage.ticket)
-        else:
-            self.ticket.setText("Add Ticket #")
-        self.name.setText(self._workpackage.name)
-        self.time.setText(self._workpackage.ftime())
-        if self.isActive():
-            self.startStopButton.setChecked(True)
-            self.startStopButton.setIcon(QtGui.QPixmap(resource_path("pause.png")))
-            self.setStyleSheet("background: LightGreen; color: #000000")
-            self.setAutoFillBackground(True)
-        else:
-            self.startStopButton.setChecked(False)
-            self.startStopButton.setIcon(QtGui.QPixmap(resource_path("play.png")))
-            self.setStyleSheet("background: None")
-            self.setStyleSheet("")
-
-    def openUrl(self) -> None:
-        """Open the Jira ticket URL in the default web browser."""
-        if self._workpackage.ticket:
-            urlStart = self.getMainWindow(self.parent()).config["url"]
-            url = f"{urlStart}/browse/{self._workpackage.ticket}"
-            QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
-        else:
-            name, ok = QtWidgets.QInputDialog.getText(self, "Ticket-ID (e.g. PR-1234)", "Ticket", QtWidgets.QLineEdit.Normal)
-            if ok:
-                self._workpackage.ticket = name
-                self.ticket.setText(name)
-
-    def startStopClicked(self, checked: bool = False) -> None:
-        """Handle start/stop button click."""
-        self.started.emit(checked)
-
-    def editWP(self) -> None:
-        """Open the work package edit dialog."""
-        WorkPackageEditDialog(self, self._workpackage).exec()
-
-    def removeWP(self) -> None:
-        """Remove the work package after confirmation."""
-        if self.getTotalTime() > 60 or self.isActive():  # noqa: PLR2004  # it magically is 60 seconds
-            ret = QtWidgets.QMessageBox.warning(
-                self,
-                "Delete workpackage",
-                "The workpackage will be deleted together with all the logged time. Are you sure you want to delete it?",
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
-            )
-        else:
-            ret = QtWidgets.QMessageBox.Yes
-        if ret == QtWidgets.QMessageBox.Yes:
-            mainWindow = self.getMainWindow(self.parent())
-            mainWindow.removeWorkPackage(self._workpackage)
-            self.deleteLater()
-
-    def getMainWindow(self, parent: QtWidgets.QWidget) -> MainWindow | None:
-        """Get the main window from parent."""
-        if parent:
-            if isinstance(parent, MainWindow):
-                return parent
-            return self.getMainWindow(parent.parent())
-        return None
-
-    def getTotalTime(self) -> float:
-        """Get the total time logged in seconds."""
-        return self._workpackage.getTotalTime()
-
-    def logToJira(self) -> None:
-        """Log the actual time to the Jira ticket defined."""
-        mainWindow = self.getMainWindow(self.parent())
-        wp = self._workpackage
-        loggedTime = int(self.getTotalTime())
-        if wp.ticket and loggedTime:
-            if JiraWriteLog(mainWindow.config, wp.ticket, loggedTime):
-                logging.info("log written - deleting logged time.")
-                wp.resetTime()
-                mainWindow.saveWorkPackages()
-        else:
-            logging.info("no ticket or time to log.")
+        Before the storage kept the intervals they were part of the json - then they are stored with the next save.
+        """
+        log = IntervalLog.fromJson(intervals) if intervals else IntervalLog.fromJson(data.get("intervals", []), saved=False)
+        return cls(data["name"], data["ticket"], data["loggedTime"], log, data.get("queuedWorklogs"), data.get("key"))
 
 
 class WorkPackageView(QtWidgets.QDialog):
     """View to display all work packages."""
 
-    def __init__(self, parent: QtWidgets.QWidget) -> None:
+    def __init__(self, parent: MainWindow) -> None:
         """View to display all work packages."""
         super().__init__(
             parent,
             QtCore.Qt.WindowCloseButtonHint | QtCore.Qt.WindowTitleHint | QtCore.Qt.WindowSystemMenuHint,
         )
+        # the view becomes a child of the splitter when it is docked, so its parent is no main window then
+        self.mainWindow = parent
         self.setWindowTitle("Work Packages")
-        wps = self.parent().workPackages
-        self.splitter = QtWidgets.QVBoxLayout()
-        for wp in wps:
-            self.splitter.addWidget(WorkPackageWidget(self, wp))
-        self.splitter.addStretch(100)
-        scrollArea = QtWidgets.QScrollArea()
-        mainWidget = QtWidgets.QGroupBox()
-        mainWidget.setLayout(self.splitter)
-        scrollArea.setWidget(mainWidget)
-        scrollArea.setWidgetResizable(True)
-        scrollArea.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scrollArea.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scrollArea.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
+        self.idleTime = 0
+        self.model = WorkPackageTableModel(self.mainWindow.workPackages, self.mainWindow.issueCache, self)
+        self.model.stateChanged.connect(self.updateStates)
+        self.filterModel = WorkPackageFilterModel(self)
+        self.filterModel.setSourceModel(self.model)
+
+        filterLine = QtWidgets.QHBoxLayout()
+        self.filterLE = QtWidgets.QLineEdit()
+        self.filterLE.setPlaceholderText("Filter by name or ticket")
+        self.filterLE.setClearButtonEnabled(True)
+        self.filterLE.textChanged.connect(self.filterModel.setText)
+        self.showArchivedCB = QtWidgets.QCheckBox("Show archived")
+        self.showArchivedCB.toggled.connect(self.filterModel.setShowArchived)
+        filterLine.addWidget(self.filterLE)
+        filterLine.addWidget(self.showArchivedCB)
+
+        self.table = WorkPackageTable(self.filterModel)
+        self.table.ticketClicked.connect(self.openUrl)
+        self.table.startStopClicked.connect(lambda wp: wp.trigger())
+        self.table.logClicked.connect(self.mainWindow.logWorkPackage)
+        self.table.editClicked.connect(lambda wp: WorkPackageEditDialog(self, wp).exec())
+        self.table.removeClicked.connect(self.removeWP)
+        self.table.archiveRequested.connect(self.mainWindow.archiveWorkPackage)
+        self.table.restoreRequested.connect(self.mainWindow.restoreWorkPackage)
+        self.table.resizeColumnToContents(TICKET)
 
         hSplitter = QtWidgets.QHBoxLayout()
         self.totalTimeLabel = QtWidgets.QLabel("")
         self.newWorkPackageButton = QtWidgets.QPushButton("New Work Package")
-        self.newWorkPackageButton.clicked.connect(self.parent().newWorkPackage)
+        self.newWorkPackageButton.clicked.connect(self.mainWindow.newWorkPackage)
+        self.logAllButton = QtWidgets.QPushButton("Log All to Jira")
+        self.logAllButton.clicked.connect(self.mainWindow.logAllWorkPackages)
         hSplitter.addWidget(self.totalTimeLabel)
+        hSplitter.addWidget(self.logAllButton)
         hSplitter.addWidget(self.newWorkPackageButton)
 
         mainSplitter = QtWidgets.QVBoxLayout()
-        mainSplitter.addWidget(scrollArea)
+        mainSplitter.addLayout(filterLine)
+        mainSplitter.addWidget(self.table)
         mainSplitter.addLayout(hSplitter)
 
         self.setLayout(mainSplitter)
-
-    def addWorkPackage(self, wp: WorkPackage) -> None:
-        """Add a new WorkPackageWidget to the view."""
-        self.splitter.removeItem(self.splitter.itemAt(self.splitter.count() - 1))
-        self.splitter.addWidget(WorkPackageWidget(self, wp))
-        self.splitter.addStretch(100)
+        self.updateStates()
+
+    def addWorkPackage(self, entry: WorkPackage | dict) -> None:
+        """Add a work package - or the json data of an archived one - to the view."""
+        self.model.addEntry(entry)
+        self.table.resizeColumnToContents(TICKET)
+        self.updateStates()
+
+    def removeWorkPackage(self, entry: WorkPackage | dict) -> None:
+        """Remove a work package - or the json data of an archived one - from the view."""
+        self.model.removeEntry(entry)
+        self.updateStates()
+
+    def updateStates(self) -> None:
+        """Remember the time of all work packages but the tracked one after tracking started or stopped."""
+        registry = self.mainWindow.workPackages
+        self.idleTime = sum(wp.getTotalTime() for wp in registry if wp is not registry.active)
         self.updateChildrenData()
 
     def updateChildrenData(self) -> None:
         """
-        Update all child WorkPackageWidgets.
+        Update the time of the tracked work package.
 
-        Aligns the widths of the ticket, name and time fields across all children.
         Updates the total time label with the sum of all work package times.
         """
-        children = self.findChildren(WorkPackageWidget)
-        if children:
-            ticketMax = max([wp.ticket.minimumSizeHint().width() for wp in children])
-            nameMax = max([wp.name.minimumSizeHint().width() for wp in children])
-            timeMax = max([wp.time.minimumSizeHint().width() for wp in children])
-
-            for child in children:
-                child.updateData()
-                child.ticket.setMinimumWidth(ticketMax)
-                child.name.setMinimumWidth(nameMax)
-                child.time.setMinimumWidth(timeMax)
-
-            t = sum([wp.getTotalTime() for wp in children])
-            totalTime = f"{int(t // 3600):01d}:{int(t / 60 % 60):02d}:{int(t % 60):02d}"
-            self.totalTimeLabel.setText(f"Current Total Time: {totalTime}")
-
-    def getMainWindow(self, parent: QtWidgets.QWidget) -> MainWindow | None:
-        """Get the main window from parent."""
-        if parent:
-            if isinstance(parent, MainWindow):
-                return parent
-            return self.getMainWindow(parent.parent())
-        return None
+        t = self.idleTime
+        active = self.mainWindow.workPackages.active
+        if active is not None:
+            self.model.timeChanged(active)
+            t += active.getTotalTime()
+        self.totalTimeLabel.setText(f"Current Total Time: {formatSeconds(t)}")
+
+    def openUrl(self, wp: WorkPackage) -> None:
+        """Open the Jira ticket URL in the default web browser - or ask for the ticket if there is none."""
+        if wp.ticket:
+            urlStart = self.mainWindow.config["url"]
+            url = f"{urlStart}/browse/{wp.ticket}"
+            QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
+        else:
+            name, ok = QtWidgets.QInputDialog.getText(self, "Ticket-ID (e.g. PR-1234)", "Ticket", QtWidgets.QLineEdit.Normal)
+            if not ok:
+                return
+            # the same check as in the edit dialog - Jira is asked for the ticket once it is set
+            error = self.mainWindow.issueCache.ticketError(name, wp.ticket)
+            if error:
+                QtWidgets.QMessageBox.warning(self, "Unknown Ticket", error)
+                return
+            wp.ticket = name
+            wp.edited.emit()
+
+    def removeWP(self, entry: WorkPackage | dict) -> None:
+        """Remove the work package after confirmation."""
+        if not isinstance(entry, dict) and self.mainWindow.hasQueuedWorklogs(entry):
+            return
+        seconds, tracking = WorkPackageTableModel.fields(entry)[2:]
+        if seconds > 60 or tracking:  # noqa: PLR2004  # it magically is 60 seconds
+            ret = QtWidgets.QMessageBox.warning(
+                self,
+                "Delete workpackage",
+                "The workpackage will be deleted together with all the logged time. Are you sure you want to delete it?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+            )
+        else:
+            ret = QtWidgets.QMessageBox.Yes
+        if ret == QtWidgets.QMessageBox.Yes:
+            self.mainWindow.removeWorkPackage(entry)
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """Handle close event."""
-        mainWnd = self.getMainWindow(self.parent())
-        mainWnd.workpackagesButton.setChecked(False)
+        self.mainWindow.workpackagesButton.setChecked(False)
         super().closeEvent(event)
 
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        """Let the main window adapt its tick rate."""
+        super().showEvent(event)
+        # the view may be shown while the main window is still created
+        if hasattr(self.mainWindow, "scheduler"):
+            self.mainWindow.updateTickRate()
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        """Let the main window adapt its tick rate."""
+        super().hideEvent(event)
+        if hasattr(self.mainWindow, "scheduler"):
+            self.mainWindow.updateTickRate()
+
 
 class WorkPackageEditDialog(QtWidgets.QDialog):
     """Dialog to edit a work package."""
@@ -1005,8 +1138,8 @@ class WorkPackageEditDialog(QtWidgets.QDialog):
         self.time.setAlignment(QtCore.Qt.AlignLeft)
         grid.addWidget(self.notUnique, 0, 0, 1, 4)
         grid.addWidget(self.ticket, 1, 0)
-        grid.addWidget(self.name, 2, 0)
-        grid.addWidget(self.time, 3, 0, 2, 1)
+        grid.addWidget(self.name, 3, 0)
+        grid.addWidget(self.time, 4, 0, 2, 1)
         self.ticketLE = QtWidgets.QLineEdit(self.workpackage.ticket)
         self.nameLE = QtWidgets.QLineEdit(self.workpackage.name)
 
@@ -1021,21 +1154,22 @@ class WorkPackageEditDialog(QtWidgets.QDialog):
         self.minuteEdit.setRange(0, 59)
         self.minuteEdit.wrapped.connect(self.hourEdit.stepBy)
         grid.addWidget(self.ticketLE, 1, 1, 1, 3)
-        grid.addWidget(self.nameLE, 2, 1, 1, 3)
-        grid.addWidget(self.dayLabel, 3, 1)
-        grid.addWidget(self.hourLabel, 3, 2)
-        grid.addWidget(self.minuteLabel, 3, 3)
-        grid.addWidget(self.dayEdit, 4, 1)
-        grid.addWidget(self.hourEdit, 4, 2)
-        grid.addWidget(self.minuteEdit, 4, 3)
+        grid.addWidget(self.nameLE, 3, 1, 1, 3)
+        grid.addWidget(self.dayLabel, 4, 1)
+        grid.addWidget(self.hourLabel, 4, 2)
+        grid.addWidget(self.minuteLabel, 4, 3)
+        grid.addWidget(self.dayEdit, 5, 1)
+        grid.addWidget(self.hourEdit, 5, 2)
+        grid.addWidget(self.minuteEdit, 5, 3)
 
         self.updateTime(True)
+        self.createIssueCheck(grid)
 
         buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
         buttonbox.accepted.connect(self.accept)
         buttonbox.rejected.connect(self.reject)
 
-        grid.addWidget(buttonbox, 5, 0, 1, 4)
+        grid.addWidget(buttonbox, 6, 0, 1, 4)
         self.setLayout(grid)
 
         self.timer = QtCore.QTimer()
@@ -1065,6 +1199,65 @@ class WorkPackageEditDialog(QtWidgets.QDialog):
         self.hourEdit.setDisabled(isChecked)
         self.minuteEdit.setDisabled(isChecked)
 
+    def createIssueCheck(self, grid: QtWidgets.QGridLayout) -> None:
+        """Create the label below the ticket showing the summary of its issue - or why it is no valid ticket."""
+        self.issueLabel = QtWidgets.QLabel()
+        self.issueLabel.setWordWrap(True)
+        grid.addWidget(self.issueLabel, 2, 1, 1, 3)
+        mainWindow = self.getMainWindow(self.parent())
+        self.issueCache = mainWindow.issueCache if mainWindow is not None else None
+        self.checkIssues = self.issueCache is not None and self.issueCache.isChecked()
+        if self.issueCache is not None:
+            self.issueCache.updated.connect(self.onIssuesFetched)
+            self.issueCache.failed.connect(self.onIssuesFailed)
+        self.ticketLE.textChanged.connect(self.checkTicket)
+        self.checkTicket()
+
+    def checkTicket(self) -> None:
+        """Show the summary of the issue of the ticket - or that Jira does not know it. Unknown issues are fetched."""
+        ticket = self.ticketLE.text()
+        key = issueKey(ticket)
+        issue = self.issueCache.get(key) if self.issueCache is not None else None
+        if not key:
+            self.setIssueText("")
+        elif self.issueCache is not None and self.issueCache.isMissing(key):
+            self.setIssueText(f"Issue {key} not found in Jira", error=True)
+        elif issue is not None and not issue.get("missing"):
+            self.setIssueText(f"{issue['summary']} [{issue['status']}] - {issue['project']}")
+        elif not self.checkIssues:
+            self.setIssueText("")
+        elif not isValidKey(key):
+            self.setIssueText("Not a Jira issue key - it is not checked")
+        else:
+            self.setIssueText("Checking the issue...")
+        if self.checkIssues and isValidKey(key):
+            self.issueCache.request([key])
+
+    def setIssueText(self, text: str, error: bool = False) -> None:
+        """Show the text below the ticket - in red for an error."""
+        self.issueLabel.setText(text)
+        self.issueLabel.setStyleSheet("color: red" if error else "")
+        self.issueLabel.setVisible(bool(text))
+
+    def onIssuesFetched(self, keys: list[str]) -> None:
+        """Show the fetched issue of the ticket."""
+        if issueKey(self.ticketLE.text()) in keys:
+            self.checkTicket()
+
+    def onIssuesFailed(self, keys: list[str], message: str) -> None:
+        """Show that the issue could not be checked - the ticket is accepted anyway."""
+        if issueKey(self.ticketLE.text()) in keys:
+            self.setIssueText(f"The issue could not be checked: {message}")
+
+    def done(self, result: int) -> None:
+        """Stop following the issue cache when the dialog is closed."""
+        if self.issueCache is not None:
+            self.issueCache.updated.disconnect(self.onIssuesFetched)
+            self.issueCache.failed.disconnect(self.onIssuesFailed)
+            self.issueCache = None
+        self.timer.stop()
+        super().done(result)
+
     def getMainWindow(self, parent: QtWidgets.QWidget) -> MainWindow | None:
         """Get the main window from parent."""
         if parent:
@@ -1076,100 +1269,109 @@ class WorkPackageEditDialog(QtWidgets.QDialog):
     def accept(self) -> None:
         """Call when OK is pressed."""
         mainWindow = self.getMainWindow(self.parent())
-        if self.workpackage.name != self.nameLE.text() and self.nameLE.text() in [wp.name for wp in mainWindow.workPackages]:
+        if self.workpackage.name != self.nameLE.text() and self.nameLE.text() in mainWindow.workPackages:
             self.notUnique.setVisible(True)
             return
+        # a changed ticket Jira does not know is refused - if Jira could not be asked, it is accepted
+        if self.issueCache is not None and self.issueCache.ticketError(self.ticketLE.text(), self.workpackage.ticket):
+            self.checkTicket()
+            return
         self.workpackage.name = self.nameLE.text()
         self.workpackage.ticket = self.ticketLE.text()
         if not self.workpackage.isChecked():
             self.workpackage.loggedTime = (
                 (self.dayEdit.value() * 60 * 60 * 24) + (self.hourEdit.value() * 60 * 60) + (self.minuteEdit.value() * 60)
             )
+        self.workpackage.edited.emit()
+        super().accept()
+
+
+class WorkPackagePickerDialog(QtWidgets.QDialog):
+    """Dialog to find a work package by a part of its name or ticket."""
+
+    # maximum number of matches shown
+    MAX_MATCHES = 200
+
+    def __init__(self, parent: QtWidgets.QWidget, registry: WorkPackageRegistry) -> None:
+        """Dialog to find a work package by a part of its name or ticket."""
+        super().__init__(
+            parent,
+            QtCore.Qt.WindowCloseButtonHint | QtCore.Qt.WindowTitleHint | QtCore.Qt.WindowSystemMenuHint,
+        )
+        self.setWindowTitle("Find Work Package")
+        self.registry = registry
+        self.selected = None
+        self.matches = []
+
+        self.filterLE = QtWidgets.QLineEdit()
+        self.filterLE.setPlaceholderText("Name or ticket")
+        self.filterLE.textChanged.connect(self.updateMatches)
+        self.filterLE.returnPressed.connect(self.accept)
+        self.matchList = QtWidgets.QListWidget()
+        self.matchList.itemActivated.connect(self.accept)
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttonbox.accepted.connect(self.accept)
+        buttonbox.rejected.connect(self.reject)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.filterLE)
+        layout.addWidget(self.matchList)
+        layout.addWidget(buttonbox)
+        self.setLayout(layout)
+        self.updateMatches("")
+
+    def updateMatches(self, text: str) -> None:
+        """Show the work packages matching the text."""
+        self.matches = self.registry.search(text)[: self.MAX_MATCHES]
+        self.matchList.clear()
+        for wp in self.matches:
+            self.matchList.addItem(f"{wp.ticket} - {wp.name}" if wp.ticket else wp.name)
+        self.matchList.setCurrentRow(0)
+
+    def accept(self) -> None:
+        """Call when a work package was chosen."""
+        row = self.matchList.currentRow()
+        self.selected = self.matches[row] if 0 <= row < len(self.matches) else None
         super().accept()
 
 
 def start_GUI() -> None:
-    """Start the GUI."""
+    """Start the GUI - or hand the command line command over to the running instance."""
+    command = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in COMMANDS else "restore"
+    answer = sendCommand(command)
+    if answer == ACKNOWLEDGED:
+        logging.info("Times is already running - sent %s to it", command)
+        return
+
     app = QtWidgets.QApplication(sys.argv)
+    if answer == UNANSWERED:
+        # a second instance might overwrite the time data of the one not answering
+        logging.warning("Times is already running but did not answer - aborted starting")
+        QtWidgets.QMessageBox.warning(
+            QtWidgets.QWidget(),
+            "Times already running",
+            "Times is already running but does not respond.\n\n"
+            "A second instance might lead to inconsistencies or overwriting of time data!",
+        )
+        return
     app.setStyleSheet("QLabel { qproperty-alignment: AlignCenter; }")
     app.setApplicationName("Time Converter")
-    app.setWindowIcon(QtGui.QPixmap(resource_path("time.png")))
+    app.setWindowIcon(icon("time.png"))
     app.setQuitOnLastWindowClosed(False)
 
-    start = True
-    # look for any lockfile
-    alreadyRunning = False
-    p = Path()
-    for file in p.iterdir():
-        if file.is_file and file.name.startswith("lockfile"):
-            with file.open("r") as fp:
-                pid = int(fp.read())
-                if psutil.pid_exists(pid) and psutil.Process(pid).name() in ["times.exe", "python.exe"]:
-                    alreadyRunning = True
-                    window = findWindow(pid)
-                    break
-                file.unlink()
-
-    lockfile = Path(f"lockfile_{time.time()}")
-    if lockfile.exists():
-        # fix possible unique name conflict
-        time.sleep(1)
-        lockfile = Path(f"lockfile_{time.time()}")
-    if alreadyRunning:
-        if window:
-            ret = QtWidgets.QMessageBox.warning(
-                QtWidgets.QWidget(),
-                "Times already running",
-                "Do you want to start a second instance?\n\n"
-                "It might lead to inconsistencies or overwriting of time data!\n"
-                "Click open to activate the first instance",
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No | QtWidgets.QMessageBox.Open,
-                QtWidgets.QMessageBox.Open,
-            )
-        else:
-            ret = QtWidgets.QMessageBox.warning(
-                QtWidgets.QWidget(),
-                "Times already running",
-                "Do you want to start a second instance?\n\nIt might lead to inconsistencies or overwriting of time data!",
-                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
-                QtWidgets.QMessageBox.No,
-            )
-        if QtWidgets.QMessageBox.No == ret:
-            start = False
-            logging.info("Aborted starting")
-        if QtWidgets.QMessageBox.Open == ret:
-            start = False
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shell.SendKeys("%")
-            win32gui.SetForegroundWindow(window)
-            logging.info("Aborted starting - Showed other instance instead")
-
-    if start:
-        lockfile.write_text(str(os.getpid()))
-
-        window = MainWindow(app=app)
-        window.setWindowIcon(QtGui.QPixmap(resource_path("time.png")))
-        window.show()
-
-        app.exec()
-        window.saveWorkPackages()
-        lockfile.unlink()
-
-
-def windowEnumerationHandler(hwnd: int, top_windows: list) -> None:
-    """Fill top_windows with all window handles."""
-    top_windows.append((hwnd, win32gui.GetWindowText(hwnd), win32process.GetWindowThreadProcessId(hwnd)[1]))
-
-
-def findWindow(pid: int) -> int | None:
-    """Find the window handle for the given pid."""
-    result = None
-    top_windows = []
-    win32gui.EnumWindows(windowEnumerationHandler, top_windows)
-    for i in top_windows:
-        if pid == i[2] and i[1].startswith("Times "):
-            result = i[0]
-    return result
+    window = MainWindow(app=app)
+    window.setWindowIcon(icon("time.png"))
+    instanceServer = InstanceServer(app)
+    instanceServer.commandReceived.connect(window.onInstanceCommand)
+    window.show()
+    if command != "restore":
+        window.onInstanceCommand(command)
+
+    app.exec()
+    window.jiraWorker.wait()
+    window.saveCoordinator.flush()
+    window.saveMonth(compact=True)
+    window.saveWorkPackages()
 
 
 if __name__ == "__main__":